@@ -1,5 +1,6 @@
 import os
 import sys
+import logging
 import gradio as gr
 
 # Add src directory to path
@@ -8,28 +9,49 @@ sys.path.insert(0, os.path.join(current_dir, 'src'))
 
 try:
     from integrated_sanskrit_processor import IntegratedSanskritProcessor
+    import model_registry
 except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
 
+# Size of the per-word sandhi analysis cache (0 disables it)
+SANDHI_CACHE_SIZE = int(os.environ.get('SANDHI_CACHE_SIZE', '4096'))
+# Size of the per-word CRF score cache (0 disables it)
+POS_CACHE_SIZE = int(os.environ.get('POS_CACHE_SIZE', '4096'))
+# BiLSTM backend: auto (fastest available), onnx, numpy, torchscript, eager or int8
+BILSTM_RUNTIME = os.environ.get('BILSTM_RUNTIME', 'auto')
+# Pipeline log level; WARNING keeps per-request details out of production logs
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'WARNING').upper()
+
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+logger = logging.getLogger(__name__)
+
 # Initialize the integrated processor
-print("🔧 Loading Integrated Sanskrit Processor...")
+logger.info("Loading Integrated Sanskrit Processor...")
 try:
     processor = IntegratedSanskritProcessor(
         pos_model_path=os.path.join(current_dir, 'models', 'enhanced_crf_pos_model_v3.pkl'),
         bilstm_threshold=0.7,
-        use_bilstm=True
+        use_bilstm=True,
+        sandhi_cache_size=SANDHI_CACHE_SIZE,
+        pos_cache_size=POS_CACHE_SIZE,
+        bilstm_runtime=BILSTM_RUNTIME
     )
-    print("✅ Processor loaded successfully")
+    # Load the models now rather than on the first request; under gunicorn --preload
+    # this runs once in the master and the workers share the pages copy-on-write
+    processor.warmup()
+    model_registry.freeze()
+    logger.info("Processor loaded successfully")
 except Exception as e:
-    print(f"⚠️  Model loading failed: {e}")
-    print("🔄 Loading without models...")
+    logger.warning("Model loading failed: %s; loading without models", e)
     processor = IntegratedSanskritProcessor(
         pos_model_path=None,
         bilstm_threshold=0.7,
-        use_bilstm=False
+        use_bilstm=False,
+        sandhi_cache_size=SANDHI_CACHE_SIZE,
+        pos_cache_size=POS_CACHE_SIZE
     )
-    print("✅ Processor loaded in basic mode")
+    logger.info("Processor loaded in basic mode")
 
 def process_sanskrit_text(text):
     """Process Sanskrit text and return formatted results."""
@@ -0,0 +1,112 @@
+"""
+Benchmark: a corpus sent over HTTP as one /process request per text, as
+/process_batch requests, and as one streamed /process_stream upload.
+Serves simple_app with werkzeug in a background thread; reports texts/s and
+the server process's peak RSS growth during the streamed upload.
+
+Usage:
+    python benchmarks/bench_batch_endpoints.py [--texts 2000] [--stream_copies 20]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import threading
+import contextlib
+import http.client
+import urllib.parse
+
+# Add project, src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from werkzeug.serving import make_server
+
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def post(connection, path, body, content_type):
+    connection.request('POST', path, body=body, headers={'Content-Type': content_type})
+    response = connection.getresponse()
+    return response.read()
+
+
+def send_chunked(connection, lines, lines_per_chunk=64):
+    for i in range(0, len(lines), lines_per_chunk):
+        data = b''.join(lines[i:i + lines_per_chunk])
+        connection.send(b'%x\r\n' % len(data) + data + b'\r\n')
+    connection.send(b'0\r\n\r\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark /process vs /process_batch vs /process_stream')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--texts', type=int, default=2000)
+    parser.add_argument('--words_per_text', type=int, default=8)
+    parser.add_argument('--batch_size', type=int, default=500, help='Texts per /process_batch request')
+    parser.add_argument('--stream_copies', type=int, default=20, help='Corpus copies in the streamed upload')
+    args = parser.parse_args()
+    
+    words = [word for combined, _ in load_sandhi_cleaned_data(args.data_path) for word in combined.split()]
+    texts = [' '.join(words[i:i + args.words_per_text])
+             for i in range(0, len(words), args.words_per_text)][:args.texts]
+    
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        import simple_app
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, simple_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port)
+    
+    timings = {}
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        start = time.perf_counter()
+        for text in texts:
+            post(connection, '/process', urllib.parse.urlencode({'sanskrit_text': text}),
+                 'application/x-www-form-urlencoded')
+        timings['/process (one per text)'] = (len(texts), time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        for i in range(0, len(texts), args.batch_size):
+            post(connection, '/process_batch', json.dumps({'texts': texts[i:i + args.batch_size]}),
+                 'application/json')
+        timings[f'/process_batch ({args.batch_size} per request)'] = (len(texts), time.perf_counter() - start)
+        
+        # Streamed upload: generated line by line and sent chunked
+        lines = [json.dumps(text, ensure_ascii=False).encode() + b'\n' for text in texts] * args.stream_copies
+        upload_mib = sum(len(line) for line in lines) / 2 ** 20
+        rss_before = peak_rss_mib()
+        start = time.perf_counter()
+        # Upload from a second thread: the server streams results while still reading
+        connection.putrequest('POST', '/process_stream')
+        connection.putheader('Content-Type', 'application/x-ndjson')
+        connection.putheader('Transfer-Encoding', 'chunked')
+        connection.endheaders()
+        uploader = threading.Thread(target=send_chunked, args=(connection, lines))
+        uploader.start()
+        response = connection.getresponse()
+        results = sum(1 for _ in response)
+        uploader.join()
+        timings[f'/process_stream ({upload_mib:.1f} MiB upload)'] = (results, time.perf_counter() - start)
+        rss_growth = peak_rss_mib() - rss_before
+    server.shutdown()
+    
+    print(f"{'endpoint':<36} {'texts':>7} {'texts/s':>9}")
+    for name, (count, seconds) in timings.items():
+        print(f"{name:<36} {count:>7} {count / seconds:>9.0f}")
+    print(f"\nPeak RSS growth during the streamed upload: {rss_growth:.1f} MiB "
+          f"(client-side copy of the upload: {upload_mib:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: fixed max_len=50 padding vs length-bucketed packed BiLSTM inference.
+Measures tokens/sec over the words in data/sandhi_cleaned.txt.
+
+Usage:
+    python benchmarks/bench_bilstm_padding.py [--limit N] [--batch_size 512]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import torch
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from bilstm_sandhi import load_model
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def pad_to_fixed(encoded, max_len=50, pad_idx=0):
+    """Reproduce the old encoding: every word padded to max_len characters."""
+    return encoded[:max_len] + [pad_idx] * (max_len - len(encoded[:max_len]))
+
+
+def run_fixed_per_word(model, sequences):
+    """Old predict_splits path: one (1, 50) forward pass per word."""
+    with torch.no_grad():
+        for seq in sequences:
+            model(torch.tensor([pad_to_fixed(seq)], dtype=torch.long))
+
+
+def run_fixed_batched(model, sequences, batch_size):
+    """Batched, but every word still padded to 50 characters."""
+    with torch.no_grad():
+        for start in range(0, len(sequences), batch_size):
+            batch = [pad_to_fixed(seq) for seq in sequences[start:start + batch_size]]
+            model(torch.tensor(batch, dtype=torch.long))
+
+
+def run_bucketed_packed(model, sequences, batch_size):
+    """New path: length buckets + pack_padded_sequence."""
+    model.predict_proba_batch(sequences, bucket_size=batch_size)
+
+
+def time_it(fn, *args, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark BiLSTM padding strategies')
+    parser.add_argument('--model_path', default=os.path.join(project_root, 'models', 'bilstm_sandhi.pt'))
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--limit', type=int, default=0, help='Use only the first N words (0 = all)')
+    parser.add_argument('--batch_size', type=int, default=512)
+    parser.add_argument('--threads', type=int, default=1, help='torch intra-op threads')
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    model, char_to_idx = load_model(args.model_path)
+    model.eval()
+
+    words = [token for combined, _ in load_sandhi_cleaned_data(args.data_path) for token in combined.split()]
+    if args.limit:
+        words = words[:args.limit]
+    sequences = [model._encode_single_word(word, char_to_idx) for word in words]
+    lengths = np.array([len(seq) for seq in sequences])
+
+    print(f"Words: {len(words)}  mean length: {lengths.mean():.1f}  "
+          f"median: {np.median(lengths):.0f}  max: {lengths.max()}")
+    print(f"Padding overhead at max_len=50: {50 * len(words) / lengths.sum():.1f}x timesteps")
+    print()
+
+    results = [
+        ('fixed-50, one word per pass', time_it(run_fixed_per_word, model, sequences, repeats=1)),
+        (f'fixed-50, batches of {args.batch_size}', time_it(run_fixed_batched, model, sequences, args.batch_size)),
+        (f'bucketed + packed, batches of {args.batch_size}', time_it(run_bucketed_packed, model, sequences, args.batch_size)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{'strategy':<40} {'seconds':>9} {'tokens/sec':>12} {'speedup':>8}")
+    for name, seconds in results:
+        print(f"{name:<40} {seconds:>9.3f} {len(words) / seconds:>12,.0f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: dynamic int8 BiLSTM vs the float checkpoint on CPU.
+Reports checkpoint size, single-word latency, batch throughput and split
+precision/recall/F1 on the held-out test split of train_bilstm_sandhi.py.
+
+Write the int8 checkpoint first with: python src/quantize_bilstm.py
+
+Usage:
+    python benchmarks/bench_bilstm_quantized.py [--threshold 0.5] [--repeats 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+import torch
+from torch.utils.data import DataLoader
+
+from bilstm_sandhi import SandhiDataset, LengthBucketSampler, collate_sandhi_batch
+from bilstm_runtime import DEFAULT_MODEL_DIR, RUNTIME_ARTIFACTS, EagerBiLSTM, QuantizedBiLSTM
+from train_bilstm_sandhi import prepare_training_data, split_training_data, evaluate_model, SANDHI_TEST_CASES
+
+
+def best_of(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the int8 quantized BiLSTM')
+    parser.add_argument('--model_dir', default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--batch_size', type=int, default=32)
+    parser.add_argument('--single_words', type=int, default=200, help='Words timed one call at a time')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    torch.set_num_threads(1)
+    
+    runtimes = {
+        'fp32': EagerBiLSTM(os.path.join(args.model_dir, RUNTIME_ARTIFACTS['eager']), device='cpu'),
+        'int8': QuantizedBiLSTM(os.path.join(args.model_dir, RUNTIME_ARTIFACTS['int8'])),
+    }
+    char_to_idx = runtimes['fp32'].char_to_idx
+    
+    # Same data and split as training, encoded with the checkpoint vocabulary
+    _, _, test_data = split_training_data(prepare_training_data(SANDHI_TEST_CASES, use_cleaned_data=True))
+    test_dataset = SandhiDataset(test_data, char_to_idx)
+    test_loader = DataLoader(test_dataset, collate_fn=collate_sandhi_batch,
+                             batch_sampler=LengthBucketSampler(test_dataset, args.batch_size, shuffle=False))
+    sequences = [[0] + [char_to_idx.get(c, 0) for c in combined] + [0] for combined, _ in test_data]
+    
+    print(f"Test examples: {len(test_data)}  (1 intra-op thread, threshold {args.threshold})")
+    print(f"{'model':<6} {'size (KiB)':>10} {'single (ms/word)':>17} {'batch (words/s)':>16} "
+          f"{'precision':>9} {'recall':>7} {'F1':>6}")
+    for name, runtime in runtimes.items():
+        size = os.path.getsize(runtime.path) / 1024
+        single = best_of(lambda: [runtime.predict_proba_batch([seq]) for seq in sequences[:args.single_words]],
+                         args.repeats) / args.single_words
+        batch = best_of(lambda: runtime.predict_proba_batch(sequences), args.repeats)
+        metrics = evaluate_model(runtime.model, test_loader, 'cpu', char_to_idx, threshold=args.threshold)
+        print(f"{name:<6} {size:>10.1f} {single * 1000:>17.3f} {len(sequences) / batch:>16,.0f} "
+              f"{metrics['precision']:>9.3f} {metrics['recall']:>7.3f} {metrics['f1']:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: BiLSTM sandhi runtimes (ONNX Runtime, NumPy, TorchScript, PyTorch eager, int8) on CPU.
+Reports load time, single-word latency, batch throughput and the largest
+probability difference from the eager checkpoint.
+
+Export the artifacts first with: python src/export_bilstm.py
+
+Usage:
+    python benchmarks/bench_bilstm_runtimes.py [--num_words 2000] [--repeats 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import unicodedata
+
+import numpy as np
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from bilstm_runtime import DEFAULT_MODEL_DIR, RUNTIME_ARTIFACTS, RUNTIME_CLASSES, available_runtimes
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def best_of(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark BiLSTM runtimes')
+    parser.add_argument('--model_dir', default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--num_words', type=int, default=2000)
+    parser.add_argument('--single_words', type=int, default=200, help='Words timed one call at a time')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    import torch
+    torch.set_num_threads(1)
+    
+    words = list(dict.fromkeys(unicodedata.normalize('NFC', word)
+                               for combined, _ in load_sandhi_cleaned_data(args.data_path)
+                               for word in combined.split()))[:args.num_words]
+    
+    runtimes = {}
+    load_seconds = {}
+    for name in available_runtimes(args.model_dir):
+        start = time.perf_counter()
+        runtimes[name] = RUNTIME_CLASSES[name](os.path.join(args.model_dir, RUNTIME_ARTIFACTS[name]))
+        load_seconds[name] = time.perf_counter() - start
+    
+    char_to_idx = next(iter(runtimes.values())).char_to_idx
+    sequences = [[0] + [char_to_idx.get(c, 0) for c in word] + [0] for word in words]
+    reference = runtimes['eager'].predict_proba_batch(sequences) if 'eager' in runtimes else None
+    
+    print(f"Words: {len(words)}  (1 intra-op thread)")
+    print(f"{'runtime':<12} {'load (ms)':>10} {'single (ms/word)':>17} {'batch (words/s)':>16} {'max |Δp|':>10}")
+    for name, runtime in runtimes.items():
+        single = best_of(lambda: [runtime.predict_proba_batch([seq]) for seq in sequences[:args.single_words]],
+                         args.repeats) / args.single_words
+        batch = best_of(lambda: runtime.predict_proba_batch(sequences), args.repeats)
+        difference = ''
+        if reference is not None:
+            outputs = runtime.predict_proba_batch(sequences)
+            difference = f"{max(float(np.max(np.abs(a - b))) for a, b in zip(reference, outputs)):.1e}"
+        print(f"{name:<12} {load_seconds[name] * 1000:>10.1f} {single * 1000:>17.3f} "
+              f"{len(sequences) / batch:>16,.0f} {difference:>10}")
+
+
+if __name__ == "__main__":
+    main()
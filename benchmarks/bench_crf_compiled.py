@@ -0,0 +1,104 @@
+"""
+Benchmark: nested-dict CRF model vs the compiled, index-based model.
+Reports memory footprint and per-word scoring latency (all tags) over
+data/text.txt.
+
+Usage:
+    python benchmarks/bench_crf_compiled.py [--repeats 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from crf_pos_tagger import CRFPOSTagger
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """Recursive sys.getsizeof over dicts, sets, lists, tuples and strings."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (set, frozenset, list, tuple)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def load_words(text_path):
+    """Whitespace tokens of a text file, one sentence per line."""
+    with open(text_path, 'r', encoding='utf-8') as f:
+        return [word for line in f for word in line.split()]
+
+
+def score_dict(tagger, words, tags):
+    """Old path: _calculate_score per (word, tag), formatting and hashing feature keys."""
+    for word in words:
+        for tag in tags:
+            tagger._calculate_score(word, tag, '<START>', '<START>')
+
+
+def score_compiled(tagger, words, tags):
+    """New path: one feature extraction per word, then array gathers (cold cache)."""
+    tagger.word_score_cache.clear()
+    for word in words:
+        tagger._word_scores(word)
+
+
+def score_cached(tagger, words, tags):
+    """Compiled path with the per-word score cache already warm."""
+    for word in words:
+        tagger._word_scores(word)
+
+
+def time_it(fn, *args, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dict vs compiled CRF model')
+    parser.add_argument('--model_path', default=os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl'))
+    parser.add_argument('--text_path', default=os.path.join(project_root, 'data', 'text.txt'))
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    tagger = CRFPOSTagger(args.model_path)
+    compiled = tagger._compiled_model()
+    tags = compiled.tags
+    
+    dict_bytes = deep_sizeof((tagger.emission_probs, tagger.transition_probs,
+                              tagger.feature_weights, tagger.known_words))
+    compiled_bytes = compiled.memory_bytes()
+    print(f"Tags: {len(tags)}  features: {len(compiled.feature_index)}  words: {len(compiled.word_index)}")
+    print(f"Dict model:     {dict_bytes / 1024:>9.1f} KiB")
+    print(f"Compiled model: {compiled_bytes['total'] / 1024:>9.1f} KiB "
+          f"(arrays {compiled_bytes['arrays'] / 1024:.1f} KiB, indexes {compiled_bytes['indexes'] / 1024:.1f} KiB)")
+    print()
+    
+    words = load_words(args.text_path)
+    dict_seconds = time_it(score_dict, tagger, words, tags, repeats=args.repeats)
+    compiled_seconds = time_it(score_compiled, tagger, words, tags, repeats=args.repeats)
+    cached_seconds = time_it(score_cached, tagger, words, tags, repeats=args.repeats)
+    print(f"Scoring {len(words)} words x {len(tags)} tags")
+    print(f"{'model':<18} {'seconds':>9} {'us/word':>9} {'speedup':>8}")
+    for name, seconds in (('dict', dict_seconds), ('compiled', compiled_seconds),
+                          ('compiled + cache', cached_seconds)):
+        print(f"{name:<18} {seconds:>9.3f} {seconds / len(words) * 1e6:>9.1f} {dict_seconds / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: lattice segmentation vs thresholded BiLSTM cuts and the rule table
+on the single-word gold splits of data/sandhi_cleaned.txt.
+
+Gold parts are restored forms (तस्याग्रे -> तस्य अग्रे), so they are aligned back
+to the surface word and cuts are compared within --tolerance characters. The
+lexicon is disabled, since it is built from the same gold splits.
+
+Usage:
+    python benchmarks/bench_lattice_segmenter.py [--tolerance 1] [--k 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import difflib
+import unicodedata
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from hybrid_sandhi_splitter import HybridSandhiSplitter
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def surface_cuts(word, parts):
+    """Positions in word where the given (possibly restored) parts begin, after the first."""
+    if len(parts) < 2:
+        return set()
+    joined = ''.join(parts)
+    boundaries = []
+    position = 0
+    for part in parts[:-1]:
+        position += len(part)
+        boundaries.append(position)
+    
+    # Map positions in the joined parts onto the surface word
+    mapping = {}
+    matcher = difflib.SequenceMatcher(None, joined, word, autojunk=False)
+    for _, i1, i2, j1, j2 in matcher.get_opcodes():
+        for i in range(i1, i2 + 1):
+            mapping.setdefault(i, j1 + min(i - i1, j2 - j1))
+    return {mapping[b] for b in boundaries if 0 < mapping[b] < len(word)}
+
+
+def cut_scores(pairs, tolerance):
+    """Precision, recall and F1 of predicted cuts against gold cuts."""
+    true_positives = false_positives = false_negatives = 0
+    for predicted, gold in pairs:
+        matched = set()
+        for cut in sorted(predicted):
+            hits = [g for g in sorted(gold) if abs(g - cut) <= tolerance and g not in matched]
+            if hits:
+                matched.add(hits[0])
+                true_positives += 1
+            else:
+                false_positives += 1
+        false_negatives += len(gold) - len(matched)
+    precision = true_positives / max(1, true_positives + false_positives)
+    recall = true_positives / max(1, true_positives + false_negatives)
+    return precision, recall, 2 * precision * recall / max(1e-9, precision + recall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lattice sandhi segmentation')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--tolerance', type=int, default=1)
+    parser.add_argument('--k', type=int, default=3)
+    args = parser.parse_args()
+    
+    splitter = HybridSandhiSplitter(lexicon_path=None, cache_size=0)
+    data = [(unicodedata.normalize('NFC', combined), [unicodedata.normalize('NFC', part) for part in parts])
+            for combined, parts in load_sandhi_cleaned_data(args.data_path) if ' ' not in combined]
+    words = [word for word, _ in data]
+    gold = [surface_cuts(word, parts) for word, parts in data]
+    
+    start = time.perf_counter()
+    probabilities = (splitter._bilstm_predict_batch(words) if splitter.bilstm_model
+                     else [None] * len(words))
+    model_seconds = time.perf_counter() - start
+    
+    # Thresholded BiLSTM cuts and the rule table, each on its own
+    threshold_cuts = [{i for i, prob in enumerate(probs[1:-1]) if prob >= 0.5 and 0 < i < len(word)}
+                      if probs is not None else set() for word, probs in zip(words, probabilities)]
+    rule_cuts = [set(splitter._rule_cuts(word)[0]) for word in words]
+    
+    start = time.perf_counter()
+    kbest = [splitter.lattice.segment(word, *[splitter._lattice_candidates(word, probs)[i] for i in (0, 3)], k=args.k)
+             for word, probs in zip(words, probabilities)]
+    lattice_seconds = time.perf_counter() - start
+    best_cuts = [surface_cuts(word, results[0].parts) for word, results in zip(words, kbest)]
+    
+    # Oracle over the k best: the candidate closest to gold
+    def oracle(word, results, gold_cuts):
+        return max((surface_cuts(word, result.parts) for result in results),
+                   key=lambda cuts: cut_scores([(cuts, gold_cuts)], args.tolerance)[2] if gold_cuts else -len(cuts))
+    oracle_cuts = [oracle(word, results, gold_cuts) for word, results, gold_cuts in zip(words, kbest, gold)]
+    
+    print(f"Words: {len(words)}  tolerance: {args.tolerance}")
+    print(f"{'method':<24} {'precision':>9} {'recall':>7} {'F1':>6}")
+    for name, predicted in (('BiLSTM p >= 0.5', threshold_cuts), ('rule table', rule_cuts),
+                            ('lattice (best)', best_cuts), (f'lattice (oracle of {args.k})', oracle_cuts)):
+        precision, recall, f1 = cut_scores(zip(predicted, gold), args.tolerance)
+        print(f"{name:<24} {precision:>9.3f} {recall:>7.3f} {f1:>6.3f}")
+    
+    # Regression check: no part may start with a combining mark (virama, vowel sign...)
+    outputs = [part for results in kbest for result in results for part in result.parts]
+    outputs += [part for _, parts, _ in splitter.analyze_words(words) for part in parts]
+    mark_initial = sum(unicodedata.category(part[0]).startswith('M') for part in outputs if part)
+    print(f"\nParts starting with a combining mark: {mark_initial} of {len(outputs)}")
+    
+    print()
+    print(f"BiLSTM forward pass: {model_seconds * 1000 / len(words):.3f} ms/word")
+    print(f"Lattice search (k={args.k}): {lattice_seconds * 1000 / len(words):.3f} ms/word")
+    if mark_initial:
+        sys.exit(f"{mark_initial} parts start with a combining mark")
+
+
+if __name__ == "__main__":
+    main()
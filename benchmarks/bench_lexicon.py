@@ -0,0 +1,66 @@
+"""
+Benchmark: SandhiLexicon build vs prebuilt-file load time, lookup throughput,
+and how many words of data/text.txt are answered by the lexicon before any
+model runs (gold splits and unsplittable words; vocabulary words only earn a
+lattice bonus).
+
+Usage:
+    python benchmarks/bench_lexicon.py [--repeats 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import unicodedata
+from collections import Counter
+
+# Add src directory to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from lexicon import DEFAULT_LEXICON_PATH, SandhiLexicon
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sandhi lexicon')
+    parser.add_argument('--lexicon_path', default=DEFAULT_LEXICON_PATH)
+    parser.add_argument('--text_path', default=os.path.join(project_root, 'data', 'text.txt'))
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    built, build_seconds = timed(SandhiLexicon.from_sources)
+    lexicon, load_seconds = timed(SandhiLexicon.load, args.lexicon_path)
+    print(f"Build from sources: {build_seconds * 1000:8.1f} ms")
+    print(f"Load prebuilt file: {load_seconds * 1000:8.1f} ms "
+          f"({os.path.getsize(args.lexicon_path) / 1024:.1f} KiB, {len(lexicon)} words, "
+          f"{len(lexicon.splits)} gold splits)")
+    
+    with open(args.text_path, 'r', encoding='utf-8') as f:
+        words = [unicodedata.normalize('NFC', word) for word in f.read().split()]
+    
+    differing = sum(built.lookup(word) != lexicon.lookup(word) for word in words)
+    best = min(timed(lambda: [lexicon.lookup(word) for word in words])[1] for _ in range(args.repeats))
+    print(f"Lookups: {len(words) / best:,.0f} words/sec  (prebuilt vs fresh build differ on {differing})")
+    
+    outcome = Counter()
+    for word in words:
+        if lexicon.gold_split(word):
+            outcome['gold split'] += 1
+        elif lexicon.is_unsplittable(word):
+            outcome['unsplittable'] += 1
+        else:
+            outcome['unknown' if word not in lexicon else 'vocabulary'] += 1
+    print(f"{os.path.basename(args.text_path)}: {len(words)} words")
+    for name, count in outcome.most_common():
+        print(f"  {name:<14} {count:>6} ({count / len(words):.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: process_text latency with the per-request messages written out
+(DEBUG, one line per pipeline step, as the pipeline used to print them) vs the
+quiet production level (WARNING). Client threads call the processor directly;
+messages go to a file, as a container's stdout would.
+
+Caches are disabled so every request pays for the BiLSTM and CRF.
+
+Usage:
+    python benchmarks/bench_logging.py [--clients 1,8] [--requests 300] [--output /tmp/pipeline.log]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+
+import numpy as np
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from integrated_sanskrit_processor import IntegratedSanskritProcessor
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def run_clients(processor, texts, clients, requests_per_client):
+    """Run client threads calling process_text; return wall seconds and per-call latencies."""
+    latencies = [[] for _ in range(clients)]
+    
+    def client(index):
+        for i in range(requests_per_client):
+            text = texts[(index * requests_per_client + i) % len(texts)]
+            start = time.perf_counter()
+            processor.process_text(text)
+            latencies[index].append(time.perf_counter() - start)
+    
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.array([value for values in latencies for value in values])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-request logging overhead')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--words_per_text', type=int, default=8)
+    parser.add_argument('--clients', default='1,8', help='Comma-separated client thread counts')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per client')
+    parser.add_argument('--output', default=None, help='Where messages are written (default: a temp file)')
+    args = parser.parse_args()
+    
+    words = [word for combined, _ in load_sandhi_cleaned_data(args.data_path) for word in combined.split()]
+    texts = [' '.join(words[i:i + args.words_per_text]) for i in range(0, len(words), args.words_per_text)]
+    
+    output = args.output or tempfile.NamedTemporaryFile(suffix='.log', delete=False).name
+    handler = logging.StreamHandler(open(output, 'w', encoding='utf-8'))
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    
+    processor = IntegratedSanskritProcessor(
+        pos_model_path=os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl'),
+        sandhi_cache_size=0, pos_cache_size=0)
+    processor.warmup()
+    
+    print(f"{'level':<8} {'clients':>7} {'texts/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'log MiB':>8}")
+    for clients in [int(value) for value in args.clients.split(',')]:
+        for level in (logging.DEBUG, logging.WARNING):
+            root.setLevel(level)
+            size_before = os.path.getsize(output)
+            seconds, latencies = run_clients(processor, texts, clients, args.requests)
+            handler.flush()
+            logged = (os.path.getsize(output) - size_before) / 2 ** 20
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f"{logging.getLevelName(level):<8} {clients:>7} {len(latencies) / seconds:>8.0f} "
+                  f"{p50:>9.2f} {p99:>9.2f} {logged:>8.1f}")
+    
+    handler.close()
+    if args.output is None:
+        os.remove(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: /process pipeline under concurrent load, one text per call vs the
+micro-batching scheduler. Client threads each send texts back to back;
+reports throughput, latency percentiles and the scheduler's batch sizes.
+
+Caches are disabled so every request pays for the BiLSTM and CRF.
+
+Usage:
+    python benchmarks/bench_micro_batching.py [--runtime auto] [--clients 16] [--requests 50] [--max_wait_ms 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+import threading
+
+import numpy as np
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from integrated_sanskrit_processor import IntegratedSanskritProcessor
+from batch_scheduler import MicroBatchScheduler
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def run_clients(process, texts, clients, requests_per_client):
+    """Run client threads calling process(text); return wall seconds and per-call latencies."""
+    latencies = [[] for _ in range(clients)]
+    
+    def client(index):
+        for i in range(requests_per_client):
+            text = texts[(index * requests_per_client + i) % len(texts)]
+            start = time.perf_counter()
+            process(text)
+            latencies[index].append(time.perf_counter() - start)
+    
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.array([value for values in latencies for value in values])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark micro-batching of /process')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--runtime', default='auto', help='BiLSTM runtime')
+    parser.add_argument('--words_per_text', type=int, default=8)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=50, help='Requests per client')
+    parser.add_argument('--max_wait_ms', type=float, default=5.0)
+    parser.add_argument('--max_batch_tokens', type=int, default=256)
+    args = parser.parse_args()
+    
+    # Gold words grouped into short sentences
+    words = [word for combined, _ in load_sandhi_cleaned_data(args.data_path) for word in combined.split()]
+    texts = [' '.join(words[i:i + args.words_per_text]) for i in range(0, len(words), args.words_per_text)]
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        processor = IntegratedSanskritProcessor(
+            pos_model_path=os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl'),
+            sandhi_cache_size=0, pos_cache_size=0, bilstm_runtime=args.runtime)
+        processor.warmup()
+        scheduler = MicroBatchScheduler(processor, max_wait_ms=args.max_wait_ms,
+                                        max_batch_tokens=args.max_batch_tokens)
+        
+        results = {}
+        for name, process in (('per request', processor.process_text), ('micro-batched', scheduler.process_text)):
+            results[name] = run_clients(process, texts, args.clients, args.requests)
+    
+    total = args.clients * args.requests
+    print(f"{args.clients} clients x {args.requests} requests, BiLSTM runtime: "
+          f"{processor.sandhi_splitter.bilstm_model.name if processor.sandhi_splitter.bilstm_model else None}")
+    print(f"{'mode':<14} {'texts/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    for name, (seconds, latencies) in results.items():
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"{name:<14} {total / seconds:>8.0f} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f}")
+    
+    stats = scheduler.stats()
+    print(f"\nmax_wait_ms={args.max_wait_ms:g} max_batch_tokens={args.max_batch_tokens}")
+    for key in ('batch_texts', 'batch_tokens', 'queue_depth'):
+        print(f"{key:<13} mean {stats[key]['mean']:6.1f}  {stats[key]['buckets']}")
+
+
+if __name__ == "__main__":
+    main()
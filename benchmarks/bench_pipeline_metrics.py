@@ -0,0 +1,71 @@
+"""
+Benchmark: where process_text spends its time, from the opt-in pipeline
+metrics, and what collecting them costs. Runs the gold corpus (as short texts)
+through process_text with collect_metrics off and on, then prints the mean
+time per stage and the counters per text from pipeline_metrics.registry.
+
+Caches are disabled so every request pays for the BiLSTM and CRF.
+
+Usage:
+    python benchmarks/bench_pipeline_metrics.py [--runtime auto] [--texts 500] [--words_per_text 8]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from integrated_sanskrit_processor import IntegratedSanskritProcessor
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+import pipeline_metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-stage pipeline metrics')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--runtime', default='auto', help='BiLSTM runtime')
+    parser.add_argument('--texts', type=int, default=500)
+    parser.add_argument('--words_per_text', type=int, default=8)
+    parser.add_argument('--repeats', type=int, default=3, help='Timed passes per mode (best is reported)')
+    args = parser.parse_args()
+    
+    words = [word for combined, _ in load_sandhi_cleaned_data(args.data_path) for word in combined.split()]
+    texts = [' '.join(words[i:i + args.words_per_text])
+             for i in range(0, len(words), args.words_per_text)][:args.texts]
+    
+    processor = IntegratedSanskritProcessor(
+        pos_model_path=os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl'),
+        sandhi_cache_size=0, pos_cache_size=0, bilstm_runtime=args.runtime)
+    processor.warmup()
+    
+    print(f"{len(texts)} texts, BiLSTM runtime: {processor.sandhi_splitter.bilstm_model.name}")
+    for collect_metrics in (False, True):
+        processor.collect_metrics = collect_metrics
+        best = float('inf')
+        for _ in range(args.repeats):
+            pipeline_metrics.registry.reset()
+            start = time.perf_counter()
+            for text in texts:
+                processor.process_text(text)
+            best = min(best, time.perf_counter() - start)
+        print(f"collect_metrics={collect_metrics!s:<5}  {best / len(texts) * 1000:.3f} ms/text")
+    
+    # Registry of the last pass
+    snapshot = pipeline_metrics.registry.snapshot()
+    means = {stage: histogram['mean'] for stage, histogram in snapshot['stage_seconds'].items()}
+    total = sum(means.values())
+    print(f"\n{'stage':<15} {'ms/text':>8} {'share':>7}")
+    for stage, mean in means.items():
+        print(f"{stage:<15} {mean * 1000:>8.3f} {mean / total:>7.1%}")
+    print(f"\n{'counter':<22} {'per text':>9}")
+    for name, value in sorted(snapshot['counters'].items()):
+        print(f"{name:<22} {value / snapshot['texts']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: memory of forked workers with and without preloaded shared models.
+Simulates gunicorn --preload: the parent imports simple_app (which loads and
+freezes the models), then forks workers that each serve requests. Without
+preload, every worker loads the models itself after the fork. Reports each
+worker's private (unshared) memory from /proc/self/smaps_rollup (Linux only).
+
+Usage:
+    python benchmarks/bench_preload_fork.py [--workers 4] [--requests 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+TEXTS = ['रामो गच्छति', 'नादानुस्बारयोः स्वर्येतेऽस्मात्परावेव', 'महात्मा विष्णुरुच्यते', 'तथापि चोच्चः स्याद्भक्तेर्नीचो']
+
+
+def private_mib() -> float:
+    """Private_Clean + Private_Dirty of this process, in MiB."""
+    total = 0
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total / 1024
+
+
+def serve(num_requests: int) -> float:
+    """Import the app (a no-op if preloaded), serve requests, return startup seconds."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        import simple_app
+        startup = time.perf_counter() - start
+        client = simple_app.app.test_client()
+        for i in range(num_requests):
+            client.post('/process', data={'sanskrit_text': TEXTS[i % len(TEXTS)]})
+    return startup
+
+
+def run(workers: int, num_requests: int, preload: bool):
+    if preload:
+        serve(0)
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            startup = serve(num_requests)
+            os.write(write_fd, f"{startup} {private_mib()}".encode())
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+    
+    results = []
+    for pid, read_fd in pipes:
+        startup, private = map(float, os.read(read_fd, 100).split())
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        results.append((startup, private))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark preloaded vs per-worker model loading')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=20, help='Requests served by each worker')
+    parser.add_argument('--preload', choices=['yes', 'no'], help='Run one mode only (default: both, in subprocesses)')
+    args = parser.parse_args()
+    
+    if args.preload is None:
+        # Each mode needs a fresh parent, so run them as subprocesses
+        import subprocess
+        for mode in ('no', 'yes'):
+            subprocess.run([sys.executable, __file__, '--workers', str(args.workers),
+                            '--requests', str(args.requests), '--preload', mode], check=True)
+        return
+    
+    results = run(args.workers, args.requests, args.preload == 'yes')
+    startup = sum(s for s, _ in results) / len(results)
+    private = sum(p for _, p in results) / len(results)
+    print(f"preload={args.preload:<3}  workers={args.workers}  worker startup {startup * 1000:7.1f} ms  "
+          f"private memory per worker {private:6.1f} MiB  (total {private * len(results):6.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
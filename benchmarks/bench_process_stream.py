@@ -0,0 +1,87 @@
+"""
+Benchmark: peak memory and throughput of process_stream over a large corpus
+vs collecting process_texts results for the whole corpus. The corpus is the
+gold sentences repeated --copies times, read lazily in the streaming mode.
+Each mode runs in its own subprocess so peak RSS is measured from a fresh
+interpreter.
+
+Usage:
+    python benchmarks/bench_process_stream.py [--copies 10] [--batch_size 256]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import contextlib
+from itertools import chain, repeat
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+
+def peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def corpus_lines(data_path, copies):
+    """The combined (unsplit) side of the gold data, read from disk copies times."""
+    def read():
+        with open(data_path, encoding='utf-8') as f:
+            for line in f:
+                yield line.split(' => ')[0]
+    return chain.from_iterable(read() for _ in repeat(None, copies))
+
+
+def run_mode(args):
+    from integrated_sanskrit_processor import IntegratedSanskritProcessor
+    
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        processor = IntegratedSanskritProcessor(
+            pos_model_path=os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl'))
+        processor.warmup()
+    baseline = peak_rss_mib()
+    
+    start = time.perf_counter()
+    count = 0
+    with open(os.devnull, 'w', encoding='utf-8') as out:
+        if args.mode == 'stream':
+            for result in processor.process_stream(corpus_lines(args.data_path, args.copies),
+                                                   batch_size=args.batch_size):
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                count += 1
+        else:
+            results = processor.process_texts([line.strip() for line in corpus_lines(args.data_path, args.copies)],
+                                              analyze_morphology=False)
+            for result in results:
+                out.write(json.dumps(processor._compact_result(result), ensure_ascii=False) + '\n')
+                count += 1
+    seconds = time.perf_counter() - start
+    print(f"{args.mode:<8} {count:>8} {count / seconds:>9.0f} {peak_rss_mib() - baseline:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark process_stream memory and throughput')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--copies', type=int, default=10, help='Times the gold corpus is repeated')
+    parser.add_argument('--batch_size', type=int, default=256)
+    parser.add_argument('--mode', choices=['stream', 'list'], help='Run one mode only (default: both, in subprocesses)')
+    args = parser.parse_args()
+    
+    if args.mode:
+        run_mode(args)
+        return
+    
+    print(f"{'mode':<8} {'lines':>8} {'lines/s':>9} {'RSS growth':>12} (MiB)")
+    for mode in ('list', 'stream'):
+        subprocess.run([sys.executable, __file__, '--data_path', args.data_path, '--copies', str(args.copies),
+                        '--batch_size', str(args.batch_size), '--mode', mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: sequential str.replace cascade vs the single-pass rewriter in
+SanskritTokenizer._reverse_sandhi.
+
+The cascade (the previous implementation, reproduced below) applies every rule
+to the output of the rules before it. The single pass applies, at each
+position, the longest rule starting there and never rescans rewritten text.
+This prints every line of data/text.txt whose output differs, counts the
+differing lines of data/sandhi_cleaned.txt with the compound entries involved,
+and times both as the compound table grows with gold splits.
+
+Usage:
+    python benchmarks/bench_reverse_sandhi.py [--sizes 0 100 1000] [--repeats 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from tokenizer import SanskritTokenizer
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def reverse_sandhi_sequential(text, reverse_patterns, compound_reversals, vowel_reversals):
+    """The previous _reverse_sandhi: one str.replace per rule, then find per vowel rule per word."""
+    result = text
+    for pattern, replacement in reverse_patterns.items():
+        result = result.replace(pattern, replacement)
+    for compound, split in compound_reversals.items():
+        result = result.replace(compound, split)
+    
+    processed_words = []
+    for word in result.split():
+        if len(word) > 4:
+            for sandhi, split in vowel_reversals.items():
+                if sandhi in word:
+                    pos = word.find(sandhi)
+                    if pos > 1 and pos < len(word) - 1:
+                        before = word[:pos]
+                        after = word[pos + len(sandhi):]
+                        if len(before) >= 2 and len(after) >= 2:
+                            word = word.replace(sandhi, split, 1)
+                            break
+        processed_words.append(word)
+    return ' '.join(processed_words)
+
+
+def read_lines(tokenizer, path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [tokenizer.normalize_text(line) for line in f if line.strip()]
+
+
+def time_it(fn, lines, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark _reverse_sandhi implementations')
+    parser.add_argument('--text_path', default=os.path.join(project_root, 'data', 'text.txt'))
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 100, 1000],
+                        help='Extra compound rules to add from the gold splits')
+    parser.add_argument('--repeats', type=int, default=10, help='Timed passes (best is reported)')
+    args = parser.parse_args()
+    
+    tokenizer = SanskritTokenizer()
+    
+    def sequential(line):
+        return reverse_sandhi_sequential(line, tokenizer.reverse_patterns,
+                                         tokenizer.compound_reversals, tokenizer.vowel_reversals)
+    
+    # Output differences against the cascade
+    lines = read_lines(tokenizer, args.text_path)
+    differing = [(line, sequential(line), tokenizer._reverse_sandhi(line)) for line in lines]
+    differing = [entry for entry in differing if entry[1] != entry[2]]
+    print(f"{os.path.basename(args.text_path)}: {len(differing)} of {len(lines)} lines differ from the cascade")
+    for line, old, new in differing:
+        print(f"  input:       {line}\n  cascade:     {old}\n  single pass: {new}")
+    
+    lines = read_lines(tokenizer, args.data_path)
+    compounds = Counter()
+    count = 0
+    for line in lines:
+        if sequential(line) != tokenizer._reverse_sandhi(line):
+            count += 1
+            compounds.update(compound for compound in tokenizer.compound_reversals if compound in line)
+    print(f"{os.path.basename(args.data_path)}: {count} of {len(lines)} lines differ from the cascade")
+    if compounds:
+        print("  compound entries in the differing lines: " +
+              ', '.join(f"{compound} ({n})" for compound, n in compounds.most_common()))
+    print()
+    
+    # Scaling with the size of the compound table
+    gold = [(combined, ' '.join(splits)) for combined, splits in load_sandhi_cleaned_data(args.data_path)
+            if ' ' not in combined and len(splits) > 1]
+    base_compounds = dict(tokenizer.compound_reversals)
+    
+    print(f"Reversing {len(lines)} lines of {os.path.basename(args.data_path)}")
+    print(f"{'rules':>6} {'cascade (s)':>12} {'single pass (s)':>16} {'speedup':>8}")
+    for size in args.sizes:
+        tokenizer.compound_reversals = dict(base_compounds)
+        for combined, split in gold[:size]:
+            tokenizer.compound_reversals.setdefault(combined, split)
+        tokenizer._build_reverse_matchers()
+        
+        old_seconds = time_it(sequential, lines, args.repeats)
+        new_seconds = time_it(tokenizer._reverse_sandhi, lines, args.repeats)
+        print(f"{len(tokenizer.reverse_patterns) + len(tokenizer.compound_reversals):>6} {old_seconds:>12.3f} "
+              f"{new_seconds:>16.3f} {old_seconds / new_seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
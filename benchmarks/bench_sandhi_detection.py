@@ -0,0 +1,99 @@
+"""
+Benchmark: per-pattern find loops vs SanskritTokenizer.detect_sandhi_patterns
+(PatternMatcher.find_all: regex scan on short texts, find loops on long ones),
+per line and on the whole text, and peak memory of the streaming variant on a
+multi-megabyte file.
+
+Usage:
+    python benchmarks/bench_sandhi_detection.py [--repeat_text 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+# Add src directory to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from tokenizer import SanskritTokenizer
+
+
+def detect_sequential(tokenizer, text):
+    """The previous detect_sandhi_patterns: one find loop per pattern, then a sort."""
+    patterns = []
+    for sandhi_type, literals in tokenizer.detection_patterns.items():
+        for pattern in literals:
+            pos = 0
+            while pos < len(text):
+                found = text.find(pattern, pos)
+                if found == -1:
+                    break
+                patterns.append({'type': sandhi_type, 'pattern': pattern,
+                                 'position': found, 'length': len(pattern)})
+                pos = found + 1
+    return sorted(patterns, key=lambda x: x['position'])
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(fn, *args):
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sandhi pattern detection')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--repeat_text', type=int, default=10, help='Concatenate the file this many times')
+    args = parser.parse_args()
+    
+    tokenizer = SanskritTokenizer()
+    with open(args.data_path, 'r', encoding='utf-8') as f:
+        text = f.read() * args.repeat_text
+    print(f"Text: {len(text):,} characters")
+    
+    lines = text.splitlines()
+    _, old_lines = timed(lambda: [detect_sequential(tokenizer, line) for line in lines])
+    _, new_lines = timed(lambda: [tokenizer.detect_sandhi_patterns(line) for line in lines])
+    old, old_seconds = timed(detect_sequential, tokenizer, text)
+    new, new_seconds = timed(tokenizer.detect_sandhi_patterns, text)
+    print(f"Matches: {len(new):,}  identical: {old == new}")
+    print(f"{'':<22} {'per line (s)':>13} {'whole text (s)':>15}")
+    print(f"{'find loops + sort':<22} {old_lines:>13.3f} {old_seconds:>15.3f}")
+    print(f"{'detect_sandhi_patterns':<22} {new_lines:>13.3f} {new_seconds:>15.3f}")
+    print()
+    
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False) as tmp:
+        tmp.write(text)
+    try:
+        def whole_file(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return tokenizer.analyze_text_complexity(f.read())
+        
+        def streamed(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return tokenizer.analyze_text_complexity_stream(f)
+        
+        whole_stats, whole_seconds = timed(whole_file, tmp.name)
+        stream_stats, stream_seconds = timed(streamed, tmp.name)
+        print(f"Complexity stats identical: {whole_stats == stream_stats}")
+        print(f"analyze_text_complexity: {whole_seconds:.3f} s  streamed: {stream_seconds:.3f} s")
+        print(f"Peak memory, whole file: {peak_memory(whole_file, tmp.name) / 2**20:.1f} MiB")
+        print(f"Peak memory, streamed:   {peak_memory(streamed, tmp.name) / 2**20:.1f} MiB")
+    finally:
+        os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
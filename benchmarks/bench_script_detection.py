@@ -0,0 +1,90 @@
+"""
+Benchmark: Sanskrit script detection (_is_sanskrit_text) with the previous
+per-character Python loop vs the UTF-8 byte counting in tokenizer.py (count_devanagari).
+Checks that both return the same ratio on the corpus, on mixed-script texts
+and on every BMP character, then times short and long texts.
+
+Usage:
+    python benchmarks/bench_script_detection.py [--repeats 2000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from integrated_sanskrit_processor import IntegratedSanskritProcessor
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def loop_is_sanskrit_text(text):
+    """The previous implementation of _is_sanskrit_text."""
+    if not text or not text.strip():
+        return False, 0.0
+    sanskrit_chars = 0
+    total_chars = 0
+    sanskrit_ranges = [(0x0900, 0x097F), (0x0951, 0x0954), (0x0960, 0x0963)]
+    sanskrit_symbols = {'।', '॥', 'ऽ', 'ॐ', 'ं', 'ः'}
+    for char in text.strip():
+        if char.isspace() or char in '.,;:!?\'"-()[]{}':
+            continue
+        total_chars += 1
+        char_code = ord(char)
+        is_sanskrit = False
+        for start, end in sanskrit_ranges:
+            if start <= char_code <= end:
+                is_sanskrit = True
+                break
+        if char in sanskrit_symbols:
+            is_sanskrit = True
+        if is_sanskrit:
+            sanskrit_chars += 1
+    if total_chars == 0:
+        return False, 0.0
+    sanskrit_ratio = sanskrit_chars / total_chars
+    return sanskrit_ratio >= 0.7, sanskrit_ratio
+
+
+def per_call_us(function, text, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function(text)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Sanskrit script detection')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--repeats', type=int, default=2000)
+    args = parser.parse_args()
+    
+    detect = IntegratedSanskritProcessor()._is_sanskrit_text
+    corpus = [combined for combined, _ in load_sandhi_cleaned_data(args.data_path)]
+    
+    # Equivalence: corpus lines, random mixed-script texts, every BMP character
+    random.seed(0)
+    alphabet = ''.join(corpus[:200]) + 'abc XYZ 123 .,;:!?\'"-()[]{}\t\n 　é'
+    mixed = [''.join(random.choices(alphabet, k=random.randint(0, 40))) for _ in range(20000)]
+    bmp = [chr(c) for c in range(0x10000) if not 0xD800 <= c < 0xE000]
+    mismatches = sum(detect(text) != loop_is_sanskrit_text(text) for text in corpus + mixed + bmp)
+    print(f"Checked {len(corpus) + len(mixed) + len(bmp)} texts: {mismatches} mismatches")
+    
+    print(f"{'text':<22} {'loop (us)':>10} {'bytes (us)':>11} {'speedup':>8}")
+    for name, text in (('one sentence', corpus[0]),
+                       ('8 words', ' '.join(' '.join(corpus).split()[:8])),
+                       ('whole corpus', '\n'.join(corpus))):
+        repeats = max(1, args.repeats * 100 // max(100, len(text)))
+        before = per_call_us(loop_is_sanskrit_text, text, repeats)
+        after = per_call_us(detect, text, repeats)
+        label = f"{name} ({len(text)} ch)"
+        print(f"{label:<22} {before:>10.1f} {after:>11.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
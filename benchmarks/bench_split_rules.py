@@ -0,0 +1,77 @@
+"""
+Benchmark: sequential re.match loop vs the combined, precompiled split-rule
+alternation in HybridSandhiSplitter. Measures rule-match throughput over the
+words in data/sandhi_cleaned.txt and reports how often each rule fired.
+
+Usage:
+    python benchmarks/bench_split_rules.py [--repeats 3]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from collections import Counter
+
+# Add src and data directories to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from hybrid_sandhi_splitter import HybridSandhiSplitter
+from sandhi_cleaned_loader import load_sandhi_cleaned_data
+
+
+def sequential_rule_split(splitter, word):
+    """The previous _rule_based_split: one re.match per rule, in order."""
+    for _, pattern, handler in splitter.split_patterns:
+        match = re.match(pattern, word)
+        if match:
+            try:
+                result = handler(match)
+                if result and len(result) > 1:
+                    return result
+            except:
+                continue
+    return splitter._tokenizer_split(word)
+
+
+def time_it(fn, words, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for word in words:
+            fn(word)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark split-rule matching')
+    parser.add_argument('--data_path', default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    splitter = HybridSandhiSplitter(use_bilstm=False)
+    words = [word for combined, _ in load_sandhi_cleaned_data(args.data_path) for word in combined.split()]
+    
+    differing = sum(sequential_rule_split(splitter, word) != splitter._rule_based_split(word) for word in words)
+    print(f"Words: {len(words)}  results differing from the sequential loop: {differing}")
+    
+    old_seconds = time_it(lambda word: sequential_rule_split(splitter, word), words, args.repeats)
+    new_seconds = time_it(splitter._rule_based_split, words, args.repeats)
+    print(f"{'matcher':<22} {'seconds':>9} {'words/sec':>11}")
+    print(f"{'sequential re.match':<22} {old_seconds:>9.3f} {len(words) / old_seconds:>11,.0f}")
+    print(f"{'combined alternation':<22} {new_seconds:>9.3f} {len(words) / new_seconds:>11,.0f} "
+          f"({old_seconds / new_seconds:.1f}x)")
+    
+    fired = Counter((splitter.match_split_rule(word) or ('no_rule',))[0] for word in words)
+    print()
+    print("Rules fired:")
+    for name, count in fired.most_common():
+        print(f"  {name:<22} {count:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: startup cost of each entry point, measured in a fresh interpreter.
+Reports import time, time to the first result, peak RSS and whether torch
+(or the CRF pickle) was loaded along the way.
+
+Usage:
+    python benchmarks/bench_startup.py [--runtime auto] [--repeats 3]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXT = 'रामो गच्छति वनं च'
+
+# Entry point -> (import statement, code producing the first result)
+SCENARIOS = {
+    'tokenize': ('from integrated_sanskrit_processor import IntegratedSanskritProcessor',
+                 'IntegratedSanskritProcessor().tokenizer.tokenize(TEXT)'),
+    'tag_file': ('import tag_file',
+                 "tag_file.IntegratedSanskritProcessor(use_bilstm=False).tag_pos_batch([TEXT])"),
+    'split': ('from integrated_sanskrit_processor import IntegratedSanskritProcessor',
+              "IntegratedSanskritProcessor(bilstm_runtime=RUNTIME).sandhi_splitter.analyze_words(TEXT.split())"),
+    'process_text': ('from integrated_sanskrit_processor import IntegratedSanskritProcessor',
+                     'IntegratedSanskritProcessor(bilstm_runtime=RUNTIME).process_text(TEXT)'),
+    'simple_app': ('import simple_app',
+                   "simple_app.app.test_client().post('/process', data={'sanskrit_text': TEXT})"),
+}
+
+PROBE = '''
+import os, sys, time, json, resource, contextlib
+sys.path.insert(0, {src!r}); sys.path.insert(0, {root!r})
+TEXT, RUNTIME = {text!r}, {runtime!r}
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    start = time.perf_counter()
+    {import_statement}
+    imported = time.perf_counter()
+    {first_result}
+    done = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'first_result_ms': (done - imported) * 1000,
+    'rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'torch': 'torch' in sys.modules,
+    'crf_tagger': 'crf_pos_tagger' in sys.modules,
+}}))
+'''
+
+
+def run_scenario(name: str, runtime: str) -> dict:
+    import_statement, first_result = SCENARIOS[name]
+    code = PROBE.format(src=os.path.join(project_root, 'src'), root=project_root, text=TEXT, runtime=runtime,
+                        import_statement=import_statement, first_result=first_result)
+    env = dict(os.environ, BILSTM_RUNTIME=runtime)
+    completed = subprocess.run([sys.executable, '-c', code], cwd=project_root, env=env,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark entry point startup')
+    parser.add_argument('--runtime', default='auto', help='BiLSTM runtime (BILSTM_RUNTIME)')
+    parser.add_argument('--repeats', type=int, default=3, help='Fresh interpreters per entry point (best is kept)')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    args = parser.parse_args()
+    
+    print(f"BiLSTM runtime: {args.runtime}")
+    print(f"{'entry point':<14} {'import (ms)':>11} {'first result (ms)':>18} {'peak RSS (MiB)':>15} "
+          f"{'torch':>6} {'CRF':>5}")
+    for name in args.scenarios:
+        runs = [run_scenario(name, args.runtime) for _ in range(args.repeats)]
+        if 'error' in runs[0]:
+            print(f"{name:<14} skipped: {runs[0]['error']}")
+            continue
+        best = min(runs, key=lambda run: run['import_ms'] + run['first_result_ms'])
+        print(f"{name:<14} {best['import_ms']:>11.0f} {best['first_result_ms']:>18.0f} {best['rss_mib']:>15.0f} "
+              f"{'yes' if best['torch'] else 'no':>6} {'yes' if best['crf_tagger'] else 'no':>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import os 
 import sys
-from flask import Flask, render_template, request, jsonify
+import json
+import logging
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 
 # Add src directory to path
 current_dir = os.path.dirname(__file__)
@@ -8,36 +10,132 @@ sys.path.insert(0, os.path.join(current_dir, 'src'))
 
 try:
     from integrated_sanskrit_processor import IntegratedSanskritProcessor
+    from batch_scheduler import MicroBatchScheduler
+    import model_registry
+    import pipeline_metrics
 except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
 
 app = Flask(__name__)
 
+# Size of the per-word sandhi analysis cache (0 disables it)
+SANDHI_CACHE_SIZE = int(os.environ.get('SANDHI_CACHE_SIZE', '4096'))
+# Size of the per-word CRF score cache (0 disables it)
+POS_CACHE_SIZE = int(os.environ.get('POS_CACHE_SIZE', '4096'))
+# BiLSTM backend: auto (fastest available), onnx, numpy, torchscript, eager or int8
+BILSTM_RUNTIME = os.environ.get('BILSTM_RUNTIME', 'auto')
+# Pipeline log level; WARNING keeps per-request details out of production logs
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'WARNING').upper()
+# Per-stage timings and work counters in every /process result and in /health
+COLLECT_METRICS = os.environ.get('COLLECT_METRICS', '0') == '1'
+# Micro-batching of /process: how long a request waits for others to join its
+# batch, and the number of words at which a batch runs without waiting
+BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', '5'))
+BATCH_MAX_TOKENS = int(os.environ.get('BATCH_MAX_TOKENS', '256'))
+# /process_batch: largest accepted list, and texts sent through the pipeline per call
+MAX_BATCH_TEXTS = int(os.environ.get('MAX_BATCH_TEXTS', '10000'))
+BATCH_CHUNK_TEXTS = int(os.environ.get('BATCH_CHUNK_TEXTS', '256'))
+# /process_stream: input lines processed (and streamed back) together
+STREAM_CHUNK_TEXTS = int(os.environ.get('STREAM_CHUNK_TEXTS', '32'))
+
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+logger = logging.getLogger(__name__)
+
 # Initialize the integrated processor
-print("🔧 Loading Integrated Sanskrit Processor...")
+logger.info("Loading Integrated Sanskrit Processor...")
 try:
     processor = IntegratedSanskritProcessor(
         pos_model_path=os.path.join(current_dir, 'models', 'enhanced_crf_pos_model_v3.pkl'),
         bilstm_threshold=0.7,
-        use_bilstm=True
+        use_bilstm=True,
+        sandhi_cache_size=SANDHI_CACHE_SIZE,
+        pos_cache_size=POS_CACHE_SIZE,
+        bilstm_runtime=BILSTM_RUNTIME,
+        collect_metrics=COLLECT_METRICS
     )
-    print("✅ Processor loaded successfully")
+    # Load the models now rather than on the first request; under gunicorn --preload
+    # this runs once in the master and the workers share the pages copy-on-write
+    processor.warmup()
+    model_registry.freeze()
+    logger.info("Processor loaded successfully")
 except Exception as e:
-    print(f"⚠️  Model loading failed: {e}")
-    print("🔄 Loading without models...")
+    logger.warning("Model loading failed: %s; loading without models", e)
     processor = IntegratedSanskritProcessor(
         pos_model_path=None,
         bilstm_threshold=0.7,
-        use_bilstm=False
+        use_bilstm=False,
+        sandhi_cache_size=SANDHI_CACHE_SIZE,
+        pos_cache_size=POS_CACHE_SIZE,
+        collect_metrics=COLLECT_METRICS
     )
-    print("✅ Processor loaded in basic mode")
+    logger.info("Processor loaded in basic mode")
+
+# Concurrent /process requests are run through the pipeline together
+scheduler = MicroBatchScheduler(processor, max_wait_ms=BATCH_MAX_WAIT_MS, max_batch_tokens=BATCH_MAX_TOKENS)
 
 @app.route('/')
 def home():
     """Render the main analysis interface."""
     return render_template('index.html')
 
+def format_results(results):
+    """Shape one process_text result for the frontend (or its language-check error)."""
+    # Check for language validation error
+    if 'error' in results and 'Sanskrit text only' in results['error']:
+        return {
+            'error': results['error'],
+            'language_check': results.get('language_check', {}),
+            'success': False
+        }
+    
+    # Format results for the frontend
+    pos_analysis = results.get('pos_analysis', {})
+    tagged_tokens = pos_analysis.get('tagged_tokens', [])
+    
+    # Get sandhi operations
+    sandhi_analysis = results.get('sandhi_analysis', {})
+    sandhi_operations = sandhi_analysis.get('sandhi_operations', [])
+    
+    # Try alternative key if sandhi_operations is empty
+    if not sandhi_operations:
+        sandhi_operations = sandhi_analysis.get('operations', [])
+    
+    # Get confidence scores
+    overall_confidence = results.get('overall_confidence', 0.95)
+    
+    # Enhance sandhi operations with method information
+    enhanced_sandhi_ops = []
+    for i, op in enumerate(sandhi_operations):
+        enhanced_op = {
+            'original': op.get('original', f'token_{i}'),
+            'split': op.get('split', [op.get('original', f'token_{i}')]),
+            'confidence': op.get('confidence', 0.95),
+            'method': op.get('method', 'BILSTM' if op.get('split') and len(op.get('split', [])) > 1 else 'NONE')
+        }
+        enhanced_sandhi_ops.append(enhanced_op)
+    
+    # Ensure tokens have confidence scores
+    enhanced_tokens = []
+    for token in tagged_tokens:
+        if len(token) == 2:
+            enhanced_tokens.append([token[0], token[1], 0.95])  # Add default confidence
+        else:
+            enhanced_tokens.append(token)
+    
+    formatted_results = {
+        'tokens': enhanced_tokens,
+        'sandhi_operations': enhanced_sandhi_ops,
+        'confidence': overall_confidence
+    }
+    if 'metrics' in results:
+        formatted_results['metrics'] = results['metrics']
+    
+    return {
+        'success': True,
+        'results': formatted_results
+    }
+
 @app.route('/process', methods=['POST'])
 def process_text():
     """Process Sanskrit text and return results."""
@@ -49,60 +147,45 @@ def process_text():
                 'error': 'Please enter some Sanskrit text'
             })
         
-        # Process the text using integrated processor
-        results = processor.process_text(user_input)
+        # Process the text using integrated processor, batched with concurrent requests
+        results = scheduler.process_text(user_input)
         
-        # Check for language validation error
-        if 'error' in results and 'Sanskrit text only' in results['error']:
+        return jsonify(format_results(results))
+    
+    except Exception as e:
+        return jsonify({
+            'error': f'Processing error: {str(e)}'
+        })
+
+def process_many(texts):
+    """Formatted results for a list of texts, processed BATCH_CHUNK_TEXTS at a time."""
+    formatted = []
+    for start in range(0, len(texts), BATCH_CHUNK_TEXTS):
+        chunk = [text.strip() for text in texts[start:start + BATCH_CHUNK_TEXTS]]
+        # Empty texts get the same error as on /process and skip the pipeline
+        results = iter(processor.process_texts([text for text in chunk if text]))
+        for text in chunk:
+            formatted.append(format_results(next(results)) if text else {'error': 'Please enter some Sanskrit text'})
+    return formatted
+
+@app.route('/process_batch', methods=['POST'])
+def process_batch():
+    """Process a JSON list of texts ({"texts": [...]}) with the batched pipeline."""
+    try:
+        payload = request.get_json(silent=True) or {}
+        texts = payload.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
             return jsonify({
-                'error': results['error'],
-                'language_check': results.get('language_check', {}),
-                'success': False
-            })
-        
-        # Format results for the frontend
-        pos_analysis = results.get('pos_analysis', {})
-        tagged_tokens = pos_analysis.get('tagged_tokens', [])
-        
-        # Get sandhi operations
-        sandhi_analysis = results.get('sandhi_analysis', {})
-        sandhi_operations = sandhi_analysis.get('sandhi_operations', [])
-        
-        # Try alternative key if sandhi_operations is empty
-        if not sandhi_operations:
-            sandhi_operations = sandhi_analysis.get('operations', [])
-        
-        # Get confidence scores
-        overall_confidence = results.get('overall_confidence', 0.95)
-        
-        # Enhance sandhi operations with method information
-        enhanced_sandhi_ops = []
-        for i, op in enumerate(sandhi_operations):
-            enhanced_op = {
-                'original': op.get('original', f'token_{i}'),
-                'split': op.get('split', [op.get('original', f'token_{i}')]),
-                'confidence': op.get('confidence', 0.95),
-                'method': op.get('method', 'BILSTM' if op.get('split') and len(op.get('split', [])) > 1 else 'NONE')
-            }
-            enhanced_sandhi_ops.append(enhanced_op)
-        
-        # Ensure tokens have confidence scores
-        enhanced_tokens = []
-        for token in tagged_tokens:
-            if len(token) == 2:
-                enhanced_tokens.append([token[0], token[1], 0.95])  # Add default confidence
-            else:
-                enhanced_tokens.append(token)
-        
-        formatted_results = {
-            'tokens': enhanced_tokens,
-            'sandhi_operations': enhanced_sandhi_ops,
-            'confidence': overall_confidence
-        }
+                'error': 'Expected a JSON object with a "texts" list of strings'
+            }), 400
+        if len(texts) > MAX_BATCH_TEXTS:
+            return jsonify({
+                'error': f'At most {MAX_BATCH_TEXTS} texts per request; use /process_stream for more'
+            }), 413
         
         return jsonify({
             'success': True,
-            'results': formatted_results
+            'results': process_many(texts)
         })
         
     except Exception as e:
@@ -110,6 +193,56 @@ def process_text():
             'error': f'Processing error: {str(e)}'
         })
 
+def read_ndjson(stream):
+    """Yield (line number, text, error message or None) for each non-blank line of an NDJSON stream."""
+    for number, line in enumerate(stream, 1):
+        line = line.decode('utf-8', errors='replace').strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {e}'
+            continue
+        text = item.get('text') if isinstance(item, dict) else item
+        if not isinstance(text, str):
+            yield number, None, 'Expected a JSON string or an object with a "text" string'
+            continue
+        yield number, text, None
+
+@app.route('/process_stream', methods=['POST'])
+def process_stream():
+    """
+    Process NDJSON input (one JSON string, or {"text": ...} object, per line) and
+    stream one NDJSON result per input line, in order, as each chunk of
+    STREAM_CHUNK_TEXTS lines finishes. The body is read incrementally, so
+    uploads of any size are never held in memory.
+    """
+    def generate():
+        chunk = []
+        for item in read_ndjson(request.stream):
+            chunk.append(item)
+            if len(chunk) >= STREAM_CHUNK_TEXTS:
+                yield from process_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from process_chunk(chunk)
+    
+    def process_chunk(chunk):
+        try:
+            results = iter(process_many([text for _, text, error in chunk if error is None]))
+        except Exception as e:
+            results = None
+            failure = f'Processing error: {str(e)}'
+        for number, text, error in chunk:
+            if error is None:
+                result = next(results) if results is not None else {'error': failure}
+            else:
+                result = {'error': error}
+            yield json.dumps(dict(result, line=number), ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/health')
 def health_check():
     """Health check endpoint."""
@@ -119,14 +252,21 @@ def health_check():
             'tokenizer': 'loaded',
             'sandhi_splitter': 'loaded',
             'crf_model': 'loaded' if processor.crf_model else 'not available',
-            'bilstm_model': 'loaded' if processor.sandhi_splitter.bilstm_model else 'not available'
-        }
+            'bilstm_model': 'loaded' if processor.sandhi_splitter.bilstm_model else 'not available',
+            'bilstm_runtime': processor.sandhi_splitter.bilstm_model.name if processor.sandhi_splitter.bilstm_model else None
+        },
+        'shared_models': model_registry.loaded_models(),
+        'sandhi_cache': processor.sandhi_splitter.cache_stats(),
+        'pos_cache': processor.crf_model.cache_stats() if processor.crf_model else None,
+        'scheduler': scheduler.stats(),
+        'pipeline_metrics': pipeline_metrics.registry.snapshot() if COLLECT_METRICS else None
     })
 
 if __name__ == '__main__':
     print("🌐 Starting Simple Sanskrit NLP App...")
     print("🎯 Available at: http://localhost:8085")
     print("📊 API endpoint: http://localhost:8085/process")
+    print("📦 Batch endpoints: http://localhost:8085/process_batch, http://localhost:8085/process_stream")
     print("🏥 Health check: http://localhost:8085/health")
     
     app.run(debug=True, host='0.0.0.0', port=8085)
@@ -0,0 +1,167 @@
+"""
+Micro-batching Request Scheduler
+Collects texts submitted by concurrent request threads for up to max_wait_ms
+(or until max_batch_tokens words are waiting) and runs them through one
+IntegratedSanskritProcessor.process_texts call, so concurrent requests share
+one BiLSTM forward pass and one CRF batch. Each caller gets back its own
+process_text result. A caller with no other request in flight is not held
+back: its batch runs as soon as the worker takes it. If a batch fails, its
+texts are rerun one by one, so only the request whose text fails gets the error.
+
+The worker thread starts on first use and is restarted after a fork, so a
+scheduler created in a preloading parent (gunicorn --preload) works in every
+worker.
+"""
+
+import os
+import time
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from pipeline_metrics import Histogram
+
+
+class _Request:
+    __slots__ = ('text', 'tokens', 'done', 'result', 'error')
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = max(1, len(text.split()))
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatchScheduler:
+    """Batches concurrent process_text calls into process_texts calls."""
+    
+    def __init__(self, processor, max_wait_ms: float = 5.0, max_batch_tokens: int = 256):
+        """
+        Args:
+            processor: IntegratedSanskritProcessor that runs the batches
+            max_wait_ms: How long the first text of a batch waits for others to join
+            max_batch_tokens: Words (whitespace-separated) at which a batch is run
+                without waiting further; a single longer text runs on its own
+        """
+        self.processor = processor
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_tokens = max_batch_tokens
+        
+        self.queue_depth = Histogram([0, 1, 2, 4, 8, 16, 32, 64])
+        self.batch_texts = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.batch_tokens = Histogram([1, 4, 16, 64, 256, 1024])
+        self.batch_seconds = Histogram([0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0])
+        
+        self._queue = None
+        self._worker = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        
+        # Callers between submitting a text and receiving its result
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+    
+    def process_text(self, text: str, timeout: float = None) -> Dict[str, Any]:
+        """
+        Process one text as part of the next batch and return its process_text result.
+        
+        Raises:
+            TimeoutError: If no result arrived within timeout seconds
+            Exception: Whatever process_texts raised for this text
+        """
+        request = _Request(text)
+        self._ensure_worker()
+        with self._in_flight_lock:
+            self._in_flight += 1
+        try:
+            self._queue.put(request)
+            if not request.done.wait(timeout):
+                raise TimeoutError(f"No result within {timeout} s")
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+        if request.error is not None:
+            raise request.error
+        return request.result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Settings, current queue size and the queue-depth / batch-size histograms."""
+        return {
+            'max_wait_ms': self.max_wait * 1000.0,
+            'max_batch_tokens': self.max_batch_tokens,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'queue_depth': self.queue_depth.snapshot(),
+            'batch_texts': self.batch_texts.snapshot(),
+            'batch_tokens': self.batch_tokens.snapshot(),
+            'batch_seconds': self.batch_seconds.snapshot()
+        }
+    
+    def _ensure_worker(self):
+        """Start the worker thread in this process (threads do not survive fork)."""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._worker = threading.Thread(target=self._run, args=(self._queue,),
+                                                name='micro-batch-scheduler', daemon=True)
+                self._worker.start()
+                self._pid = os.getpid()
+    
+    def _run(self, requests: queue.Queue):
+        overflow = None
+        while True:
+            batch, overflow = self._collect(requests, overflow)
+            start = time.perf_counter()
+            try:
+                self._process(batch)
+            finally:
+                for request in batch:
+                    request.done.set()
+            self.batch_seconds.observe(time.perf_counter() - start)
+    
+    def _process(self, batch: List[_Request]):
+        """Set the result or error of every request in batch."""
+        try:
+            results = self.processor.process_texts([request.text for request in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+                return
+            # One bad text must not fail the other callers' requests
+            for request in batch:
+                self._process([request])
+            return
+        for request, result in zip(batch, results):
+            request.result = result
+    
+    def _collect(self, requests: queue.Queue,
+                 first: Optional[_Request] = None) -> Tuple[List[_Request], Optional[_Request]]:
+        """
+        Take first (or block for a request), then gather more until the wait or
+        token budget runs out. Returns the batch and the request that would have
+        exceeded the budget, if any, which starts the next batch.
+        """
+        if first is None:
+            first = requests.get()
+        self.queue_depth.observe(requests.qsize())
+        batch, tokens = [first], first.tokens
+        # Waiting only pays off if another caller may submit soon; a lone caller
+        # just takes whatever is already queued
+        deadline = time.perf_counter() + (self.max_wait if self._in_flight > 1 else 0.0)
+        overflow = None
+        while tokens < self.max_batch_tokens:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = requests.get(timeout=remaining) if remaining > 0 else requests.get_nowait()
+            except queue.Empty:
+                break
+            if tokens + request.tokens > self.max_batch_tokens:
+                overflow = request
+                break
+            batch.append(request)
+            tokens += request.tokens
+        self.batch_texts.observe(len(batch))
+        self.batch_tokens.observe(tokens)
+        return batch, overflow
@@ -0,0 +1,278 @@
+"""
+BiLSTM Sandhi Runtimes
+Inference backends for the BiLSTM sandhi model behind one interface,
+predict_proba_batch(sequences) -> per-sequence split probabilities:
+
+- 'onnx':        ONNX Runtime on models/bilstm_sandhi.onnx
+- 'numpy':       NumPy-only forward pass on models/bilstm_sandhi.npz (no torch import)
+- 'torchscript': TorchScript on models/bilstm_sandhi.ts.pt
+- 'eager':       PyTorch eager on the models/bilstm_sandhi.pt checkpoint
+- 'int8':        PyTorch eager, dynamic int8 LSTM/Linear, on models/bilstm_sandhi_int8.pt
+
+Exported artifacts carry the character vocabulary, so they load without the
+training checkpoint. load_bilstm_runtime picks the fastest full-precision
+runtime available locally, in the order above, so torch is only imported
+when neither the ONNX nor the NumPy artifact is present; the int8 variant
+trades accuracy for speed and is only used when asked for. Write the exports with
+src/export_bilstm.py and the int8 checkpoint with src/quantize_bilstm.py.
+"""
+
+import os
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_DIR = os.path.join(project_root, 'models')
+
+# Artifact file name of each runtime
+RUNTIME_ARTIFACTS = {
+    'onnx': 'bilstm_sandhi.onnx',
+    'numpy': 'bilstm_sandhi.npz',
+    'torchscript': 'bilstm_sandhi.ts.pt',
+    'eager': 'bilstm_sandhi.pt',
+    'int8': 'bilstm_sandhi_int8.pt',
+}
+
+# Runtimes tried by 'auto', fastest first; all give the same probabilities
+AUTO_RUNTIMES = ('onnx', 'numpy', 'torchscript', 'eager')
+
+# Name under which exported artifacts store the character vocabulary
+VOCAB_KEY = 'char_to_idx'
+
+
+class _ExactLengthRuntime:
+    """
+    Base for exported graphs, which take a padded (batch, seq_len) int64 matrix
+    and have no sequence packing: sequences are grouped by exact length so no
+    padding reaches the backward LSTM and results match the eager packed pass.
+    """
+    
+    name = None
+    
+    def __init__(self, path: str, char_to_idx: Dict[str, int]):
+        self.path = path
+        self.char_to_idx = char_to_idx
+    
+    def _forward(self, inputs: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+    
+    def predict_proba_batch(self, sequences: List[List[int]], pad_idx: int = 0,
+                            bucket_size: int = 512) -> List[np.ndarray]:
+        """Split probabilities for each pre-encoded sequence, in input order."""
+        results = [None] * len(sequences)
+        by_length = defaultdict(list)
+        for i, seq in enumerate(sequences):
+            by_length[len(seq)].append(i)
+        
+        for length, indices in by_length.items():
+            if length == 0:
+                for i in indices:
+                    results[i] = np.zeros(0, dtype=np.float32)
+                continue
+            for start in range(0, len(indices), bucket_size):
+                bucket = indices[start:start + bucket_size]
+                inputs = np.array([sequences[i] for i in bucket], dtype=np.int64)
+                probabilities = self._forward(inputs)
+                for row, i in enumerate(bucket):
+                    results[i] = probabilities[row]
+        return results
+
+
+class OnnxBiLSTM(_ExactLengthRuntime):
+    """BiLSTM served by ONNX Runtime on the CPU."""
+    
+    name = 'onnx'
+    
+    def __init__(self, path: str):
+        import onnxruntime
+        
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        super().__init__(path, json.loads(metadata[VOCAB_KEY]))
+        self.input_name = self.session.get_inputs()[0].name
+    
+    def _forward(self, inputs: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: inputs})[0]
+
+
+class TorchScriptBiLSTM(_ExactLengthRuntime):
+    """BiLSTM served by a TorchScript module, without the Python model class."""
+    
+    name = 'torchscript'
+    
+    def __init__(self, path: str):
+        import torch
+        
+        extra_files = {f'{VOCAB_KEY}.json': ''}
+        self.module = torch.jit.load(path, map_location='cpu', _extra_files=extra_files)
+        self.module.eval()
+        super().__init__(path, json.loads(extra_files[f'{VOCAB_KEY}.json']))
+    
+    def _forward(self, inputs: np.ndarray) -> np.ndarray:
+        import torch
+        
+        with torch.no_grad():
+            return self.module(torch.from_numpy(inputs)).numpy()
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    # tanh form: same value as 1 / (1 + exp(-x)) without overflow warnings
+    return 0.5 * np.tanh(0.5 * x) + 0.5
+
+
+class NumpyBiLSTM(_ExactLengthRuntime):
+    """
+    BiLSTM forward pass in NumPy from the model's state dict saved as .npz,
+    so serving needs neither torch nor onnxruntime. Both directions of a
+    layer advance together: one batched matmul per time step for the
+    recurrence, with the input projections of all steps computed up front.
+    """
+    
+    name = 'numpy'
+    
+    def __init__(self, path: str):
+        with np.load(path, allow_pickle=False) as weights:
+            state = {key: weights[key] for key in weights.files}
+        super().__init__(path, json.loads(str(state.pop(VOCAB_KEY))))
+        
+        self.embedding = state['embedding.weight'].astype(np.float32)
+        self.layers = []
+        layer = 0
+        while f'lstm.weight_ih_l{layer}' in state:
+            directions = [self._direction_weights(state, f'l{layer}{suffix}') for suffix in ('', '_reverse')]
+            # (2, in, 4H) input weights, (2, 1, 4H) biases, (2, H, 4H) recurrent weights
+            self.layers.append(tuple(np.stack(arrays) for arrays in zip(*directions)))
+            layer += 1
+        self.hidden_size = self.layers[0][2].shape[1]
+        self.classifier_weight = state['classifier.weight'].T.astype(np.float32)
+        self.classifier_bias = state['classifier.bias'].astype(np.float32)
+    
+    @staticmethod
+    def _direction_weights(state: Dict[str, np.ndarray], suffix: str):
+        """Transposed weights and summed bias of one direction, gates reordered to (i, f, o, g)."""
+        hidden_size = state[f'lstm.weight_hh_{suffix}'].shape[1]
+        # PyTorch stores gates as (i, f, g, o); putting the three sigmoid gates first
+        # lets a single sigmoid call cover them
+        order = np.concatenate([np.arange(0, 2 * hidden_size), np.arange(3 * hidden_size, 4 * hidden_size),
+                                np.arange(2 * hidden_size, 3 * hidden_size)])
+        weight_ih = state[f'lstm.weight_ih_{suffix}'][order].T
+        weight_hh = state[f'lstm.weight_hh_{suffix}'][order].T
+        bias = (state[f'lstm.bias_ih_{suffix}'] + state[f'lstm.bias_hh_{suffix}'])[order][None, :]
+        return (np.ascontiguousarray(weight_ih, dtype=np.float32), bias.astype(np.float32),
+                np.ascontiguousarray(weight_hh, dtype=np.float32))
+    
+    def _forward(self, inputs: np.ndarray) -> np.ndarray:
+        batch_size, seq_len = inputs.shape
+        hidden = self.hidden_size
+        x = self.embedding[inputs]
+        for weight_ih, bias, weight_hh in self.layers:
+            # Both directions in one array; the backward one runs over reversed time
+            sequences = np.stack([x, x[:, ::-1]])
+            gates_x = np.matmul(sequences, weight_ih[:, None]) + bias[:, None]
+            h = np.zeros((2, batch_size, hidden), dtype=np.float32)
+            c = np.zeros((2, batch_size, hidden), dtype=np.float32)
+            outputs = np.empty((2, batch_size, seq_len, hidden), dtype=np.float32)
+            for t in range(seq_len):
+                gates = gates_x[:, :, t] + np.matmul(h, weight_hh)
+                sigmoid_gates = _sigmoid(gates[..., :3 * hidden])
+                c = sigmoid_gates[..., hidden:2 * hidden] * c + \
+                    sigmoid_gates[..., :hidden] * np.tanh(gates[..., 3 * hidden:])
+                h = sigmoid_gates[..., 2 * hidden:] * np.tanh(c)
+                outputs[:, :, t] = h
+            x = np.concatenate([outputs[0], outputs[1][:, ::-1]], axis=-1)
+        logits = x @ self.classifier_weight + self.classifier_bias
+        return _sigmoid(logits[..., 0])
+
+
+class EagerBiLSTM:
+    """BiLSTM served by PyTorch eager from the training checkpoint."""
+    
+    name = 'eager'
+    
+    def __init__(self, path: str, device: str = None):
+        import torch
+        from bilstm_sandhi import BiLSTMSandhiSplitter
+        
+        device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        model_data = torch.load(path, map_location=device)
+        model_config = model_data['model_config']
+        self.model = BiLSTMSandhiSplitter(
+            vocab_size=model_config['vocab_size'],
+            embedding_dim=model_config['embedding_dim'],
+            hidden_dim=model_config['hidden_dim'],
+            num_layers=model_config['num_layers'],
+            device=device
+        )
+        self.model.load_state_dict(model_data['model_state_dict'])
+        self.model.eval()
+        self.path = path
+        self.char_to_idx = model_data['char_to_idx']
+    
+    def predict_proba_batch(self, sequences: List[List[int]], pad_idx: int = 0,
+                            bucket_size: int = 512) -> List[np.ndarray]:
+        return self.model.predict_proba_batch(sequences, pad_idx=pad_idx, bucket_size=bucket_size)
+
+
+class QuantizedBiLSTM(EagerBiLSTM):
+    """BiLSTM with dynamic int8 LSTM and Linear layers, served by PyTorch eager on the CPU."""
+    
+    name = 'int8'
+    
+    def __init__(self, path: str):
+        from bilstm_sandhi import load_quantized_model
+        
+        self.model, self.char_to_idx = load_quantized_model(path)
+        self.path = path
+
+
+RUNTIME_CLASSES = {
+    'onnx': OnnxBiLSTM,
+    'numpy': NumpyBiLSTM,
+    'torchscript': TorchScriptBiLSTM,
+    'eager': EagerBiLSTM,
+    'int8': QuantizedBiLSTM,
+}
+
+
+def available_runtimes(model_dir: str = DEFAULT_MODEL_DIR) -> List[str]:
+    """Runtimes whose artifact exists in model_dir, in order of preference."""
+    return [name for name, filename in RUNTIME_ARTIFACTS.items()
+            if os.path.exists(os.path.join(model_dir, filename))]
+
+
+def load_bilstm_runtime(model_dir: str = DEFAULT_MODEL_DIR, runtime: str = 'auto'):
+    """
+    Load a BiLSTM runtime.
+    
+    Args:
+        model_dir: Directory holding the checkpoint and exported artifacts
+        runtime: 'auto' for the first of AUTO_RUNTIMES that loads, or one of RUNTIME_ARTIFACTS
+    
+    Returns:
+        Runtime with char_to_idx and predict_proba_batch, or None if nothing could be loaded
+    """
+    if runtime != 'auto' and runtime not in RUNTIME_ARTIFACTS:
+        raise ValueError(f"Unknown BiLSTM runtime '{runtime}', expected 'auto' or one of {list(RUNTIME_ARTIFACTS)}")
+    
+    candidates = AUTO_RUNTIMES if runtime == 'auto' else [runtime]
+    for name in candidates:
+        path = os.path.join(model_dir, RUNTIME_ARTIFACTS[name])
+        if not os.path.exists(path):
+            continue
+        try:
+            return RUNTIME_CLASSES[name](path)
+        except ImportError as e:
+            logger.info("BiLSTM runtime '%s' unavailable: %s", name, e)
+        except Exception as e:
+            logger.error("Error loading BiLSTM runtime '%s' from %s: %s", name, path, e)
+    return None
@@ -6,11 +6,13 @@ Character-level Bidirectional LSTM model for detecting split positions in Sanskr
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
+from torch.utils.data import Dataset, DataLoader, Sampler
 import numpy as np
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Iterator
 import pickle
 import os
+import random
 
 
 class SandhiDataset(Dataset):
@@ -21,7 +23,8 @@ class SandhiDataset(Dataset):
         Args:
             words: List of (combined_word, split_parts) tuples
             char_to_idx: Character to index mapping
-            max_len: Maximum sequence length
+            max_len: Maximum sequence length; longer words are truncated, shorter
+                words are left unpadded (see collate_sandhi_batch)
         """
         self.words = words
         self.char_to_idx = char_to_idx
@@ -46,19 +49,20 @@ class SandhiDataset(Dataset):
             'mask': torch.tensor([c != self.unk_idx for c in encoded], dtype=torch.bool)
         }
     
+    def sequence_length(self, idx: int) -> int:
+        """Encoded length of an example, used for length bucketing."""
+        return min(len(self.words[idx][0]), self.max_len)
+    
     def _encode_word(self, word: str) -> List[int]:
         """Encode word as sequence of character indices."""
         encoded = []
         for char in word[:self.max_len]:
             encoded.append(self.char_to_idx.get(char, self.unk_idx))
-        # Pad if necessary
-        while len(encoded) < self.max_len:
-            encoded.append(self.char_to_idx.get('<PAD>', 0))
         return encoded
     
     def _create_split_labels(self, combined_word: str, split_parts: List[str]) -> List[int]:
         """Create binary labels indicating split positions."""
-        labels = [0] * self.max_len
+        labels = [0] * min(len(combined_word), self.max_len)
         
         if len(split_parts) <= 1:
             return labels
@@ -73,6 +77,53 @@ class SandhiDataset(Dataset):
         return labels
 
 
+class LengthBucketSampler(Sampler):
+    """Batch sampler that groups examples of similar length to minimise padding."""
+    
+    def __init__(self, dataset: SandhiDataset, batch_size: int, shuffle: bool = True):
+        """
+        Args:
+            dataset: Dataset exposing sequence_length(idx)
+            batch_size: Number of examples per batch
+            shuffle: Shuffle within buckets and the order of batches every epoch
+        """
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+    
+    def __iter__(self) -> Iterator[List[int]]:
+        indices = list(range(len(self.dataset)))
+        if self.shuffle:
+            random.shuffle(indices)
+        # Stable sort keeps the shuffled order inside each length
+        indices.sort(key=self.dataset.sequence_length)
+        
+        batches = [indices[i:i + self.batch_size] for i in range(0, len(indices), self.batch_size)]
+        if self.shuffle:
+            random.shuffle(batches)
+        return iter(batches)
+    
+    def __len__(self) -> int:
+        return (len(self.dataset) + self.batch_size - 1) // self.batch_size
+
+
+def collate_sandhi_batch(batch: List[Dict[str, torch.Tensor]], pad_idx: int = 0) -> Dict[str, torch.Tensor]:
+    """Pad a list of SandhiDataset items to the longest one and record true lengths."""
+    lengths = torch.tensor([len(item['input']) for item in batch], dtype=torch.long)
+    max_len = int(lengths.max()) if len(batch) else 0
+    
+    inputs = torch.full((len(batch), max_len), pad_idx, dtype=torch.long)
+    labels = torch.zeros((len(batch), max_len), dtype=torch.float)
+    masks = torch.zeros((len(batch), max_len), dtype=torch.bool)
+    for row, item in enumerate(batch):
+        length = len(item['input'])
+        inputs[row, :length] = item['input']
+        labels[row, :length] = item['labels']
+        masks[row, :length] = item['mask']
+    
+    return {'input': inputs, 'labels': labels, 'mask': masks, 'lengths': lengths}
+
+
 class BiLSTMSandhiSplitter(nn.Module):
     """Character-level BiLSTM for Sanskrit Sandhi splitting."""
     
@@ -110,11 +161,14 @@ class BiLSTMSandhiSplitter(nn.Module):
         
         self.to(device)
     
-    def forward(self, x: torch.Tensor, mask: Optional[torch.Tensor] = None) -> torch.Tensor:
+    def forward(self, x: torch.Tensor, mask: Optional[torch.Tensor] = None,
+                lengths: Optional[torch.Tensor] = None) -> torch.Tensor:
         """
         Args:
             x: Input tensor of shape (batch_size, seq_len)
             mask: Boolean mask for valid positions (batch_size, seq_len)
+            lengths: Optional true length of each sequence (batch_size,); when given,
+                padding is packed away so it never reaches the LSTM
         Returns:
             Tensor of shape (batch_size, seq_len) with split probabilities
         """
@@ -122,7 +176,12 @@ class BiLSTMSandhiSplitter(nn.Module):
         embedded = self.embedding(x)  # (batch_size, seq_len, embedding_dim)
         
         # BiLSTM
-        lstm_out, _ = self.lstm(embedded)  # (batch_size, seq_len, hidden_dim)
+        if lengths is not None:
+            packed = pack_padded_sequence(embedded, lengths.cpu(), batch_first=True, enforce_sorted=False)
+            packed_out, _ = self.lstm(packed)
+            lstm_out, _ = pad_packed_sequence(packed_out, batch_first=True, total_length=x.size(1))
+        else:
+            lstm_out, _ = self.lstm(embedded)  # (batch_size, seq_len, hidden_dim)
         
         # Apply dropout
         lstm_out = self.dropout(lstm_out)
@@ -151,37 +210,109 @@ class BiLSTMSandhiSplitter(nn.Module):
         Returns:
             List of split word parts
         """
+        # Encode word
+        encoded = self._encode_single_word(word, char_to_idx)
+        
+        # Get predictions, zeroing positions of unknown characters
+        probabilities = self.predict_proba_batch([encoded])[0]
+        probabilities = probabilities * (np.array(encoded) != char_to_idx.get('<UNK>', 0))
+        
+        # Apply threshold to get split positions
+        split_positions = [i for i, prob in enumerate(probabilities) if prob > threshold]
+        
+        # Split word based on positions
+        return self._decode_splits(word, split_positions)
+    
+    def predict_splits_batch(self, words: List[str], char_to_idx: Dict[str, int],
+                             threshold: float = 0.5) -> List[List[str]]:
+        """
+        Predict split positions for many words with a single forward pass.
+        
+        Args:
+            words: Input words to split
+            char_to_idx: Character to index mapping
+            threshold: Probability threshold for split decision
+        Returns:
+            List of split word parts for each input word, in input order
+        """
+        if not words:
+            return []
+        
+        # Encode words without padding; predict_proba_batch buckets them by length
+        encoded = [self._encode_single_word(word, char_to_idx) for word in words]
+        predictions = self.predict_proba_batch(encoded)
+        
+        # Gather into one (batch_size, max_len) matrix, zeroing unknown characters
+        unk_idx = char_to_idx.get('<UNK>', 0)
+        probabilities = np.zeros((len(words), max(len(seq) for seq in encoded)), dtype=np.float32)
+        for row, (seq, probs) in enumerate(zip(encoded, predictions)):
+            probabilities[row, :len(seq)] = probs * (np.array(seq) != unk_idx)
+        
+        return self._decode_splits_batch(words, probabilities > threshold)
+    
+    def predict_proba_batch(self, sequences: List[List[int]], pad_idx: int = 0,
+                            bucket_size: int = 512) -> List[np.ndarray]:
+        """
+        Run packed forward passes over pre-encoded sequences of varying length.
+        
+        Sequences are sorted by length and cut into buckets of at most bucket_size,
+        so each bucket is padded only to its own longest sequence. Padding is packed
+        away, so results match one-word-at-a-time runs.
+        
+        Args:
+            sequences: Character index sequences, one per word
+            pad_idx: Index used to pad sequences within a bucket
+            bucket_size: Maximum number of sequences per forward pass
+        Returns:
+            Per-position split probabilities for each sequence, trimmed to its length
+        """
+        results = [np.zeros(0, dtype=np.float32)] * len(sequences)
+        order = sorted((i for i, seq in enumerate(sequences) if seq), key=lambda i: len(sequences[i]))
+        
         self.eval()
         with torch.no_grad():
-            # Encode word
-            encoded = self._encode_single_word(word, char_to_idx)
-            input_tensor = torch.tensor([encoded], dtype=torch.long).to(self.device)
-            mask_tensor = torch.tensor([[c != char_to_idx.get('<UNK>', 0) for c in encoded]], 
-                                      dtype=torch.bool).to(self.device)
-            
-            # Get predictions
-            probabilities = self.forward(input_tensor, mask_tensor)
-            probabilities = probabilities.cpu().numpy()[0]
-            
-            # Apply threshold to get split positions
-            split_positions = [i for i, prob in enumerate(probabilities) if prob > threshold]
-            
-            # Split word based on positions
-            return self._decode_splits(word, split_positions)
+            for start in range(0, len(order), bucket_size):
+                bucket = order[start:start + bucket_size]
+                lengths = [len(sequences[i]) for i in bucket]
+                padded = np.full((len(bucket), lengths[-1]), pad_idx, dtype=np.int64)
+                for row, i in enumerate(bucket):
+                    padded[row, :lengths[row]] = sequences[i]
+                
+                input_tensor = torch.from_numpy(padded).to(self.device)
+                length_tensor = torch.tensor(lengths, dtype=torch.long)
+                probabilities = self.forward(input_tensor, lengths=length_tensor).cpu().numpy()
+                
+                for row, i in enumerate(bucket):
+                    results[i] = probabilities[row, :lengths[row]]
+        
+        return results
     
-    def _encode_single_word(self, word: str, char_to_idx: Dict[str, int], max_len: int = 50) -> List[int]:
-        """Encode a single word."""
-        encoded = []
-        unk_idx = char_to_idx.get('<UNK>', 0)
-        pad_idx = char_to_idx.get('<PAD>', 0)
+    def _decode_splits_batch(self, words: List[str], decisions: np.ndarray) -> List[List[str]]:
+        """Decode a (batch_size, seq_len) boolean split matrix into word parts."""
+        word_lengths = np.array([len(word) for word in words])
+        rows, positions = np.nonzero(decisions)
         
-        for char in word[:max_len]:
-            encoded.append(char_to_idx.get(char, unk_idx))
+        # Keep only positions strictly inside each word
+        valid = (positions > 0) & (positions < word_lengths[rows])
+        rows, positions = rows[valid], positions[valid]
         
-        while len(encoded) < max_len:
-            encoded.append(pad_idx)
-            
-        return encoded
+        # Group split positions by word; np.nonzero returns them sorted row-major
+        boundaries = np.searchsorted(rows, np.arange(1, len(words)))
+        per_word_positions = np.split(positions, boundaries)
+        
+        results = []
+        for word, word_positions in zip(words, per_word_positions):
+            if word_positions.size == 0:
+                results.append([word])
+                continue
+            cuts = [0] + word_positions.tolist() + [len(word)]
+            results.append([word[start:end] for start, end in zip(cuts[:-1], cuts[1:])])
+        return results
+    
+    def _encode_single_word(self, word: str, char_to_idx: Dict[str, int], max_len: int = 50) -> List[int]:
+        """Encode a single word, truncated to max_len but not padded."""
+        unk_idx = char_to_idx.get('<UNK>', 0)
+        return [char_to_idx.get(char, unk_idx) for char in word[:max_len]]
     
     def _decode_splits(self, word: str, split_positions: List[int]) -> List[str]:
         """Decode split positions into word parts."""
@@ -257,6 +388,48 @@ def load_model(filepath: str, device: str = 'cpu') -> Tuple[BiLSTMSandhiSplitter
     return model, char_to_idx
 
 
+def quantize_model(model: BiLSTMSandhiSplitter) -> BiLSTMSandhiSplitter:
+    """Dynamic int8 quantization of the LSTM and Linear layers (CPU inference only)."""
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model.cpu(), {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+
+
+def save_quantized_model(model: BiLSTMSandhiSplitter, char_to_idx: Dict[str, int], filepath: str):
+    """Save a quantize_model() result; the config rebuilds the float model it was made from."""
+    torch.save({
+        'model_state_dict': model.state_dict(),
+        'char_to_idx': char_to_idx,
+        'model_config': {
+            'vocab_size': model.vocab_size,
+            'embedding_dim': model.embedding_dim,
+            'hidden_dim': model.hidden_dim,
+            'num_layers': model.num_layers,
+            'device': 'cpu'
+        },
+        'quantization': 'dynamic_int8'
+    }, filepath)
+
+
+def load_quantized_model(filepath: str) -> Tuple[BiLSTMSandhiSplitter, Dict[str, int]]:
+    """Load a checkpoint written by save_quantized_model."""
+    checkpoint = torch.load(filepath, map_location='cpu', weights_only=False)
+    
+    # Quantize a freshly built float model so the state dict finds matching modules
+    config = checkpoint['model_config']
+    model = quantize_model(BiLSTMSandhiSplitter(
+        vocab_size=config['vocab_size'],
+        embedding_dim=config['embedding_dim'],
+        hidden_dim=config['hidden_dim'],
+        num_layers=config['num_layers'],
+        device='cpu'
+    ))
+    
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+    
+    return model, checkpoint['char_to_idx']
+
+
 if __name__ == "__main__":
     # Example usage
     device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
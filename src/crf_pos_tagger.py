@@ -6,28 +6,129 @@ import os
 import sys
 import pickle
 import re
-from typing import List, Dict, Any, Tuple
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
 
+import numpy as np
+
 # Add data directory to path
 current_dir = os.path.dirname(__file__)
 project_root = os.path.dirname(current_dir)
 sys.path.insert(0, os.path.join(project_root, 'data'))
 
+from lru_cache import LRUCache
+from model_registry import get_model
+import pipeline_metrics
+
+logger = logging.getLogger(__name__)
+
+# Character-pattern features, compiled once
+VOWEL_RE = re.compile('[अआइईउऊऋॠएऐओऔ]')
+CONSONANT_RE = re.compile('[कखगघचछजझटठडढतथदधनपफबभम]')
+FINAL_VOWEL_RE = re.compile('[अआइईउऊऋॠएऐओऔ]$')
+
+
+class CompiledCRFModel:
+    """
+    Dense, index-based form of a CRFPOSTagger's dict model, built at load time.
+    
+    Tags are interned to column ids, every feature key ("name=value") maps to a
+    row of one contiguous weight matrix, and emission scores are precomputed per
+    known word, so scoring a word is a handful of array gathers.
+    """
+    
+    def __init__(self, tagger: 'CRFPOSTagger', tags: List[str], dtype=np.float32):
+        """
+        Args:
+            tagger: Tagger whose dict model should be compiled
+            tags: Tags to score, in decoder order (one column each)
+            dtype: Storage type of the weight matrices
+        """
+        self.tags = list(tags)
+        self.tag_index = {tag: t for t, tag in enumerate(self.tags)}
+        num_tags = len(self.tags)
+        
+        # Feature weights: one key -> row index, one (num_features x T) matrix
+        self.feature_index = {key: row for row, key in enumerate(tagger.feature_weights)}
+        self.feature_matrix = np.zeros((len(self.feature_index), num_tags), dtype=dtype)
+        for key, row in self.feature_index.items():
+            self._fill_row(self.feature_matrix[row], tagger.feature_weights[key])
+        
+        # Emissions: missing tags score -1 for known words and -2 for unknown ones
+        # (-5 for UNK), exactly as CRFPOSTagger._calculate_score does
+        words = list(dict.fromkeys(list(tagger.emission_probs) + list(tagger.known_words)))
+        self.word_index = {word: row for row, word in enumerate(words)}
+        self.emission_matrix = np.empty((len(words), num_tags), dtype=dtype)
+        for word, row in self.word_index.items():
+            self.emission_matrix[row] = self._missing_emission(word in tagger.known_words)
+            self._fill_row(self.emission_matrix[row], tagger.emission_probs.get(word, {}))
+        self.unknown_emission = self._missing_emission(False).astype(dtype)
+        
+        # Transitions: <START> row plus a (T x T) matrix
+        self.start = np.zeros(num_tags, dtype=dtype)
+        self._fill_row(self.start, tagger.transition_probs.get('<START>', {}))
+        self.transitions = np.zeros((num_tags, num_tags), dtype=dtype)
+        for prev_tag, t in self.tag_index.items():
+            self._fill_row(self.transitions[t], tagger.transition_probs.get(prev_tag, {}))
+    
+    def _fill_row(self, row: np.ndarray, weights: Dict[str, float]):
+        """Copy a {tag: weight} dict into a dense row, ignoring tags not decoded."""
+        for tag, weight in weights.items():
+            t = self.tag_index.get(tag)
+            if t is not None:
+                row[t] = weight
+    
+    def _missing_emission(self, is_known: bool) -> np.ndarray:
+        """Emission score used for tags a word was never seen with."""
+        if is_known:
+            return np.full(len(self.tags), -1.0)
+        return np.array([-5.0 if tag == 'UNK' else -2.0 for tag in self.tags])
+    
+    def feature_scores(self, feature_keys: List[str]) -> np.ndarray:
+        """Summed weights of the given feature keys for every tag."""
+        rows = [self.feature_index[key] for key in feature_keys if key in self.feature_index]
+        return self.feature_matrix[rows].sum(axis=0, dtype=np.float64)
+    
+    def emission_scores(self, word: str) -> np.ndarray:
+        """Emission score of word for every tag."""
+        row = self.word_index.get(word)
+        if row is None:
+            return self.unknown_emission.astype(np.float64)
+        return self.emission_matrix[row].astype(np.float64)
+    
+    def memory_bytes(self) -> Dict[str, int]:
+        """Approximate memory used by the arrays and the index dicts."""
+        arrays = (self.feature_matrix.nbytes + self.emission_matrix.nbytes +
+                  self.transitions.nbytes + self.start.nbytes + self.unknown_emission.nbytes)
+        indexes = sum(sys.getsizeof(index) + sum(sys.getsizeof(key) for key in index)
+                      for index in (self.feature_index, self.word_index, self.tag_index))
+        return {'arrays': arrays, 'indexes': indexes, 'total': arrays + indexes}
+
 
 class CRFPOSTagger:
     """
     CRF POS Tagger that can be loaded and used by the integrated processor
     """
     
-    def __init__(self, model_path: str = None):
-        """Initialize the CRF POS tagger."""
+    def __init__(self, model_path: str = None, cache_size: int = 4096):
+        """
+        Initialize the CRF POS tagger.
+        
+        Args:
+            model_path: Path to a pickled CRF model
+            cache_size: Size of the per-word score vector LRU cache (0 disables it)
+        """
         self.emission_probs = defaultdict(dict)
         self.transition_probs = defaultdict(dict)
         self.feature_weights = defaultdict(dict)
         self.known_words = set()
         self.known_tags = set()
         self.is_trained = False
+        self.compiled = None
+        self.model_path = None
+        self.word_score_cache = LRUCache(cache_size)
         
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
@@ -46,15 +147,43 @@ class CRFPOSTagger:
             # Remove UNK tag from known tags to prevent its use
             self.known_tags.discard('UNK')
             self.is_trained = model_data.get('is_trained', False)
+            self.compile()
+            self.model_path = model_path
             
-            print(f"✅ CRF model loaded from {model_path}")
+            logger.info("CRF model loaded from %s", model_path)
             return True
         except Exception as e:
-            print(f"❌ Error loading CRF model: {e}")
+            logger.error("Error loading CRF model: %s", e)
             return False
     
+    def compile(self, dtype=np.float32) -> CompiledCRFModel:
+        """Build the dense, index-based scoring tables from the dict model."""
+        self.compiled = CompiledCRFModel(self, self._viterbi_tags(), dtype=dtype)
+        self.word_score_cache.clear()
+        return self.compiled
+    
+    def _compiled_model(self) -> CompiledCRFModel:
+        """Return the compiled model, compiling it on first use."""
+        if self.compiled is None or self.compiled.tags != self._viterbi_tags():
+            self.compile()
+        return self.compiled
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return usage counters of the per-word score cache."""
+        return self.word_score_cache.stats()
+    
     def _extract_features(self, word: str, prev_tag: str = '<START>', prev_prev_tag: str = '<START>') -> Dict[str, Any]:
         """Extract features for CRF."""
+        features = self._extract_word_features(word)
+        
+        # Context features
+        features['prev_tag'] = prev_tag
+        features['prev_prev_tag'] = prev_prev_tag
+        
+        return features
+    
+    def _extract_word_features(self, word: str) -> Dict[str, Any]:
+        """Extract the features that depend only on the word itself."""
         features = {}
         
         # Word features
@@ -71,16 +200,12 @@ class CRFPOSTagger:
             features[f'prefix_{i}'] = word[:i]
         
         # Character patterns
-        features['has_vowel'] = bool(re.search('[अआइईउऊऋॠएऐओऔ]', word))
-        features['has_consonant'] = bool(re.search('[कखगघचछजझटठडढतथदधनपफबभम]', word))
-        features['ends_with_vowel'] = bool(re.search('[अआइईउऊऋॠएऐओऔ]$', word))
+        features['has_vowel'] = bool(VOWEL_RE.search(word))
+        features['has_consonant'] = bool(CONSONANT_RE.search(word))
+        features['ends_with_vowel'] = bool(FINAL_VOWEL_RE.search(word))
         features['ends_with_visarga'] = word.endswith('ः')
         features['ends_with_anusvara'] = word.endswith('ं')
         
-        # Context features
-        features['prev_tag'] = prev_tag
-        features['prev_prev_tag'] = prev_prev_tag
-        
         # Length features
         features['word_length'] = len(word)
         features['is_long_word'] = len(word) > 6
@@ -125,71 +250,175 @@ class CRFPOSTagger:
         
         return score
     
-    def tag_sentence(self, sentence: List[str]) -> List[Tuple[str, str]]:
-        """Tag a sentence using Viterbi algorithm."""
-        if not self.is_trained:
-            raise ValueError("Model not trained yet!")
-        
-        # Viterbi algorithm
-        n = len(sentence)
+    def _viterbi_tags(self) -> List[str]:
+        """Tags considered by the decoder, in a fixed (sorted) order."""
         # Filter out UNK tag from the list of possible tags
         tags = [tag for tag in sorted(self.known_tags) if tag != 'UNK']
         
         # If no tags available (unlikely), use basic POS tags
         if not tags:
             tags = ['NOUN', 'VERB', 'ADJ', 'ADV', 'PRON', 'PART', 'CONJ', 'PREP']
-        
-        # Initialize
-        viterbi = [{} for _ in range(n)]
-        backpointer = [{} for _ in range(n)]
-        
-        # First word
-        for tag in tags:
-            score = self._calculate_score(sentence[0], tag, '<START>', '<START>')
-            viterbi[0][tag] = score
-            backpointer[0][tag] = '<START>'
-        
-        # Middle words
+        return tags
+    
+    def _context_feature_scores(self, feature_name: str, feature_value: str) -> np.ndarray:
+        """Feature weights of a single context feature (e.g. prev_tag=NOUN) for every tag."""
+        return self._compiled_model().feature_scores([f"{feature_name}={feature_value}"])
+    
+    def _word_scores(self, word: str) -> np.ndarray:
+        """
+        Emission score plus all word-level feature weights for every tag.
+        
+        This is everything in _calculate_score that does not depend on the
+        previous tags. Vectors are memoized per word across sentences and
+        requests; the cache is cleared whenever the model is recompiled.
+        """
+        compiled = self._compiled_model()
+        scores = self.word_score_cache.get(word)
+        pipeline_metrics.increment('crf_cache_misses' if scores is None else 'crf_cache_hits')
+        if scores is None:
+            features = self._extract_word_features(word)
+            feature_keys = [f"{feature_name}={feature_value}" for feature_name, feature_value in features.items()]
+            scores = compiled.emission_scores(word) + compiled.feature_scores(feature_keys)
+            scores.flags.writeable = False
+            self.word_score_cache.put(word, scores)
+        return scores
+    
+    def _transition_scores(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Transition scores as arrays.
+        
+        Returns:
+            (start, matrix): start[t] scores <START> -> t; matrix[p, t] scores p -> t.
+            Both include the transition probability and the prev_tag feature weight.
+        """
+        compiled = self._compiled_model()
+        start = compiled.start + self._context_feature_scores('prev_tag', '<START>')
+        matrix = compiled.transitions + np.vstack([self._context_feature_scores('prev_tag', prev_tag)
+                                                   for prev_tag in compiled.tags])
+        return start, matrix
+    
+    def _viterbi_batch(self, emissions: np.ndarray, start: np.ndarray, transitions: np.ndarray) -> np.ndarray:
+        """
+        Decode B sentences of equal length n at once.
+        
+        Args:
+            emissions: (B, n, T) emission scores
+            start: (T,) <START> transition scores
+            transitions: (T, T) transition scores
+        
+        Returns:
+            (B, n) array of best tag ids
+        """
+        batch_size, n, num_tags = emissions.shape
+        
+        # Forward pass: candidates[b, p, t] scores reaching tag t from tag p
+        viterbi = emissions[:, 0] + start
+        backpointer = np.zeros((batch_size, n, num_tags), dtype=np.int64)
         for i in range(1, n):
-            for tag in tags:
-                best_score = float('-inf')
-                best_prev_tag = None
-                
-                for prev_tag in tags:
-                    # Get the previous previous tag (simplified)
-                    prev_prev_tag = '<START>' if i == 1 else tags[0]
-                    score = viterbi[i-1][prev_tag] + self._calculate_score(sentence[i], tag, prev_tag, prev_prev_tag)
-                    if score > best_score:
-                        best_score = score
-                        best_prev_tag = prev_tag
-                
-                viterbi[i][tag] = best_score
-                backpointer[i][tag] = best_prev_tag
-        
-        # Find best final tag
-        if not viterbi[-1]:
-            # Fallback to NOUN for both known and unknown words (no UNK)
-            best_final_tag = 'NOUN'
-        else:
-            # Filter out UNK tag from consideration
-            available_tags = [tag for tag in viterbi[-1].keys() if tag != 'UNK']
-            if available_tags:
-                best_final_tag = max(available_tags, key=lambda tag: viterbi[-1][tag])
-            else:
-                best_final_tag = 'NOUN'  # Ultimate fallback
+            candidates = viterbi[:, :, None] + transitions[None, :, :] + emissions[:, i, None, :]
+            backpointer[:, i] = candidates.argmax(axis=1)
+            viterbi = np.take_along_axis(candidates, backpointer[:, i, None, :], axis=1)[:, 0]
+        
+        # Backtrack from the best final tag
+        paths = np.zeros((batch_size, n), dtype=np.int64)
+        paths[:, -1] = viterbi.argmax(axis=1)
+        rows = np.arange(batch_size)
+        for i in range(n - 1, 0, -1):
+            paths[:, i - 1] = backpointer[rows, i, paths[:, i]]
+        return paths
+    
+    def tag_sentence(self, sentence: List[str]) -> List[Tuple[str, str]]:
+        """
+        Tag a sentence using Viterbi algorithm.
         
-        # Backtrack
-        best_path = [best_final_tag]
-        for i in range(n-1, 0, -1):
-            if best_path[-1] in backpointer[i]:
-                best_path.append(backpointer[i][best_path[-1]])
-            else:
-                # Fallback to NOUN for all words (no UNK)
-                best_path.append('NOUN')
+        Emission scores are computed once per (word, tag) as an n x T array and
+        transitions as a T x T matrix, so each step is a vectorized max/argmax.
+        """
+        return self.tag_sentences([sentence])[0]
+    
+    def tag_sentences(self, sentences: List[List[str]], processes: int = 1,
+                      chunk_size: int = 512,
+                      executor: Optional[ProcessPoolExecutor] = None) -> List[List[Tuple[str, str]]]:
+        """
+        Tag many sentences at once.
+        
+        Words are deduplicated across the batch so emissions are computed once
+        per unique word, and sentences of equal length are decoded together.
+        
+        Args:
+            sentences: List of token lists
+            processes: Worker processes for large batches (1 = in-process)
+            chunk_size: Sentences per worker task when processes > 1
+            executor: Pool from process_pool() to reuse across calls; takes
+                the place of processes, so the workers load the model once
+        
+        Returns:
+            One list of (word, tag) pairs per input sentence, in input order
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained yet!")
         
-        best_path.reverse()
+        sentences = [list(sentence) for sentence in sentences]
+        if len(sentences) > chunk_size:
+            if executor is not None:
+                return self._tag_sentences_parallel(sentences, executor, chunk_size)
+            if processes > 1 and self.model_path:
+                with self.process_pool(processes) as executor:
+                    return self._tag_sentences_parallel(sentences, executor, chunk_size)
+        
+        compiled = self._compiled_model()
+        tags = compiled.tags
+        start, transitions = self._transition_scores()
+        
+        # One score row per unique word in the batch
+        vocabulary = {}
+        for sentence in sentences:
+            for word in sentence:
+                vocabulary.setdefault(word, len(vocabulary))
+        if not vocabulary:
+            return [[] for _ in sentences]
+        word_scores = np.vstack([self._word_scores(word) for word in vocabulary])
+        
+        # The prev_prev_tag feature, which the decoder simplifies to <START> for
+        # the first two words and tags[0] after
+        prev_prev_start = self._context_feature_scores('prev_prev_tag', '<START>')
+        prev_prev_first = self._context_feature_scores('prev_prev_tag', tags[0])
+        
+        by_length = defaultdict(list)
+        for index, sentence in enumerate(sentences):
+            by_length[len(sentence)].append(index)
+        
+        tagged = [[] for _ in sentences]
+        for n, indices in by_length.items():
+            if n == 0:
+                continue
+            rows = np.array([[vocabulary[word] for word in sentences[index]] for index in indices])
+            emissions = word_scores[rows]
+            emissions[:, :2] += prev_prev_start
+            emissions[:, 2:] += prev_prev_first
+            
+            paths = self._viterbi_batch(emissions, start, transitions)
+            pipeline_metrics.increment('viterbi_cells', len(indices) * n * len(tags))
+            for index, path in zip(indices, paths):
+                tagged[index] = [(word, tags[t]) for word, t in zip(sentences[index], path)]
         
-        return list(zip(sentence, best_path))
+        return tagged
+    
+    def process_pool(self, processes: int) -> ProcessPoolExecutor:
+        """
+        A process pool for tag_sentences(executor=...); each worker loads this
+        model from model_path once, in the pool initializer.
+        """
+        if not self.model_path:
+            raise ValueError("A process pool needs a model loaded from model_path")
+        return ProcessPoolExecutor(max_workers=processes, initializer=_init_pool_tagger,
+                                   initargs=(self.model_path, self.word_score_cache.maxsize))
+    
+    def _tag_sentences_parallel(self, sentences: List[List[str]], executor: ProcessPoolExecutor,
+                                chunk_size: int) -> List[List[Tuple[str, str]]]:
+        """Spread tag_sentences over the workers of executor, chunk_size sentences per task."""
+        chunks = [sentences[i:i + chunk_size] for i in range(0, len(sentences), chunk_size)]
+        return [tagged for chunk in executor.map(_pool_tag_chunk, chunks) for tagged in chunk]
     
     def tag_text(self, text: str) -> List[Tuple[str, str]]:
         """Tag text using the CRF model."""
@@ -202,7 +431,7 @@ class CRFPOSTagger:
         try:
             return self.tag_sentence(words)
         except Exception as e:
-            print(f"CRF tagging error: {e}")
+            logger.warning("CRF tagging error: %s", e)
             # Fallback to basic tagging
             return self._basic_fallback(words)
     
@@ -312,3 +541,19 @@ class CRFPOSTagger:
         
         # Default to NOUN for unknown words (changed from UNK to NOUN as per Sanskrit linguistic patterns)
         return 'NOUN'
+
+
+# Per-process tagger used by CRFPOSTagger._tag_sentences_parallel
+_POOL_TAGGER = None
+
+
+def _init_pool_tagger(model_path: str, cache_size: int):
+    """Process pool initializer: load the model once per worker (forked workers inherit the parent's)."""
+    global _POOL_TAGGER
+    _POOL_TAGGER = get_model('crf_tagger', lambda: CRFPOSTagger(model_path, cache_size=cache_size),
+                             path=model_path, cache_size=cache_size)
+
+
+def _pool_tag_chunk(sentences: List[List[str]]) -> List[List[Tuple[str, str]]]:
+    """Tag one chunk of sentences in a worker process."""
+    return _POOL_TAGGER.tag_sentences(sentences)
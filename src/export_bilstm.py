@@ -0,0 +1,140 @@
+"""
+Export the BiLSTM sandhi model for serving.
+
+Writes models/bilstm_sandhi.pt as TorchScript (bilstm_sandhi.ts.pt), ONNX
+(bilstm_sandhi.onnx) and NumPy weights (bilstm_sandhi.npz), each carrying the
+character vocabulary, then reloads every artifact through its runtime and
+checks that its split probabilities match the eager model on the gold words
+of data/sandhi_cleaned.txt.
+
+Usage:
+    python src/export_bilstm.py [--formats torchscript onnx numpy] [--tolerance 1e-5]
+"""
+
+import os
+import sys
+import json
+import argparse
+import unicodedata
+from typing import Dict, List
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+# Add data directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+from bilstm_sandhi import BiLSTMSandhiSplitter, load_model
+from bilstm_runtime import DEFAULT_MODEL_DIR, RUNTIME_ARTIFACTS, RUNTIME_CLASSES, VOCAB_KEY, EagerBiLSTM
+
+
+class ExportableBiLSTM(nn.Module):
+    """Inference-only forward of BiLSTMSandhiSplitter: no dropout, masking or packing."""
+    
+    def __init__(self, model: BiLSTMSandhiSplitter):
+        super().__init__()
+        self.embedding = model.embedding
+        self.lstm = model.lstm
+        self.classifier = model.classifier
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        lstm_out, _ = self.lstm(self.embedding(x))
+        return torch.sigmoid(self.classifier(lstm_out).squeeze(-1))
+
+
+def export_torchscript(module: ExportableBiLSTM, char_to_idx: Dict[str, int], path: str):
+    """Script the module and save it with the vocabulary as an extra file."""
+    scripted = torch.jit.script(module)
+    torch.jit.save(scripted, path, _extra_files={f'{VOCAB_KEY}.json': json.dumps(char_to_idx, ensure_ascii=False)})
+
+
+def export_onnx(module: ExportableBiLSTM, char_to_idx: Dict[str, int], path: str, opset_version: int = 17):
+    """Export with dynamic batch and sequence axes and store the vocabulary as model metadata."""
+    import onnx
+    
+    example = torch.ones((2, 8), dtype=torch.long)
+    torch.onnx.export(
+        module, (example,), path,
+        input_names=['input'], output_names=['probabilities'],
+        dynamic_axes={'input': {0: 'batch', 1: 'sequence'}, 'probabilities': {0: 'batch', 1: 'sequence'}},
+        opset_version=opset_version,
+        dynamo=False
+    )
+    model = onnx.load(path)
+    entry = model.metadata_props.add()
+    entry.key = VOCAB_KEY
+    entry.value = json.dumps(char_to_idx, ensure_ascii=False)
+    onnx.save(model, path)
+
+
+def export_numpy(module: ExportableBiLSTM, char_to_idx: Dict[str, int], path: str):
+    """Save the state dict as float32 arrays plus the vocabulary, for the NumPy runtime."""
+    arrays = {key: tensor.detach().cpu().numpy() for key, tensor in module.state_dict().items()}
+    arrays[VOCAB_KEY] = np.array(json.dumps(char_to_idx, ensure_ascii=False))
+    np.savez(path, **arrays)
+
+
+def sample_sequences(char_to_idx: Dict[str, int], data_path: str, limit: int) -> List[List[int]]:
+    """Encode gold words as HybridSandhiSplitter does (START/END markers map to index 0)."""
+    from sandhi_cleaned_loader import load_sandhi_cleaned_data
+    
+    words = []
+    for combined, _ in load_sandhi_cleaned_data(data_path):
+        words.extend(unicodedata.normalize('NFC', word) for word in combined.split())
+    words = list(dict.fromkeys(words))[:limit]
+    return [[0] + [char_to_idx.get(c, 0) for c in word] + [0] for word in words]
+
+
+def max_difference(reference: List[np.ndarray], outputs: List[np.ndarray]) -> float:
+    """Largest absolute difference between two lists of probability vectors."""
+    return max(float(np.max(np.abs(np.asarray(a) - np.asarray(b)))) for a, b in zip(reference, outputs) if len(a))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the BiLSTM sandhi model to TorchScript and ONNX')
+    parser.add_argument('--checkpoint', type=str, default=os.path.join(DEFAULT_MODEL_DIR, RUNTIME_ARTIFACTS['eager']))
+    parser.add_argument('--output_dir', type=str, default=DEFAULT_MODEL_DIR)
+    parser.add_argument('--formats', nargs='+', choices=['torchscript', 'onnx', 'numpy'],
+                        default=['torchscript', 'onnx', 'numpy'])
+    parser.add_argument('--data_path', type=str, default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--num_words', type=int, default=2000, help='Words used for the numeric check')
+    parser.add_argument('--tolerance', type=float, default=1e-5, help='Maximum absolute probability difference')
+    
+    args = parser.parse_args()
+    
+    model, char_to_idx = load_model(args.checkpoint, device='cpu')
+    model.eval()
+    module = ExportableBiLSTM(model).eval()
+    
+    exporters = {'torchscript': export_torchscript, 'onnx': export_onnx, 'numpy': export_numpy}
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name in args.formats:
+        path = os.path.join(args.output_dir, RUNTIME_ARTIFACTS[name])
+        exporters[name](module, char_to_idx, path)
+        print(f"Exported {name}: {path} ({os.path.getsize(path) / 1024:.1f} KiB)")
+    
+    # Numeric check of every artifact against the eager checkpoint
+    sequences = sample_sequences(char_to_idx, args.data_path, args.num_words)
+    reference = EagerBiLSTM(args.checkpoint, device='cpu').predict_proba_batch(sequences)
+    failed = []
+    for name in args.formats:
+        runtime = RUNTIME_CLASSES[name](os.path.join(args.output_dir, RUNTIME_ARTIFACTS[name]))
+        if runtime.char_to_idx != char_to_idx:
+            failed.append(name)
+            print(f"❌ {name}: vocabulary does not match the checkpoint")
+            continue
+        difference = max_difference(reference, runtime.predict_proba_batch(sequences))
+        status = '✅' if difference <= args.tolerance else '❌'
+        print(f"{status} {name}: max |Δp| = {difference:.2e} over {len(sequences)} words (tolerance {args.tolerance:.0e})")
+        if difference > args.tolerance:
+            failed.append(name)
+    
+    if failed:
+        sys.exit(f"Numeric check failed for: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
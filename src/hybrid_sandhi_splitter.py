@@ -6,119 +6,190 @@ Uses higher threshold for better accuracy and rule-based validation
 
 import sys
 import re
-from typing import List, Optional, Tuple
+import logging
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
 from collections import defaultdict
 
 # Import existing components
 try:
     from tokenizer import SanskritTokenizer
+    from lru_cache import LRUCache
+    from model_registry import get_model, model_generation
+    from lexicon import DEFAULT_LEXICON_PATH, load_lexicon
+    from bilstm_runtime import DEFAULT_MODEL_DIR, load_bilstm_runtime
+    from lattice_segmenter import LatticeSegmenter, Segmentation, snap_cuts
+    import pipeline_metrics
 except ImportError as e:
     print(f"Error importing tokenizer: {e}")
     sys.exit(1)
 
+logger = logging.getLogger(__name__)
+
+
+class _RuleMatch:
+    """View of one rule's groups inside the combined split-rule match."""
+    
+    __slots__ = ('match', 'offset')
+    
+    def __init__(self, match, offset: int):
+        self.match = match
+        self.offset = offset
+    
+    def group(self, index: int = 0) -> str:
+        return self.match.group(self.offset + index)
+
+
+# Probability of a cut proposed by the rule table alone, and the evidence a rule
+# adds (noisy-OR) to a position the BiLSTM has already scored
+RULE_CUT_PROB = 0.8
+RULE_CUT_EVIDENCE = 0.5
+
+# BiLSTM positions below this probability are not offered to the lattice
+MIN_BILSTM_CUT_PROB = 0.05
+
 
 class HybridSandhiSplitter:
     """Hybrid sandhi splitter combining BiLSTM and rule-based approaches."""
     
-    def __init__(self, use_bilstm: bool = True, bilstm_threshold: float = 0.7):
+    def __init__(self, use_bilstm: bool = True, bilstm_threshold: float = 0.7, cache_size: int = 4096,
+                 lexicon_path: Optional[str] = DEFAULT_LEXICON_PATH, bilstm_runtime: str = 'auto',
+                 use_quantized_bilstm: bool = False):
         """
         Initialize hybrid sandhi splitter.
         
         Args:
             use_bilstm: Whether to use BiLSTM model
             bilstm_threshold: Higher threshold for better accuracy (0.7 recommended)
+            cache_size: Maximum number of per-word analyses kept in the LRU cache (0 disables it)
+            lexicon_path: Prebuilt SandhiLexicon (.npz) for gold splits and lattice bonuses; None disables it
+            bilstm_runtime: 'auto' (fastest available), 'onnx', 'numpy', 'torchscript', 'eager' or 'int8'
+            use_quantized_bilstm: Load the dynamic int8 checkpoint (same as bilstm_runtime='int8')
         """
         self.use_bilstm = use_bilstm
         self.bilstm_threshold = bilstm_threshold
-        self.tokenizer = SanskritTokenizer()
+        self.bilstm_runtime = 'int8' if use_quantized_bilstm else bilstm_runtime
+        self.tokenizer = get_model('tokenizer', SanskritTokenizer)
+        
+        # Per-word analysis cache; keys include the model version so reloads invalidate it
+        self.analysis_cache = LRUCache(cache_size)
         
-        # Load BiLSTM model if available
-        self.bilstm_model = None
-        if self.use_bilstm:
-            self._load_bilstm_model()
+        # Known unsplittable words and gold splits, answered before any model runs
+        self.lexicon = get_model('lexicon', lambda: load_lexicon(lexicon_path), path=lexicon_path) if lexicon_path else None
+        
+        # k-best search over BiLSTM, rule and lexicon cut candidates
+        self.lattice = LatticeSegmenter(self.lexicon)
+        
+        # BiLSTM runtime, loaded on first use (or by warmup()) so that building
+        # the splitter never pays for torch or onnxruntime imports
+        self._bilstm_model = None
+        self._bilstm_version = 0
+        self._bilstm_loaded = not self.use_bilstm
+        self._bilstm_lock = threading.Lock()
         
         # Initialize rule-based components
         self._initialize_rule_components()
         
-        print(f"Hybrid Sandhi Splitter initialized:")
-        print(f"  BiLSTM enabled: {self.use_bilstm}")
-        print(f"  BiLSTM threshold: {self.bilstm_threshold}")
-        print(f"  Rule-based validation: Enabled")
+        logger.info("Hybrid Sandhi Splitter initialized: BiLSTM enabled: %s, BiLSTM threshold: %s, "
+                    "lexicon: %d known words, rule-based validation: enabled",
+                    self.use_bilstm, self.bilstm_threshold, len(self.lexicon) if self.lexicon else 0)
     
-    def _load_bilstm_model(self):
-        """Load BiLSTM model."""
-        try:
-            import torch
-            import os
-            
-            model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'bilstm_sandhi.pt')
-            
-            if os.path.exists(model_path):
-                device = 'cuda' if torch.cuda.is_available() else 'cpu'
-                model_data = torch.load(model_path, map_location=device)
-                
-                # Load model architecture
-                model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'bilstm_sandhi.py')
-                sys.path.insert(0, os.path.dirname(model_path))
-                from bilstm_sandhi import BiLSTMSandhiSplitter
-                model_config = model_data['model_config']
-                self.bilstm_model = BiLSTMSandhiSplitter(
-                    vocab_size=model_config['vocab_size'],
-                    embedding_dim=model_config['embedding_dim'],
-                    hidden_dim=model_config['hidden_dim'],
-                    num_layers=model_config['num_layers']
-                )
-                self.bilstm_model.load_state_dict(model_data['model_state_dict'])
-                self.bilstm_model.eval()
-                self.char_to_idx = model_data['char_to_idx']
-                self.idx_to_char = {v: k for k, v in self.char_to_idx.items()}
-                
-                print(f"BiLSTM model loaded successfully")
-            else:
-                print("BiLSTM model file not found, using rule-based only")
-                self.use_bilstm = False
-                
-        except Exception as e:
-            print(f"Error loading BiLSTM model: {e}")
-            self.use_bilstm = False
+    @property
+    def bilstm_model(self):
+        """
+        BiLSTM runtime, loaded on first access; None if disabled or unavailable.
+        Follows reloads of the shared instance made through any splitter.
+        """
+        if not self._bilstm_loaded or (self.use_bilstm and self._bilstm_version != self.model_version):
+            with self._bilstm_lock:
+                if not self._bilstm_loaded or (self.use_bilstm and self._bilstm_version != self.model_version):
+                    self._load_bilstm_model()
+        return self._bilstm_model
+    
+    @property
+    def model_version(self) -> int:
+        """Generation of the shared BiLSTM registry entry; every reload changes it."""
+        return model_generation('bilstm', path=DEFAULT_MODEL_DIR, runtime=self.bilstm_runtime)
+    
+    def warmup(self):
+        """Load the BiLSTM and run one word through it and the lattice, ahead of the first request."""
+        self.segment('रामो')
+    
+    def _load_bilstm_model(self, reload: bool = False):
+        """Load the BiLSTM through the fastest runtime available (see bilstm_runtime), shared process-wide."""
+        self._bilstm_model = get_model('bilstm', lambda: load_bilstm_runtime(runtime=self.bilstm_runtime),
+                                       path=DEFAULT_MODEL_DIR, reload=reload, runtime=self.bilstm_runtime)
+        self._bilstm_version = self.model_version
+        if self._bilstm_model is not None:
+            self.char_to_idx = self._bilstm_model.char_to_idx
+            self.idx_to_char = {v: k for k, v in self.char_to_idx.items()}
+            logger.info("BiLSTM model loaded successfully (%s runtime)", self._bilstm_model.name)
+        else:
+            logger.warning("BiLSTM model file not found, using rule-based only")
+        self._bilstm_loaded = True
+    
+    def reload_bilstm_model(self):
+        """
+        Reload the shared BiLSTM checkpoint from disk. Every splitter using it
+        picks up the new model and stops serving analyses cached under the old
+        one, whose entries here are dropped at once.
+        """
+        with self._bilstm_lock:
+            self._load_bilstm_model(reload=True)
+        self.analysis_cache.clear()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters of the per-word analysis cache."""
+        stats = self.analysis_cache.stats()
+        stats['model_version'] = self.model_version
+        stats['lexicon_words'] = len(self.lexicon) if self.lexicon else 0
+        return stats
+    
+    def _cache_key(self, word: str, model_version: int) -> Tuple:
+        """Cache key: normalized word plus everything that changes its analysis."""
+        return (word, self.bilstm_threshold, model_version, self.use_bilstm)
     
     def _initialize_rule_components(self):
         """Initialize rule-based sandhi components."""
-        # Common sandhi patterns for splitting
+        # Common sandhi patterns for splitting: (rule name, regex, handler), in priority order
         self.split_patterns = [
             # Avagraha patterns
-            (r'(.*?)ऽ(.*)', lambda m: [m.group(1), 'ऽ' + m.group(2)]),
+            ('avagraha', r'(.*?)ऽ(.*)', lambda m: [m.group(1), 'ऽ' + m.group(2)]),
             
             # Visarga sandhi reversals - FIXED: preserve visarga when appropriate
-            (r'(.*?)ः([कखगघ])', lambda m: [m.group(1) + 'ः', m.group(2)]),
-            (r'(.*?)ः([चछजझ])', lambda m: [m.group(1) + 'ः', m.group(2)]),
-            (r'(.*?)ः([टठडढ])', lambda m: [m.group(1) + 'ः', m.group(2)]),
-            (r'(.*?)ः([तथदधन])', lambda m: [m.group(1) + 'ः', m.group(2)]),
+            ('visarga_velar', r'(.*?)ः([कखगघ])', lambda m: [m.group(1) + 'ः', m.group(2)]),
+            ('visarga_palatal', r'(.*?)ः([चछजझ])', lambda m: [m.group(1) + 'ः', m.group(2)]),
+            ('visarga_retroflex', r'(.*?)ः([टठडढ])', lambda m: [m.group(1) + 'ः', m.group(2)]),
+            ('visarga_dental', r'(.*?)ः([तथदधन])', lambda m: [m.group(1) + 'ः', m.group(2)]),
             # Only convert visarga to 'र्' before specific consonants (not at word end)
-            (r'^(.*?)ः([पफबभम])$', lambda m: [m.group(1) + 'ः', m.group(2)]),  # End of word - keep visarga
-            (r'^(.*?)ः$', lambda m: [m.group(1) + 'ः']),  # Single word ending in visarga
+            ('visarga_labial_final', r'^(.*?)ः([पफबभम])$', lambda m: [m.group(1) + 'ः', m.group(2)]),  # End of word - keep visarga
+            ('visarga_final', r'^(.*?)ः$', lambda m: [m.group(1) + 'ः']),  # Single word ending in visarga
             
             # Common vowel sandhi patterns
-            (r'(.*?)([अआ])य([अआइईउऊऋॠएऐओऔ])', lambda m: [m.group(1) + m.group(2), 'य', m.group(3)]),
-            (r'(.*?)([इई])व([अआइईउऊऋॠएऐओऔ])', lambda m: [m.group(1) + m.group(2), 'व', m.group(3)]),
-            (r'(.*?)([उऊ])र([अआइईउऊऋॠएऐओऔ])', lambda m: [m.group(1) + m.group(2), 'र', m.group(3)]),
+            ('vowel_ya', r'(.*?)([अआ])य([अआइईउऊऋॠएऐओऔ])', lambda m: [m.group(1) + m.group(2), 'य', m.group(3)]),
+            ('vowel_va', r'(.*?)([इई])व([अआइईउऊऋॠएऐओऔ])', lambda m: [m.group(1) + m.group(2), 'व', m.group(3)]),
+            ('vowel_ra', r'(.*?)([उऊ])र([अआइईउऊऋॠएऐओऔ])', lambda m: [m.group(1) + m.group(2), 'र', m.group(3)]),
             
             # Consonant sandhi patterns - more conservative
-            (r'(.*?)न्([चछजझ])', lambda m: [m.group(1) + 'न्', m.group(2)]),
-            (r'(.*?)म्([खफछठथ])', lambda m: [m.group(1) + 'म्', m.group(2)]),
-            (r'(.*?)त्([जझडढदधबभ])', lambda m: [m.group(1) + 'त्', m.group(2)]),
+            ('consonant_n_palatal', r'(.*?)न्([चछजझ])', lambda m: [m.group(1) + 'न्', m.group(2)]),
+            ('consonant_m', r'(.*?)म्([खफछठथ])', lambda m: [m.group(1) + 'म्', m.group(2)]),
+            ('consonant_t_voiced', r'(.*?)त्([जझडढदधबभ])', lambda m: [m.group(1) + 'त्', m.group(2)]),
             
             # Common compound patterns - be more careful with these
-            (r'(.*?)त्त(.*)', lambda m: [m.group(1) + 'त्', 'त' + m.group(2)]),
-            (r'(.*?)न्न(.*)', lambda m: [m.group(1) + 'न्', 'न' + m.group(2)]),
-            (r'(.*?)म्म(.*)', lambda m: [m.group(1) + 'म्', 'म' + m.group(2)]),
+            ('compound_tt', r'(.*?)त्त(.*)', lambda m: [m.group(1) + 'त्', 'त' + m.group(2)]),
+            ('compound_nn', r'(.*?)न्न(.*)', lambda m: [m.group(1) + 'न्', 'न' + m.group(2)]),
+            ('compound_mm', r'(.*?)म्म(.*)', lambda m: [m.group(1) + 'म्', 'म' + m.group(2)]),
             
             # Special patterns
-            (r'(.*?)ग्ग(.*)', lambda m: [m.group(1) + 'ग्', 'ग' + m.group(2)]),
-            (r'(.*?)द्द(.*)', lambda m: [m.group(1) + 'द्', 'द' + m.group(2)]),
-            (r'(.*?)व्व(.*)', lambda m: [m.group(1) + 'व्', 'व' + m.group(2)]),
+            ('special_gg', r'(.*?)ग्ग(.*)', lambda m: [m.group(1) + 'ग्', 'ग' + m.group(2)]),
+            ('special_dd', r'(.*?)द्द(.*)', lambda m: [m.group(1) + 'द्', 'द' + m.group(2)]),
+            ('special_vv', r'(.*?)व्व(.*)', lambda m: [m.group(1) + 'व्', 'व' + m.group(2)]),
         ]
         
+        # Compiled alternations of split_patterns, keyed by first rule (see _split_matcher)
+        self._split_matchers = {}
+        
         # Known edge cases from training data
         self.edge_cases = {
             'यो': ['यः', 'उच्यते'],
@@ -156,120 +227,97 @@ class HybridSandhiSplitter:
         }
     
     def split(self, word: str) -> Optional[List[str]]:
-      
+        """Split word, returning its parts, or None if it is not split."""
         if not word or len(word) < 2:
             return None
         
-        # Step 1: Check edge cases (highest priority)
-        if word in self.edge_cases:
-            return self.edge_cases[word]
-        
-        # Step 2: Try BiLSTM with high threshold
-        bilstm_result = None
-        if self.use_bilstm and self.bilstm_model:
-            bilstm_result = self._bilstm_split(word)
-            if bilstm_result and self._validate_bilstm_result(bilstm_result):
-                return bilstm_result
-        
-        # Step 3: Try rule-based splitting
-        rule_result = self._rule_based_split(word)
-        if rule_result and self._validate_rule_result(rule_result):
-            return rule_result
-        
-        # Step 4: Try BiLSTM with lower threshold if rule-based failed
-        if bilstm_result and self._validate_bilstm_result(bilstm_result, strict=False):
-            return bilstm_result
-        
-        # Step 5: No split found
-        return None
+        method, splits, _ = self.analyze_word(word)
+        return None if method == 'no_split' else splits
     
-    def _bilstm_split(self, word: str) -> Optional[List[str]]:
-        """Split word using BiLSTM model."""
+    def _bilstm_predict_batch(self, words: List[str]) -> List:
+        """
+        Run the BiLSTM once over many words.
+        
+        Returns:
+            Per-character split probabilities for each word (including the
+            START/END positions), or None for every word if the model failed
+        """
         try:
-            import torch
-            
-            # Convert word to character indices
-            chars = ['<START>'] + list(word) + ['<END>']
-            char_indices = [self.char_to_idx.get(c, 0) for c in chars]
-            
-            # Create input tensor
-            input_tensor = torch.tensor([char_indices], dtype=torch.long)
-            
-            # Get predictions
-            with torch.no_grad():
-                predictions = self.bilstm_model(input_tensor)
-            
-            # Convert predictions to splits
-            splits = self._predictions_to_splits(word, predictions)
+            # Convert words to character indices
+            sequences = [self._encode_for_bilstm(word) for word in words]
             
-            return splits if len(splits) > 1 else None
+            # Get predictions for the whole batch
+            pipeline_metrics.increment('bilstm_forward_passes')
+            pipeline_metrics.increment('bilstm_words', len(words))
+            return self.bilstm_model.predict_proba_batch(sequences)
             
         except Exception as e:
-            print(f"BiLSTM split error for '{word}': {e}")
-            return None
-    
-    def _predictions_to_splits(self, word: str, predictions) -> List[str]:
-        """Convert BiLSTM predictions to word splits."""
-        # predictions shape: [1, sequence_length] with split probabilities
-        probabilities = predictions[0].tolist()  # Get first batch
-        
-        # Find split positions using threshold
-        split_positions = []
-        for i, prob in enumerate(probabilities[1:-1]):  # Skip START and END
-            if prob >= 0.5:  # Threshold for split decision
-                split_positions.append(i + 1)  # +1 because we skipped START
-        
-        # Create splits based on positions
-        if split_positions:
-            splits = []
-            prev_pos = 0
-            for pos in split_positions:
-                splits.append(word[prev_pos:pos])
-                prev_pos = pos
-            splits.append(word[prev_pos:])  # Add remaining part
-            return splits
-        
-        return [word]  # No splits found
+            logger.warning("BiLSTM split error for %d words: %s", len(words), e)
+            return [None] * len(words)
     
-    def _validate_bilstm_result(self, splits: List[str], strict: bool = True) -> bool:
-        """Validate BiLSTM split results."""
-        if not splits or len(splits) < 2:
-            return False
-        
-        # Strict validation for high threshold
-        if strict:
-            # No single characters (except special cases)
-            if any(len(part) < 2 and part not in ['ऽ', 'ः', 'ं'] for part in splits):
-                return False
-            
-            # No invalid fragments
-            if any(part.startswith('्') or part.endswith('्') for part in splits):
-                return False
-            
-            # Maximum reasonable splits
-            if len(splits) > 6:
-                return False
-        else:
-            # Relaxed validation
-            if any(len(part) < 1 for part in splits):
-                return False
-        
-        return True
+    def _encode_for_bilstm(self, word: str) -> List[int]:
+        """Encode word as character indices wrapped in START/END markers."""
+        chars = ['<START>'] + list(word) + ['<END>']
+        return [self.char_to_idx.get(c, 0) for c in chars]
     
     def _rule_based_split(self, word: str) -> Optional[List[str]]:
         """Split word using rule-based approach."""
-        for pattern, handler in self.split_patterns:
-            match = re.match(pattern, word)
-            if match:
-                try:
-                    result = handler(match)
-                    if result and len(result) > 1:
-                        return result
-                except:
-                    continue
+        matched = self.match_split_rule(word)
+        return matched[1] if matched else None
+    
+    def match_split_rule(self, word: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Split word with the rule table, reporting which rule fired.
+        
+        The whole table is one compiled alternation, so a single regex call finds
+        the highest-priority matching rule. If its handler yields no split, matching
+        resumes with the rules after it, as the sequential loop did.
+        
+        Returns:
+            (rule name, splits), with rule name 'tokenizer_reverse' for the
+            tokenizer-pattern fallback, or None
+        """
+        first_rule = 0
+        while first_rule < len(self.split_patterns):
+            regex, rules_by_marker = self._split_matcher(first_rule)
+            match = regex.match(word)
+            if match is None:
+                break
+            
+            rule_index, group_offset = rules_by_marker[match.lastindex]
+            name, _, handler = self.split_patterns[rule_index]
+            try:
+                result = handler(_RuleMatch(match, group_offset))
+                if result and len(result) > 1:
+                    return name, result
+            except:
+                pass
+            first_rule = rule_index + 1
         
         # Try tokenizer's reverse patterns
-        return self._tokenizer_split(word)
+        result = self._tokenizer_split(word)
+        return ('tokenizer_reverse', result) if result else None
+    
+    def _split_matcher(self, first_rule: int) -> Tuple[Any, Dict[int, Tuple[int, int]]]:
+        """
+        Compiled alternation of split_patterns[first_rule:], built once per start.
+        
+        Each rule becomes a lookahead followed by an empty marker group, so the
+        match's lastindex identifies the rule, and the rule's own groups are
+        reached through a group offset.
+        """
+        if first_rule not in self._split_matchers:
+            branches = []
+            rules_by_marker = {}
+            group_count = 0
+            for rule_index in range(first_rule, len(self.split_patterns)):
+                pattern = self.split_patterns[rule_index][1]
+                branches.append(f'(?={pattern})()')
+                rule_groups = re.compile(pattern).groups
+                rules_by_marker[group_count + rule_groups + 1] = (rule_index, group_count)
+                group_count += rule_groups + 1
+            self._split_matchers[first_rule] = (re.compile('|'.join(branches)), rules_by_marker)
+        return self._split_matchers[first_rule]
     
     def _tokenizer_split(self, word: str) -> Optional[List[str]]:
         """Use tokenizer's reverse sandhi patterns."""
@@ -292,21 +340,6 @@ class HybridSandhiSplitter:
         
         return None
     
-    def _validate_rule_result(self, splits: List[str]) -> bool:
-        """Validate rule-based split results."""
-        if not splits or len(splits) < 2:
-            return False
-        
-        # Check for reasonable splits
-        if any(len(part) < 1 for part in splits):
-            return False
-        
-        # Check for invalid characters
-        if any('्' in part[1:] for part in splits):  # Virama not at start
-            return False
-        
-        return True
-    
     def analyze_word(self, word: str) -> Tuple[str, List[str], float]:
         """
         Analyze word and return method used, splits, and confidence.
@@ -314,57 +347,178 @@ class HybridSandhiSplitter:
         Returns:
             Tuple of (method, splits, confidence)
         """
+        return self.analyze_words([word])[0]
+    
+    def analyze_words(self, words: List[str]) -> List[Tuple[str, List[str], float]]:
+        """
+        Analyze many words, sending all BiLSTM candidates through one forward pass.
+        Words are NFC-normalized and their analyses memoized in the LRU cache.
+        
+        Returns:
+            List of (method, splits, confidence) tuples in input order; each
+            splits list is a fresh copy the caller may modify
+        """
+        words = [unicodedata.normalize('NFC', word.strip()) for word in words]
+        
+        # Load the BiLSTM (or follow a reload) before reading its version, so
+        # the keys below belong to the model that analyzes the misses
+        bilstm_model = self.bilstm_model if self.use_bilstm else None
+        model_version = self._bilstm_version
+        
+        # Serve repeated words from the cache
+        analyses = {}
+        for word in dict.fromkeys(words):
+            cached = self.analysis_cache.get(self._cache_key(word, model_version))
+            if cached is not None:
+                analyses[word] = cached
+        
+        # Analyze the remaining unique words, with one BiLSTM pass for all of them
+        pending = [word for word in dict.fromkeys(words) if word not in analyses]
+        pipeline_metrics.increment('sandhi_cache_hits', len(analyses))
+        pipeline_metrics.increment('sandhi_cache_misses', len(pending))
+        bilstm_probabilities = {}
+        if bilstm_model:
+            model_words = [w for w in pending
+                           if w not in self.edge_cases and self._lexicon_lookup(w) is None]
+            if model_words:
+                bilstm_probabilities = dict(zip(model_words, self._bilstm_predict_batch(model_words)))
+        
+        # Cached splits are tuples, so no caller can change a cached analysis
+        for word in pending:
+            method, splits, confidence = self._resolve_analysis(word, bilstm_probabilities.get(word))
+            analyses[word] = analysis = (method, tuple(splits), confidence)
+            self.analysis_cache.put(self._cache_key(word, model_version), analysis)
+        
+        return [(method, list(splits), confidence)
+                for method, splits, confidence in (analyses[word] for word in words)]
+    
+    def _resolve_analysis(self, word: str, probabilities) -> Tuple[str, List[str], float]:
+        """
+        Pick method, splits and confidence for a word.
+        
+        Edge cases and gold-attested lexicon words are answered directly;
+        everything else, vocabulary words included, is the best path through
+        the segmentation lattice built by _lattice_candidates.
+        """
         if word in self.edge_cases:
             return 'edge_case', self.edge_cases[word], 1.0
         
-        # Try BiLSTM
-        if self.use_bilstm and self.bilstm_model:
-            bilstm_result = self._bilstm_split(word)
-            if bilstm_result:
-                confidence = self._calculate_bilstm_confidence(word, bilstm_result)
-                if confidence >= self.bilstm_threshold:
-                    return 'bilstm', bilstm_result, confidence
-        
-        # Try rule-based
-        rule_result = self._rule_based_split(word)
-        if rule_result:
-            return 'rules', rule_result, 0.8
-        
-        # Try BiLSTM with lower threshold
-        if self.use_bilstm and self.bilstm_model:
-            bilstm_result = self._bilstm_split(word)
-            if bilstm_result:
-                confidence = self._calculate_bilstm_confidence(word, bilstm_result)
-                return 'bilstm_low', bilstm_result, confidence
+        known = self._lexicon_lookup(word)
+        if known is not None:
+            return 'lexicon', known, 1.0
         
-        return 'no_split', [word], 0.0
+        cut_probs, model_cut_probs, rule_cuts, alternatives = self._lattice_candidates(word, probabilities)
+        best = self.lattice.segment(word, cut_probs, alternatives, k=1)[0]
+        if len(best.parts) < 2:
+            return 'no_split', [word], 0.0
+        
+        # A path without surface cuts is a whole-word alternative from the rule
+        # table; its confidence is that alternative's own probability
+        if not best.cuts:
+            for parts, probability in alternatives:
+                if list(parts) == best.parts:
+                    return 'rules', best.parts, float(probability)
+            return 'lattice', best.parts, self.lattice.default_cut_prob
+        
+        # Name the split after its evidence; confidence is the mean probability of its cuts
+        model_probs = [model_cut_probs.get(pos, 0.0) for pos in best.cuts]
+        confidence = sum(cut_probs.get(pos, self.lattice.default_cut_prob) for pos in best.cuts) / len(best.cuts)
+        if all(prob >= self.bilstm_threshold for prob in model_probs):
+            method = 'bilstm'
+        elif all(prob >= 0.5 for prob in model_probs):
+            method = 'bilstm_low'
+        elif any(pos in rule_cuts for pos in best.cuts):
+            method = 'rules'
+        else:
+            method = 'lattice'
+        return method, best.parts, float(confidence)
     
-    def _calculate_bilstm_confidence(self, word: str, splits: List[str]) -> float:
-        """Calculate confidence score for BiLSTM result."""
-        # Base confidence from validation
-        base_confidence = 0.7
+    def segment(self, word: str, k: int = 3) -> List[Segmentation]:
+        """
+        Return the k best segmentations of a word, best first.
         
-        # Adjust based on split quality
-        if self._validate_bilstm_result(splits, strict=True):
-            base_confidence += 0.2
+        Unlike analyze_word, edge cases and lexicon words are segmented too,
+        so alternatives to their known split are visible.
+        """
+        word = unicodedata.normalize('NFC', word.strip())
+        probabilities = None
+        if self.use_bilstm and self.bilstm_model:
+            probabilities = self._bilstm_predict_batch([word])[0]
+        cut_probs, _, _, alternatives = self._lattice_candidates(word, probabilities)
+        return self.lattice.segment(word, cut_probs, alternatives, k=k)
+    
+    def _lattice_candidates(self, word: str, probabilities) -> Tuple[Dict[int, float], Dict[int, float], List[int], List[Tuple[List[str], float]]]:
+        """
+        Candidate cuts {position: probability} from the BiLSTM and the rule table.
         
-        # Penalize single characters
-        if any(len(part) < 2 and part not in ['ऽ', 'ः', 'ं'] for part in splits):
-            base_confidence -= 0.3
+        Cuts are snapped to grapheme boundaries (see lattice_segmenter.snap_cuts):
+        the model often marks the virama or vowel sign after a consonant. Rule cuts
+        are combined with the BiLSTM probability as a noisy-OR. Rule outputs that
+        are not plain cuts of the word become whole-word alternatives.
         
-        # Penalize too many splits
-        if len(splits) > 4:
-            base_confidence -= 0.2
+        Returns:
+            (cut probabilities, BiLSTM cut probabilities, rule cut positions, alternatives)
+        """
+        model_probs = {}
+        if probabilities is not None:
+            # The model was trained to mark the first character of each following
+            # part, so the probability at character i is for a cut before it
+            for i, prob in enumerate(probabilities[1:-1]):  # Skip START and END
+                if prob >= MIN_BILSTM_CUT_PROB:
+                    model_probs[i] = float(prob)
+            model_probs = snap_cuts(word, model_probs)
         
-        # Reward reasonable split lengths
-        if all(2 <= len(part) <= 8 for part in splits):
-            base_confidence += 0.1
+        rule_cuts, alternatives = self._rule_cuts(word)
+        rule_cuts = sorted(snap_cuts(word, dict.fromkeys(rule_cuts, 1.0)))
+        rule_prob = RULE_CUT_PROB if probabilities is None else RULE_CUT_EVIDENCE
+        cut_probs = dict(model_probs)
+        for pos in rule_cuts:
+            cut_probs[pos] = 1.0 - (1.0 - cut_probs.get(pos, 0.0)) * (1.0 - rule_prob)
+        return cut_probs, model_probs, rule_cuts, [(parts, rule_prob) for parts in alternatives]
+    
+    def _rule_cuts(self, word: str, max_rule_cuts: int = 6) -> Tuple[List[int], List[List[str]]]:
+        """
+        Cut positions proposed by the rule table, and rule splits that rewrite the word.
         
-        return min(max(base_confidence, 0.0), 1.0)
+        Rules match from the start of the string, so after each cut the table is
+        applied again to the remainder, at most max_rule_cuts times.
+        """
+        cuts, alternatives = [], []
+        start = 0
+        while len(cuts) < max_rule_cuts:
+            matched = self.match_split_rule(word[start:])
+            if matched is None:
+                break
+            parts = matched[1]
+            if not word.startswith(''.join(parts), start):
+                if start == 0:
+                    alternatives.append(parts)
+                break
+            
+            # Every part boundary is a cut; the last part may be truncated by the rule
+            position = start
+            for part in parts[:-1]:
+                position += len(part)
+                if 0 < position < len(word) and position not in cuts:
+                    cuts.append(position)
+            if position <= start:
+                break
+            start = position
+        return cuts, alternatives
+    
+    def _lexicon_lookup(self, word: str) -> Optional[List[str]]:
+        """
+        Gold split, or [word] for words the gold data does not split; None for
+        other words (vocabulary words are left to the lattice) or without a lexicon.
+        """
+        if self.lexicon is None:
+            return None
+        return self.lexicon.verified_split(word)
 
 
 # Test the hybrid splitter
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("🔧 Testing Hybrid Sanskrit Sandhi Splitter")
     print("=" * 50)
     
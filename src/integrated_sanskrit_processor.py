@@ -8,7 +8,11 @@ import os
 import sys
 import pickle
 import re
-from typing import List, Dict, Any, Tuple, Optional, Union
+import time
+import logging
+import threading
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Optional, Union
 from collections import defaultdict, Counter
 
 # Add paths
@@ -17,15 +21,19 @@ project_root = os.path.dirname(current_dir)
 sys.path.insert(0, os.path.join(project_root, 'data'))
 sys.path.insert(0, current_dir)
 
+# The sandhi splitter and CRF tagger (and numpy, onnxruntime or torch behind
+# them) are imported when first used, so tokenizing never loads them
 try:
-    from tokenizer import SanskritTokenizer
-    from hybrid_sandhi_splitter import HybridSandhiSplitter
-    from crf_pos_tagger import CRFPOSTagger
+    from tokenizer import SanskritTokenizer, count_devanagari
+    from model_registry import get_model
+    import pipeline_metrics
 except ImportError as e:
     print(f"Import error: {e}")
     print("Please ensure all required modules are in the correct directories")
     sys.exit(1)
 
+logger = logging.getLogger(__name__)
+
 
 class IntegratedSanskritProcessor:
     """
@@ -33,12 +41,19 @@ class IntegratedSanskritProcessor:
     1. Hybrid BiLSTM Sandhi Splitter
     2. CRF POS Tagger
     3. Comprehensive text analysis
+    
+    Components are created on first use; servers call warmup() at startup
+    so the first request does not pay for loading the models.
     """
     
     def __init__(self, 
                  bilstm_threshold: float = 0.7,
                  pos_model_path: str = None,
-                 use_bilstm: bool = True):
+                 use_bilstm: bool = True,
+                 sandhi_cache_size: int = 4096,
+                 pos_cache_size: int = 4096,
+                 bilstm_runtime: str = 'auto',
+                 collect_metrics: bool = False):
         """
         Initialize the integrated processor.
         
@@ -46,50 +61,114 @@ class IntegratedSanskritProcessor:
             bilstm_threshold: Threshold for BiLSTM sandhi splitting
             pos_model_path: Path to CRF POS model
             use_bilstm: Whether to use BiLSTM model
+            sandhi_cache_size: Size of the per-word sandhi analysis LRU cache (0 disables it)
+            pos_cache_size: Size of the CRF per-word score LRU cache (0 disables it)
+            bilstm_runtime: BiLSTM backend: 'auto', 'onnx', 'numpy', 'torchscript', 'eager' or 'int8'
+            collect_metrics: Record per-stage times and work counters in each result
+                and in pipeline_metrics.registry
         """
         self.bilstm_threshold = bilstm_threshold
         self.use_bilstm = use_bilstm
+        self.pos_model_path = pos_model_path
+        self.sandhi_cache_size = sandhi_cache_size
+        self.pos_cache_size = pos_cache_size
+        self.bilstm_runtime = bilstm_runtime
+        self.collect_metrics = collect_metrics
+        
+        # Components, built on first access by the properties below
+        self._tokenizer = None
+        self._sandhi_splitter = None
+        self._crf_model = None
+        self._crf_loaded = False
+        self._lock = threading.RLock()
+        
+        logger.info("Integrated Sanskrit Processor ready (components load on first use)")
+    
+    @property
+    def tokenizer(self) -> SanskritTokenizer:
+        """Sanskrit tokenizer, created on first access."""
+        if self._tokenizer is None:
+            with self._lock:
+                if self._tokenizer is None:
+                    self._tokenizer = get_model('tokenizer', SanskritTokenizer)
+                    logger.info("Tokenizer loaded")
+        return self._tokenizer
+    
+    @property
+    def sandhi_splitter(self):
+        """Hybrid sandhi splitter, created on first access (its BiLSTM loads on first split)."""
+        if self._sandhi_splitter is None:
+            with self._lock:
+                if self._sandhi_splitter is None:
+                    from hybrid_sandhi_splitter import HybridSandhiSplitter
+                    
+                    self._sandhi_splitter = HybridSandhiSplitter(
+                        use_bilstm=self.use_bilstm,
+                        bilstm_threshold=self.bilstm_threshold,
+                        cache_size=self.sandhi_cache_size,
+                        bilstm_runtime=self.bilstm_runtime
+                    )
+                    logger.info("Hybrid Sandhi Splitter loaded (BiLSTM: %s, Threshold: %s)",
+                                self.use_bilstm, self.bilstm_threshold)
+        return self._sandhi_splitter
+    
+    @property
+    def crf_model(self):
+        """CRF POS tagger, loaded on first access; None if no model file is available."""
+        if not self._crf_loaded:
+            with self._lock:
+                if not self._crf_loaded:
+                    self._crf_model = self._create_crf_tagger()
+                    self._crf_loaded = True
+        return self._crf_model
+    
+    def _create_crf_tagger(self):
+        """Load the CRF POS tagger from pos_model_path, or the default model, shared process-wide."""
+        from crf_pos_tagger import CRFPOSTagger
         
-        # Initialize components
-        print("🔧 Initializing Integrated Sanskrit Processor...")
-        
-        # 1. Tokenizer
-        self.tokenizer = SanskritTokenizer()
-        print("✅ Tokenizer loaded")
-        
-        # 2. Hybrid Sandhi Splitter
-        self.sandhi_splitter = HybridSandhiSplitter(
-            use_bilstm=use_bilstm, 
-            bilstm_threshold=bilstm_threshold
-        )
-        print(f"✅ Hybrid Sandhi Splitter loaded (BiLSTM: {use_bilstm}, Threshold: {bilstm_threshold})")
-        
-        # 3. CRF POS Tagger (load directly)
-        self.crf_model = None
-        if pos_model_path:
-            self.crf_model = CRFPOSTagger(pos_model_path)
-        else:
+        model_path = self.pos_model_path
+        if not model_path:
             # Default model path
             default_path = os.path.join(project_root, 'models', 'enhanced_comprehensive_model.pkl')
-            if os.path.exists(default_path):
-                self.crf_model = CRFPOSTagger(default_path)
+            model_path = default_path if os.path.exists(default_path) else None
         
-        if self.crf_model and self.crf_model.is_trained:
-            print("✅ CRF POS Tagger loaded")
+        crf_model = None
+        if model_path:
+            crf_model = get_model('crf_tagger', lambda: CRFPOSTagger(model_path, cache_size=self.pos_cache_size),
+                                  path=model_path, cache_size=self.pos_cache_size)
+        
+        if crf_model and crf_model.is_trained:
+            logger.info("CRF POS Tagger loaded")
         else:
-            print("⚠️  CRF POS Tagger not available - using basic fallback")
+            logger.warning("CRF POS Tagger not available - using basic fallback")
+        return crf_model
+    
+    def warmup(self, sandhi: bool = True, pos: bool = True):
+        """
+        Load components and run a short text through them, ahead of the first request.
         
-        print("🎯 Integrated Processor Ready!")
+        Args:
+            sandhi: Load the sandhi splitter and its BiLSTM runtime
+            pos: Load the CRF POS tagger
+        """
+        # Accessing the properties builds the components
+        self.tokenizer
+        if sandhi:
+            self.sandhi_splitter.warmup()
+        if pos:
+            self.crf_model
+            self._tag_pos(['रामो', 'गच्छति'])
+        logger.info("Integrated Processor ready")
     
     def _load_crf_model(self, model_path: str):
         """Load CRF POS model."""
         try:
             with open(model_path, 'rb') as f:
                 model_data = pickle.load(f)
-            print(f"✅ CRF model loaded from {model_path}")
+            logger.info("CRF model loaded from %s", model_path)
             return model_data
         except Exception as e:
-            print(f"❌ Error loading CRF model: {e}")
+            logger.error("Error loading CRF model: %s", e)
             return None
     
     def _is_sanskrit_text(self, text: str) -> Tuple[bool, float]:
@@ -105,39 +184,9 @@ class IntegratedSanskritProcessor:
         if not text or not text.strip():
             return False, 0.0
         
-        # Count Sanskrit characters
-        sanskrit_chars = 0
-        total_chars = 0
-        
-        # Sanskrit character ranges (Devanagari)
-        sanskrit_ranges = [
-            (0x0900, 0x097F),  # Devanagari
-            (0x0951, 0x0954),  # Devanagari extended
-            (0x0960, 0x0963),  # Devanagari additional
-        ]
-        
-        # Sanskrit punctuation and symbols
-        sanskrit_symbols = {'।', '॥', 'ऽ', 'ॐ', 'ं', 'ः'}
-        
-        for char in text.strip():
-            if char.isspace() or char in '.,;:!?\'"-()[]{}':
-                continue
-                
-            total_chars += 1
-            char_code = ord(char)
-            
-            # Check if character is Sanskrit
-            is_sanskrit = False
-            for start, end in sanskrit_ranges:
-                if start <= char_code <= end:
-                    is_sanskrit = True
-                    break
-            
-            if char in sanskrit_symbols:
-                is_sanskrit = True
-            
-            if is_sanskrit:
-                sanskrit_chars += 1
+        # Devanagari characters (which include the Sanskrit punctuation and
+        # symbols) among all but whitespace and ASCII punctuation
+        sanskrit_chars, total_chars = count_devanagari(text)
         
         # Calculate confidence
         if total_chars == 0:
@@ -166,80 +215,215 @@ class IntegratedSanskritProcessor:
         Returns:
             Comprehensive analysis results
         """
-        results = {
-            'original_text': text,
-            'tokens': [],
-            'sandhi_analysis': {},
-            'pos_analysis': {},
-            'morphology_analysis': {},
-            'confidence_scores': {},
-            'processing_steps': [],
-            'language_check': {}
-        }
+        return self.process_texts([text], split_sandhi, tag_pos, analyze_morphology)[0]
+    
+    def process_texts(self, texts: List[str],
+                      split_sandhi: bool = True,
+                      tag_pos: bool = True,
+                      analyze_morphology: bool = True) -> List[Dict[str, Any]]:
+        """
+        Process many texts, with one sandhi splitter pass and one CRF batch for all of them.
         
-        print(f"📝 Processing: '{text}'")
+        Args:
+            texts: Input Sanskrit texts
+            split_sandhi: Whether to split sandhi compounds
+            tag_pos: Whether to tag POS
+            analyze_morphology: Whether to analyze morphology
         
-        # Step 0: Language Validation
-        is_sanskrit, sanskrit_ratio = self._is_sanskrit_text(text)
-        results['language_check'] = {
-            'is_sanskrit': is_sanskrit,
-            'sanskrit_ratio': sanskrit_ratio,
-            'message': 'Valid Sanskrit text' if is_sanskrit else 'Please enter Sanskrit text only'
-        }
+        Returns:
+            One process_text result per input text, in input order. With
+            collect_metrics, each also carries 'metrics': its stage times in
+            seconds, and under 'batch_counters' the work counters of the whole
+            call (batch_texts texts). The counters come from the batched sandhi
+            and POS stages and are not attributed to single texts.
+        """
+        if not self.collect_metrics:
+            return self._process_texts(texts, split_sandhi, tag_pos, analyze_morphology)
+        
+        counters = Counter()
+        with pipeline_metrics.recording(counters):
+            all_results = self._process_texts(texts, split_sandhi, tag_pos, analyze_morphology)
+        for results in all_results:
+            results['metrics']['batch_counters'] = dict(counters)
+            pipeline_metrics.registry.observe_text(results['metrics']['stage_seconds'])
+        pipeline_metrics.registry.add_counters(counters)
+        return all_results
+    
+    def _process_texts(self, texts: List[str], split_sandhi: bool, tag_pos: bool,
+                       analyze_morphology: bool) -> List[Dict[str, Any]]:
+        """
+        The pipeline behind process_texts. Stage times are measured per text; the
+        batched sandhi and POS stages are timed once and shared out by token count.
+        """
+        all_results = []
+        batch = []  # [results, tokens, stage_seconds] of the texts that reach the batched steps
+        clock = time.perf_counter
+        
+        for text in texts:
+            results = {
+                'original_text': text,
+                'tokens': [],
+                'sandhi_analysis': {},
+                'pos_analysis': {},
+                'morphology_analysis': {},
+                'confidence_scores': {},
+                'processing_steps': [],
+                'language_check': {}
+            }
+            stage_seconds = {}
+            if self.collect_metrics:
+                results['metrics'] = {'stage_seconds': stage_seconds, 'batch_texts': len(texts)}
+            all_results.append(results)
+            
+            logger.debug("Processing: %r", text)
+            
+            # Step 0: Language Validation
+            start = clock()
+            is_sanskrit, sanskrit_ratio = self._is_sanskrit_text(text)
+            results['language_check'] = {
+                'is_sanskrit': is_sanskrit,
+                'sanskrit_ratio': sanskrit_ratio,
+                'message': 'Valid Sanskrit text' if is_sanskrit else 'Please enter Sanskrit text only'
+            }
+            stage_seconds['language_check'] = clock() - start
+            
+            if not is_sanskrit:
+                logger.debug("Not Sanskrit text: %.2f%% Sanskrit characters", sanskrit_ratio * 100)
+                results['error'] = 'Please enter Sanskrit text only. This system is designed for Sanskrit language analysis.'
+                continue
+            
+            logger.debug("Sanskrit text validated: %.2f%% Sanskrit characters", sanskrit_ratio * 100)
+            
+            # Step 1: Tokenization
+            start = clock()
+            try:
+                tokens = self.tokenizer.tokenize(text)
+                results['tokens'] = tokens
+                results['processing_steps'].append('tokenization')
+                logger.debug("Tokenized: %s", tokens)
+            except Exception as e:
+                logger.warning("Tokenization error: %s", e)
+                results['error'] = str(e)
+                continue
+            finally:
+                stage_seconds['tokenize'] = clock() - start
+            
+            batch.append([results, tokens, stage_seconds])
+        
+        # Step 2: Sandhi Splitting (if requested), one splitter call for every text
+        if split_sandhi and batch:
+            start = clock()
+            analyses = iter(self.sandhi_splitter.analyze_words(
+                [token for _, tokens, _ in batch for token in tokens if token not in ['।', '॥', '.', ',', ';', ':', '!', '?']]))
+            for entry in batch:
+                results, tokens, _ = entry
+                sandhi_results = self._analyze_sandhi(tokens, analyses)
+                results['sandhi_analysis'] = sandhi_results
+                results['processing_steps'].append('sandhi_splitting')
+                
+                # Update tokens with split results
+                if sandhi_results.get('split_tokens'):
+                    results['tokens'] = sandhi_results['split_tokens']
+                    entry[1] = sandhi_results['split_tokens']
+                    logger.debug("Sandhi split: %s", entry[1])
+            self._share_stage_seconds(batch, 'sandhi', clock() - start)
+        
+        # Step 3: POS Tagging (if requested), one CRF batch for every text
+        if tag_pos:
+            start = clock()
+            tagged = [entry for entry in batch if entry[1]]
+            tagged_sentences = self._tag_batch_with_crf([tokens for _, tokens, _ in tagged])
+            for (results, tokens, _), tagged_sentence in zip(tagged, tagged_sentences):
+                pos_results = self._tag_pos(tokens, tagged_sentence)
+                results['pos_analysis'] = pos_results
+                results['processing_steps'].append('pos_tagging')
+                logger.debug("POS tagged: %d tokens", len(pos_results.get('tagged_tokens', [])))
+            self._share_stage_seconds(tagged, 'pos', clock() - start)
+        
+        for results, tokens, stage_seconds in batch:
+            # Step 4: Morphology Analysis (if requested)
+            if analyze_morphology and tokens:
+                start = clock()
+                morph_results = self._analyze_morphology(tokens, results.get('pos_analysis', {}))
+                results['morphology_analysis'] = morph_results
+                results['processing_steps'].append('morphology_analysis')
+                logger.debug("Morphology: %d words analyzed", len(morph_results.get('word_analysis', [])))
+                stage_seconds['morphology'] = clock() - start
+            
+            # Step 5: Calculate overall confidence
+            start = clock()
+            overall_confidence = self._calculate_overall_confidence(results)
+            results['overall_confidence'] = overall_confidence
+            stage_seconds['confidence'] = clock() - start
+            
+            logger.debug("Complete, overall confidence: %.1f%%", overall_confidence * 100)
         
-        if not is_sanskrit:
-            print(f"  ❌ Not Sanskrit text: {sanskrit_ratio:.2%} Sanskrit characters")
-            results['error'] = 'Please enter Sanskrit text only. This system is designed for Sanskrit language analysis.'
-            return results
+        return all_results
+    
+    @staticmethod
+    def _share_stage_seconds(entries: List[list], stage: str, seconds: float):
+        """Split the wall time of a batched stage over its texts in proportion to their tokens."""
+        weights = [max(1, len(tokens)) for _, tokens, _ in entries]
+        total = sum(weights)
+        for (_, _, stage_seconds), weight in zip(entries, weights):
+            stage_seconds[stage] = seconds * weight / total
+    
+    def process_stream(self, lines: Iterable[str],
+                       batch_size: int = 256,
+                       split_sandhi: bool = True,
+                       tag_pos: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Process any iterable of lines (e.g. an open file) lazily, yielding one compact
+        result per line in input order.
         
-        print(f"  ✅ Sanskrit text validated: {sanskrit_ratio:.2%} Sanskrit characters")
+        Lines are run through process_texts batch_size at a time, so the BiLSTM and
+        CRF still see whole batches, while only one batch of input and results is
+        held at a time; memory stays bounded whatever the corpus size.
         
-        # Step 1: Tokenization
-        try:
-            tokens = self.tokenizer.tokenize(text)
-            results['tokens'] = tokens
-            results['processing_steps'].append('tokenization')
-            print(f"  1️⃣ Tokenized: {tokens}")
-        except Exception as e:
-            print(f"  ❌ Tokenization error: {e}")
-            results['error'] = str(e)
-            return results
-        
-        # Step 2: Sandhi Splitting (if requested)
-        if split_sandhi:
-            sandhi_results = self._analyze_sandhi(tokens)
-            results['sandhi_analysis'] = sandhi_results
-            results['processing_steps'].append('sandhi_splitting')
-            
-            # Update tokens with split results
-            if sandhi_results.get('split_tokens'):
-                results['tokens'] = sandhi_results['split_tokens']
-                tokens = sandhi_results['split_tokens']
-                print(f"  2️⃣ Sandhi Split: {tokens}")
-        
-        # Step 3: POS Tagging (if requested)
-        if tag_pos and tokens:
-            pos_results = self._tag_pos(tokens)
-            results['pos_analysis'] = pos_results
-            results['processing_steps'].append('pos_tagging')
-            print(f"  3️⃣ POS Tagged: {len(pos_results.get('tagged_tokens', []))} tokens")
-        
-        # Step 4: Morphology Analysis (if requested)
-        if analyze_morphology and tokens:
-            morph_results = self._analyze_morphology(tokens, results.get('pos_analysis', {}))
-            results['morphology_analysis'] = morph_results
-            results['processing_steps'].append('morphology_analysis')
-            print(f"  4️⃣ Morphology: {len(morph_results.get('word_analysis', []))} words analyzed")
-        
-        # Step 5: Calculate overall confidence
-        overall_confidence = self._calculate_overall_confidence(results)
-        results['overall_confidence'] = overall_confidence
-        
-        print(f"  ✅ Complete! Overall confidence: {overall_confidence*100:.1f}%")
-        return results
+        Args:
+            lines: Sentences, one per item (surrounding whitespace is stripped)
+            batch_size: Lines processed together
+            split_sandhi: Whether to split sandhi compounds
+            tag_pos: Whether to tag POS
+        
+        Yields:
+            {'text', 'tokens', 'tagged_tokens', 'splits', 'confidence'}, where splits maps
+            each word that was split to its parts; {'text', 'error'} if the line failed
+        """
+        batch = []
+        for line in lines:
+            batch.append(line.strip())
+            if len(batch) >= batch_size:
+                for results in self.process_texts(batch, split_sandhi, tag_pos, analyze_morphology=False):
+                    yield self._compact_result(results)
+                batch = []
+        if batch:
+            for results in self.process_texts(batch, split_sandhi, tag_pos, analyze_morphology=False):
+                yield self._compact_result(results)
+    
+    def _compact_result(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of a process_text result that process_stream yields."""
+        if 'error' in results:
+            return {'text': results['original_text'], 'error': results['error']}
+        return {
+            'text': results['original_text'],
+            'tokens': results['tokens'],
+            'tagged_tokens': results.get('pos_analysis', {}).get('tagged_tokens', []),
+            'splits': {op['original']: op['split']
+                       for op in results.get('sandhi_analysis', {}).get('sandhi_operations', [])
+                       if len(op['split']) > 1},
+            'confidence': results['overall_confidence']
+        }
     
-    def _analyze_sandhi(self, tokens: List[str]) -> Dict[str, Any]:
-        """Analyze and split sandhi compounds."""
+    def _analyze_sandhi(self, tokens: List[str], analyses: Optional[Iterator] = None) -> Dict[str, Any]:
+        """
+        Analyze and split sandhi compounds.
+        
+        Args:
+            tokens: Tokens of one text
+            analyses: Splitter analyses of the non-punctuation tokens, in order
+                (e.g. from one call for a whole batch); computed here if None
+        """
         sandhi_results = {
             'original_tokens': tokens,
             'split_tokens': [],
@@ -250,6 +434,11 @@ class IntegratedSanskritProcessor:
         
         split_tokens = []
         
+        # Analyze every non-punctuation token in one batched call
+        if analyses is None:
+            words = [t for t in tokens if t not in ['।', '॥', '.', ',', ';', ':', '!', '?']]
+            analyses = iter(self.sandhi_splitter.analyze_words(words))
+        
         for token in tokens:
             if token in ['।', '॥', '.', ',', ';', ':', '!', '?']:
                 # Punctuation - keep as is
@@ -257,8 +446,8 @@ class IntegratedSanskritProcessor:
                 sandhi_results['methods_used'][token] = 'punctuation'
                 continue
             
-            # Try to split the token
-            method, splits, confidence = self.sandhi_splitter.analyze_word(token)
+            # Take the split computed for this token
+            method, splits, confidence = next(analyses)
             
             if splits and len(splits) > 1 and method != 'no_split':
                 # Token was split
@@ -286,8 +475,15 @@ class IntegratedSanskritProcessor:
         sandhi_results['split_tokens'] = split_tokens
         return sandhi_results
     
-    def _tag_pos(self, tokens: List[str]) -> Dict[str, Any]:
-        """Tag POS for tokens."""
+    def _tag_pos(self, tokens: List[str], tagged_sentence: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
+        """
+        Tag POS for tokens.
+        
+        Args:
+            tokens: Tokens of one text
+            tagged_sentence: CRF tags of the non-punctuation tokens, if already
+                computed for a batch; tagged here if None
+        """
         pos_results = {
             'tagged_tokens': [],
             'pos_distribution': {},
@@ -300,12 +496,13 @@ class IntegratedSanskritProcessor:
             text_for_pos = ' '.join([t for t in tokens if t not in ['।', '॥', '.', ',', ';', ':', '!', '?']])
             
             if text_for_pos.strip():
-                # Try CRF model if available
-                if self.crf_model:
-                    tagged_sentence = self._tag_with_crf(text_for_pos)
-                else:
-                    # Use basic fallback POS tagging
-                    tagged_sentence = self._basic_pos_tag(text_for_pos)
+                if tagged_sentence is None:
+                    # Try CRF model if available
+                    if self.crf_model:
+                        tagged_sentence = self._tag_with_crf(text_for_pos)
+                    else:
+                        # Use basic fallback POS tagging
+                        tagged_sentence = self._basic_pos_tag(text_for_pos)
                 
                 # Parse tagged tokens
                 if tagged_sentence:
@@ -328,17 +525,67 @@ class IntegratedSanskritProcessor:
                         pos_results['pos_distribution']['PUNCT'] = pos_results['pos_distribution'].get('PUNCT', 0) + 1
             
         except Exception as e:
-            print(f"    ❌ POS tagging error: {e}")
+            logger.warning("POS tagging error: %s", e)
             pos_results['error'] = str(e)
         
         return pos_results
     
+    def tag_pos_batch(self, texts: List[str], processes: int = 1,
+                      executor: Optional[Executor] = None) -> List[List[Tuple[str, str]]]:
+        """
+        POS-tag many texts (e.g. the lines of a file) in one CRF batch.
+        
+        Args:
+            texts: Input texts, one sentence each
+            processes: Worker processes for the CRF decoder (1 = in-process)
+            executor: Pool from crf_model.process_pool() reused across calls
+                (instead of processes)
+        
+        Returns:
+            One list of (token, tag) pairs per text; punctuation is tagged PUNCT in place
+        """
+        punctuation = ['।', '॥', '.', ',', ';', ':', '!', '?']
+        token_lists = [self.tokenizer.tokenize(text) for text in texts]
+        word_lists = [[t for t in tokens if t not in punctuation] for tokens in token_lists]
+        
+        tagged_words = None
+        if self.crf_model and self.crf_model.is_trained:
+            try:
+                tagged_words = self.crf_model.tag_sentences(word_lists, processes=processes, executor=executor)
+            except Exception as e:
+                logger.warning("CRF tagging error: %s", e)
+        if tagged_words is None:
+            tagged_words = [self._basic_pos_tag(' '.join(words)) for words in word_lists]
+        
+        results = []
+        for tokens, tagged in zip(token_lists, tagged_words):
+            tagged = iter(tagged)
+            results.append([(token, 'PUNCT') if token in punctuation else next(tagged) for token in tokens])
+        return results
+    
+    def _tag_batch_with_crf(self, token_lists: List[List[str]]) -> List[Optional[List[Tuple[str, str]]]]:
+        """
+        CRF tags for the non-punctuation tokens of each text, in one tag_sentences call.
+        Entries are None where _tag_pos should tag on its own (no CRF model, or the batch failed).
+        """
+        punctuation = ['।', '॥', '.', ',', ';', ':', '!', '?']
+        if not self.crf_model or not self.crf_model.is_trained:
+            return [None] * len(token_lists)
+        
+        word_lists = [[t for t in tokens if t not in punctuation] for tokens in token_lists]
+        try:
+            tagged_words = iter(self.crf_model.tag_sentences([words for words in word_lists if words]))
+        except Exception as e:
+            logger.warning("CRF tagging error: %s", e)
+            return [None] * len(token_lists)
+        return [next(tagged_words) if words else None for words in word_lists]
+    
     def _tag_with_crf(self, text: str) -> List[Tuple[str, str]]:
         """Tag using CRF model."""
         try:
             return self.crf_model.tag_text(text)
         except Exception as e:
-            print(f"CRF tagging error: {e}")
+            logger.warning("CRF tagging error: %s", e)
             return self._basic_pos_tag(text)
     
     def _basic_pos_tag(self, text: str) -> List[Tuple[str, str]]:
@@ -493,8 +740,7 @@ class IntegratedSanskritProcessor:
         Returns:
             Comprehensive prediction results
         """
-        print(f"🎯 PREDICTING USER INPUT: '{user_input}'")
-        print("=" * 60)
+        logger.debug("Predicting user input: %r", user_input)
         
         # Process the input
         results = self.process_text(
@@ -581,4 +827,5 @@ def demo_integrated_processor():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     demo_integrated_processor()
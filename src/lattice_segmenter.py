@@ -0,0 +1,228 @@
+"""
+Lattice Sandhi Segmenter
+k-best segmentation of a word over a lattice of candidate cut points.
+
+Candidate cuts come with a probability (BiLSTM split probabilities, rule-table
+matches, or both) and the lexicon adds cuts wherever a known word ends. A path
+through the lattice is scored as
+
+    sum(log q) over the cuts taken + sum(log(1 - q)) over the cuts skipped
+    + lexicon_bonus per known segment - unknown_penalty per unknown segment
+
+and the k best paths are found with a k-best Viterbi pass. The number of
+lattice nodes is capped at max_candidates, so the search costs
+O(len(word) * lexicon depth) to build the lattice plus a bounded
+O(max_candidates^2 * k) to search it.
+
+Cuts fall on grapheme boundaries: a candidate cut before a combining mark
+(virama, anusvara, visarga, nukta...) is moved past the marks, so no part
+starts with one. The one exception is a cut just before a vowel sign, which
+splits a fused vowel: the following part is restored with the matching
+initial vowel (तस्याग्रे -> तस्य + अग्रे).
+"""
+
+import math
+import heapq
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Probabilities are clipped away from 0 and 1 before taking logs
+_EPSILON = 1e-6
+
+# A cut just before a vowel sign splits a fused vowel (a + a = ā, a + i = e, ...):
+# the part after the cut starts with one of these initial vowels, best candidate first
+VOWEL_SIGN_INITIALS = {
+    'ा': ('अ', 'आ'),
+    'ि': ('इ',),
+    'ी': ('इ', 'ई'),
+    'ु': ('उ',),
+    'ू': ('उ', 'ऊ'),
+    'े': ('इ', 'ई', 'ए'),
+    'ै': ('ए', 'ऐ'),
+    'ो': ('उ', 'ऊ', 'ओ'),
+    'ौ': ('ओ', 'औ'),
+}
+
+
+def _log(probability: float) -> float:
+    return math.log(min(max(probability, _EPSILON), 1.0 - _EPSILON))
+
+
+def logit(probability: float) -> float:
+    """log(p / (1 - p)), clipped to finite values."""
+    return _log(probability) - _log(1.0 - probability)
+
+
+def is_cut_position(word: str, pos: int) -> bool:
+    """Whether a part may start at word[pos]: not a combining mark, unless a vowel sign to restore."""
+    char = word[pos]
+    return char in VOWEL_SIGN_INITIALS or not unicodedata.category(char).startswith('M')
+
+
+def snap_cuts(word: str, cut_probs: Dict[int, float]) -> Dict[int, float]:
+    """
+    Move cuts before combining marks to the next grapheme boundary, keeping the
+    highest probability where cuts meet; cuts outside the word are dropped.
+    """
+    n = len(word)
+    snapped = {}
+    for pos, prob in cut_probs.items():
+        while 0 < pos < n and not is_cut_position(word, pos):
+            pos += 1
+        if 0 < pos < n and prob > snapped.get(pos, 0.0):
+            snapped[pos] = prob
+    return snapped
+
+
+class Segmentation(NamedTuple):
+    """One lattice path: output parts, surface cut positions and log-score."""
+    parts: List[str]
+    cuts: Tuple[int, ...]
+    score: float
+
+
+class LatticeSegmenter:
+    """Dictionary-constrained k-best segmenter over candidate cut points."""
+    
+    def __init__(self, lexicon=None, lexicon_bonus: float = 1.0, unknown_penalty: float = 0.0,
+                 default_cut_prob: float = 0.25, max_candidates: int = 12):
+        """
+        Args:
+            lexicon: SandhiLexicon used to score segments and propose cuts, or None
+            lexicon_bonus: Score added for every segment found in the lexicon
+            unknown_penalty: Score subtracted for every segment not in the lexicon;
+                logit(t) means two unknown parts need a cut probability of at least t
+            default_cut_prob: Probability of cuts proposed only by the lexicon
+            max_candidates: Maximum number of candidate cuts kept per word
+        """
+        self.lexicon = lexicon
+        self.lexicon_bonus = lexicon_bonus
+        self.unknown_penalty = unknown_penalty
+        self.default_cut_prob = default_cut_prob
+        self.max_candidates = max_candidates
+    
+    def segment(self, word: str, cut_probs: Dict[int, float] = None,
+                alternatives: Iterable[Tuple[List[str], float]] = (), k: int = 1) -> List[Segmentation]:
+        """
+        Return the k best segmentations of word, best first.
+        
+        Args:
+            word: Word to segment
+            cut_probs: {position: probability} of cutting before word[position]
+            alternatives: (parts, probability) whole-word splits that are not plain
+                cuts of the surface string (e.g. rule outputs that rewrite characters)
+            k: Number of segmentations to return
+        
+        The unsplit word is always a valid path, so at least one segmentation is returned.
+        """
+        n = len(word)
+        cut_probs = snap_cuts(word, cut_probs or {})
+        known = self._known_segments(word, cut_probs)
+        
+        # Keep the most probable cuts; cutting elsewhere is never considered
+        cuts = sorted(heapq.nlargest(self.max_candidates, cut_probs, key=lambda pos: (cut_probs[pos], -pos)))
+        nodes = [0] + cuts + [n]
+        base = sum(_log(1.0 - cut_probs[pos]) for pos in cuts)
+        gains = [0.0] + [logit(cut_probs[pos]) for pos in cuts] + [0.0]
+        
+        # best[j]: up to k (score, previous node, rank at previous node, parts) ending at nodes[j]
+        best = [[(base, -1, -1, [])]]
+        for j in range(1, len(nodes)):
+            candidates = []
+            for i in range(j):
+                scored = self._score_segment(word, nodes[i], nodes[j], known)
+                if scored is None:
+                    continue
+                segment_score, parts = scored
+                for rank, entry in enumerate(best[i]):
+                    candidates.append((entry[0] + segment_score + gains[j], i, rank, parts))
+            best.append(heapq.nlargest(k, candidates, key=lambda entry: entry[0]))
+        
+        results = [Segmentation(*self._backtrack(best, nodes, len(nodes) - 1, rank), best[-1][rank][0])
+                   for rank in range(len(best[-1]))]
+        
+        for parts, probability in alternatives:
+            score = self._score_parts(parts)
+            if score is not None and len(parts) > 1:
+                results.append(Segmentation(list(parts), (), base + score + (len(parts) - 1) * logit(probability)))
+        
+        # Drop duplicate outputs, keeping the best-scored path for each
+        unique = {}
+        for result in sorted(results, key=lambda result: -result.score):
+            unique.setdefault(tuple(result.parts), result)
+        return list(unique.values())[:k]
+    
+    def _known_segments(self, word: str, cut_probs: Dict[int, float]) -> Dict[Tuple[int, int], List[str]]:
+        """
+        Lexicon entries spanning (start, end), walked from 0 and from every cut.
+        Lexicon word ends become candidate cuts (added to cut_probs in place).
+        """
+        known = {}
+        if self.lexicon is None:
+            return known
+        
+        starts = [0] + sorted(cut_probs)
+        heapq.heapify(starts)
+        visited = set()
+        while starts:
+            start = heapq.heappop(starts)
+            if start in visited:
+                continue
+            visited.add(start)
+            # Restored forms replace one character, so ends line up with the surface word
+            for text in self._restored_forms(word, start):
+                for end, parts in self.lexicon.prefixes(text, start):
+                    if end < len(word) and not is_cut_position(word, end):
+                        continue
+                    known.setdefault((start, end), parts)
+                    if end < len(word) and end not in cut_probs:
+                        cut_probs[end] = self.default_cut_prob
+                        heapq.heappush(starts, end)
+        return known
+    
+    @staticmethod
+    def _restored_forms(word: str, start: int) -> List[str]:
+        """word itself, or word with the vowel sign at start replaced by each candidate initial vowel."""
+        if start > 0 and word[start] in VOWEL_SIGN_INITIALS:
+            return [word[:start] + initial + word[start + 1:] for initial in VOWEL_SIGN_INITIALS[word[start]]]
+        return [word]
+    
+    def _score_segment(self, word: str, start: int, end: int,
+                       known: Dict[Tuple[int, int], List[str]]) -> Optional[Tuple[float, List[str]]]:
+        """(score, output parts) of word[start:end], or None if it cannot be a part."""
+        if (start, end) in known:
+            return self.lexicon_bonus, known[(start, end)]
+        segment = self._restored_forms(word, start)[0][start:end]
+        if start == 0 and end == len(word):
+            return -self.unknown_penalty, [segment]
+        if not self._is_valid_part(segment):
+            return None
+        return -self.unknown_penalty, [segment]
+    
+    def _score_parts(self, parts: List[str]) -> Optional[float]:
+        """Segment score of a whole-word alternative, or None if a part is invalid."""
+        score = 0.0
+        for part in parts:
+            if self.lexicon is not None and self.lexicon.lookup(part) is not None:
+                score += self.lexicon_bonus
+            elif self._is_valid_part(part):
+                score -= self.unknown_penalty
+            else:
+                return None
+        return score
+    
+    @staticmethod
+    def _is_valid_part(part: str) -> bool:
+        """Parts cannot be empty or start with a combining mark (vowel sign, virama, visarga...)."""
+        return bool(part) and not unicodedata.category(part[0]).startswith('M')
+    
+    @staticmethod
+    def _backtrack(best, nodes: List[int], node: int, rank: int) -> Tuple[List[str], Tuple[int, ...]]:
+        """Output parts and surface cuts of the rank-th best path ending at node."""
+        parts, cuts = [], []
+        while node > 0:
+            _, previous, previous_rank, segment_parts = best[node][rank]
+            parts[:0] = segment_parts
+            cuts.append(nodes[node])
+            node, rank = previous, previous_rank
+        return parts, tuple(reversed(cuts[1:]))
@@ -0,0 +1,270 @@
+"""
+Sandhi Lexicon
+Compact trie of known Sanskrit words for sandhi splitting. Words with a gold
+split (data/sandhi_cleaned.txt) and words the gold data never splits (one-part
+gold entries and gold split parts) are answered directly. Vocabulary words
+(CRF known_words, POS datasets) make no split claim, since the vocabulary also
+holds compounds such as सर्वस्यैव; they only earn a bonus in the lattice.
+
+The trie is stored as flat int32 arrays (children of a node are contiguous and
+sorted by character), so it saves to and loads from a single .npz file without
+being rebuilt, and lookups walk one node per character.
+
+Build the prebuilt file with:
+    python src/lexicon.py [--output models/sandhi_lexicon.npz]
+"""
+
+import os
+import sys
+import time
+import pickle
+import logging
+import argparse
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Add data directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, os.path.join(project_root, 'data'))
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXICON_PATH = os.path.join(project_root, 'models', 'sandhi_lexicon.npz')
+
+# Node values: no word ends here / vocabulary word with no split claim /
+# unsplittable according to the gold data / 1 + index of a gold split
+NOT_A_WORD = -1
+KNOWN_WORD = -2
+UNSPLITTABLE = 0
+
+# Separators used to pack the gold splits into one string
+_PART_SEPARATOR = '+'
+_ENTRY_SEPARATOR = '\n'
+
+
+class SandhiLexicon:
+    """Array-backed trie answering known-word, unsplittable and gold-split lookups in O(len(word))."""
+    
+    def __init__(self, edge_chars: List[int], edge_targets: List[int], child_starts: List[int],
+                 node_values: List[int], splits: List[List[str]]):
+        """
+        Args:
+            edge_chars: Code point of each edge, grouped by parent node and sorted
+            edge_targets: Child node of each edge
+            child_starts: Edges of node n are edge_chars[child_starts[n]:child_starts[n + 1]]
+            node_values: NOT_A_WORD, KNOWN_WORD, UNSPLITTABLE, or 1 + index into splits, per node
+            splits: Gold splits
+        """
+        self.edge_chars = edge_chars
+        self.edge_targets = edge_targets
+        self.child_starts = child_starts
+        self.node_values = node_values
+        self.splits = splits
+        self.num_words = sum(value != NOT_A_WORD for value in node_values)
+    
+    @classmethod
+    def build(cls, unsplittable: Iterable[str], gold_splits: Dict[str, List[str]],
+              known_words: Iterable[str] = ()) -> 'SandhiLexicon':
+        """
+        Build from unsplittable words, {word: gold split} and vocabulary words;
+        a gold split wins over unsplittable, which wins over a vocabulary word.
+        """
+        values = {word: KNOWN_WORD for word in known_words if word}
+        values.update((word, UNSPLITTABLE) for word in unsplittable if word)
+        splits = []
+        for word, parts in gold_splits.items():
+            if word and len(parts) > 1:
+                splits.append(list(parts))
+                values[word] = len(splits)
+        
+        # Nested dict trie, then flattened breadth-first so siblings are contiguous
+        root = {}
+        terminal = {}
+        for word, value in values.items():
+            node = root
+            for char in word:
+                node = node.setdefault(char, {})
+            terminal[id(node)] = value
+        
+        edge_chars, edge_targets, child_starts, node_values = [], [], [], []
+        queue = [root]
+        for node in queue:
+            child_starts.append(len(edge_chars))
+            node_values.append(terminal.get(id(node), NOT_A_WORD))
+            for char in sorted(node):
+                edge_chars.append(ord(char))
+                edge_targets.append(len(queue))
+                queue.append(node[char])
+        child_starts.append(len(edge_chars))
+        
+        return cls(edge_chars, edge_targets, child_starts, node_values, splits)
+    
+    @classmethod
+    def from_sources(cls, crf_model_path: str = None, sandhi_data_path: str = None,
+                     include_pos_datasets: bool = True) -> 'SandhiLexicon':
+        """
+        Build from the project's data: CRF known_words and data/pos_*.py words
+        as vocabulary, and the gold splits in data/sandhi_cleaned.txt.
+        """
+        crf_model_path = crf_model_path or os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl')
+        sandhi_data_path = sandhi_data_path or os.path.join(project_root, 'data', 'sandhi_cleaned.txt')
+        
+        known_words = set()
+        if os.path.exists(crf_model_path):
+            with open(crf_model_path, 'rb') as f:
+                known_words.update(pickle.load(f).get('known_words', []))
+        
+        if include_pos_datasets:
+            from pos_nouns import get_noun_dataset
+            from pos_verbs import get_verb_dataset
+            from pos_adjectives import get_adjective_dataset
+            from pos_adverbs import get_adverb_dataset
+            from pos_pronouns import get_pronoun_dataset
+            from pos_particles import get_particle_dataset
+            for get_dataset in (get_noun_dataset, get_verb_dataset, get_adjective_dataset,
+                                get_adverb_dataset, get_pronoun_dataset, get_particle_dataset):
+                known_words.update(word for word, _ in get_dataset())
+        
+        # Gold splits of single-word entries; the most frequent split wins. Gold
+        # parts and entries whose split is the word itself are unsplittable
+        unsplittable = set()
+        split_counts = defaultdict(Counter)
+        if os.path.exists(sandhi_data_path):
+            from sandhi_cleaned_loader import load_sandhi_cleaned_data
+            for combined, parts in load_sandhi_cleaned_data(sandhi_data_path):
+                unsplittable.update(part for part in parts if ' ' not in part)
+                if ' ' not in combined:
+                    split_counts[combined][tuple(parts)] += 1
+        gold_splits = {word: list(counts.most_common(1)[0][0]) for word, counts in split_counts.items()}
+        unsplittable.update(word for word, parts in gold_splits.items() if len(parts) == 1)
+        
+        normalize = lambda word: unicodedata.normalize('NFC', word.strip())
+        return cls.build((normalize(word) for word in unsplittable),
+                         {normalize(word): parts for word, parts in gold_splits.items()},
+                         (normalize(word) for word in known_words))
+    
+    def save(self, path: str):
+        """Save the flat arrays and packed gold splits to an .npz file."""
+        np.savez_compressed(
+            path,
+            edge_chars=np.array(self.edge_chars, dtype=np.int32),
+            edge_targets=np.array(self.edge_targets, dtype=np.int32),
+            child_starts=np.array(self.child_starts, dtype=np.int32),
+            node_values=np.array(self.node_values, dtype=np.int32),
+            splits=np.array(_ENTRY_SEPARATOR.join(_PART_SEPARATOR.join(parts) for parts in self.splits))
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> 'SandhiLexicon':
+        """Load a lexicon written by save()."""
+        with np.load(path) as data:
+            packed = str(data['splits'])
+            return cls(data['edge_chars'].tolist(), data['edge_targets'].tolist(),
+                       data['child_starts'].tolist(), data['node_values'].tolist(),
+                       [entry.split(_PART_SEPARATOR) for entry in packed.split(_ENTRY_SEPARATOR)] if packed else [])
+    
+    def _child(self, node: int, char: str) -> int:
+        """Child of node along char, or -1."""
+        start, end = self.child_starts[node], self.child_starts[node + 1]
+        code = ord(char)
+        index = bisect_left(self.edge_chars, code, start, end)
+        if index < end and self.edge_chars[index] == code:
+            return self.edge_targets[index]
+        return -1
+    
+    def _value_splits(self, word: str, value: int) -> Optional[List[str]]:
+        if value == NOT_A_WORD:
+            return None
+        if value in (UNSPLITTABLE, KNOWN_WORD):
+            return [word]
+        return list(self.splits[value - 1])
+    
+    def lookup(self, word: str) -> Optional[List[str]]:
+        """
+        Returns:
+            The gold split for a known split word, [word] for any other
+            known word, or None if the word is not in the lexicon
+        """
+        return self._value_splits(word, self._value(word))
+    
+    def verified_split(self, word: str) -> Optional[List[str]]:
+        """
+        Returns:
+            The gold split, [word] for a word the gold data does not split, or
+            None for unknown words and vocabulary words with no split claim
+        """
+        value = self._value(word)
+        return None if value == KNOWN_WORD else self._value_splits(word, value)
+    
+    def _value(self, word: str) -> int:
+        node = 0
+        for char in word:
+            node = self._child(node, char)
+            if node < 0:
+                return NOT_A_WORD
+        return self.node_values[node]
+    
+    def prefixes(self, word: str, start: int = 0) -> Iterator[Tuple[int, List[str]]]:
+        """Yield (end, lookup(word[start:end])) for every lexicon entry starting at start."""
+        node = 0
+        for end in range(start, len(word)):
+            node = self._child(node, word[end])
+            if node < 0:
+                return
+            value = self.node_values[node]
+            if value != NOT_A_WORD:
+                yield end + 1, self._value_splits(word[start:end + 1], value)
+    
+    def is_unsplittable(self, word: str) -> bool:
+        return self._value(word) == UNSPLITTABLE
+    
+    def gold_split(self, word: str) -> Optional[List[str]]:
+        splits = self.lookup(word)
+        return splits if splits is not None and len(splits) > 1 else None
+    
+    def __contains__(self, word: str) -> bool:
+        return self.lookup(word) is not None
+    
+    def __len__(self) -> int:
+        return self.num_words
+
+
+def load_lexicon(path: str = DEFAULT_LEXICON_PATH) -> Optional[SandhiLexicon]:
+    """Load the prebuilt lexicon, or return None if the file is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return SandhiLexicon.load(path)
+    except Exception as e:
+        logger.warning("Could not load sandhi lexicon from %s: %s", path, e)
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the prebuilt sandhi lexicon')
+    parser.add_argument('--output', type=str, default=DEFAULT_LEXICON_PATH, help='Output .npz path')
+    parser.add_argument('--crf_model_path', type=str, default=None, help='CRF model providing known_words')
+    parser.add_argument('--sandhi_data_path', type=str, default=None, help='Gold splits file')
+    
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    lexicon = SandhiLexicon.from_sources(args.crf_model_path, args.sandhi_data_path)
+    print(f"Built lexicon in {time.perf_counter() - start:.2f}s: {len(lexicon)} words "
+          f"({len(lexicon.splits)} gold splits, {lexicon.node_values.count(UNSPLITTABLE)} unsplittable), "
+          f"{len(lexicon.node_values)} trie nodes")
+    
+    lexicon.save(args.output)
+    start = time.perf_counter()
+    SandhiLexicon.load(args.output)
+    print(f"Saved to {args.output} ({os.path.getsize(args.output) / 1024:.1f} KiB); "
+          f"loads in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
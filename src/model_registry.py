@@ -0,0 +1,93 @@
+"""
+Model Registry
+Process-wide store of loaded models (tokenizer, lexicon, BiLSTM runtime, CRF
+tagger) keyed by kind, path and config, so every processor and splitter in a
+process shares one instance instead of loading its own. Shared instances are
+read-only by convention: callers must not retrain or mutate them.
+
+Every (re)load of an entry bumps its generation (model_generation()), so
+holders can tell that the instance they keep was replaced by a reload.
+
+Fork safety: models loaded before a fork are inherited by the child. Under
+gunicorn --preload the master loads once and the workers share those pages
+copy-on-write; call freeze() after loading so the garbage collector never
+writes to them. The registry lock is replaced in every child, so a fork taken
+while another thread held it cannot deadlock the worker.
+"""
+
+import gc
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_lock = threading.RLock()
+_models: Dict[Tuple, Any] = {}
+_generations: Dict[Tuple, int] = {}
+
+
+def _model_key(kind: str, path: Optional[str], config: Dict[str, Any]) -> Tuple:
+    return (kind, os.path.abspath(path) if path else None) + tuple(sorted(config.items()))
+
+
+def get_model(kind: str, loader: Callable[[], Any], path: Optional[str] = None,
+              reload: bool = False, **config) -> Any:
+    """
+    Return the shared instance of a model, loading it on first request.
+    
+    Args:
+        kind: Model family, e.g. 'tokenizer', 'lexicon', 'bilstm', 'crf_tagger'
+        loader: Called with no arguments to load the model (its result may be None)
+        path: File or directory the model is loaded from
+        reload: Load again even if an instance is registered (e.g. after retraining)
+        **config: Any other settings that change the loaded instance
+    """
+    key = _model_key(kind, path, config)
+    # Reentrant: loaders may request the models they are built from
+    with _lock:
+        if reload or key not in _models:
+            _models[key] = loader()
+            _generations[key] = _generations.get(key, 0) + 1
+        return _models[key]
+
+
+def model_generation(kind: str, path: Optional[str] = None, **config) -> int:
+    """
+    How many times a model has been loaded (0 if never). Keeps counting across
+    reloads and clear(), so a changed value means the shared instance changed.
+    """
+    with _lock:
+        return _generations.get(_model_key(kind, path, config), 0)
+
+
+def loaded_models() -> List[Dict[str, Any]]:
+    """Kind, path and config of every registered model."""
+    with _lock:
+        return [{'kind': key[0], 'path': key[1], 'config': dict(key[2:]), 'loaded': model is not None}
+                for key, model in _models.items()]
+
+
+def clear(kind: Optional[str] = None):
+    """Forget registered models (all, or those of one kind); holders keep their references."""
+    with _lock:
+        for key in [key for key in _models if kind is None or key[0] == kind]:
+            del _models[key]
+
+
+def freeze():
+    """
+    Move everything allocated so far out of the garbage collector's reach.
+    
+    Call once in a preloading parent after the models are loaded: collections
+    in the forked workers then never touch (and copy) the shared pages.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def _reset_lock_after_fork():
+    global _lock
+    _lock = threading.RLock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_lock_after_fork)
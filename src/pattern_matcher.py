@@ -0,0 +1,142 @@
+"""
+Multi-Pattern Literal Matcher
+Finds every occurrence of a fixed set of literal patterns in one left-to-right
+scan. The patterns are stored in a trie, and the trie is also compiled into a
+single regular expression, so the scan runs at C speed and Python code only
+runs where some pattern actually starts. find_all switches to one str.find
+loop per pattern on texts long enough for that to be faster.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Trie key marking the end of one or more patterns (never a text character)
+_END = ''
+
+# find_all switches from the regex scan to str.find loops once the text has
+# this many characters per pattern
+_FIND_LOOP_CHARS_PER_PATTERN = 20
+
+
+class PatternMatcher:
+    """Trie-based matcher over literal string patterns; a pattern's id is its position."""
+    
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Args:
+            patterns: Non-empty literal patterns
+        """
+        self.patterns = list(patterns)
+        self._root: Dict[str, dict] = {}
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("Patterns must be non-empty")
+            node = self._root
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node.setdefault(_END, []).append(pattern_id)
+        
+        # Id of each distinct pattern (the first, if listed more than once)
+        self._first_id: Dict[str, int] = {}
+        for pattern_id, pattern in enumerate(self.patterns):
+            self._first_id.setdefault(pattern, pattern_id)
+        
+        # Every pattern occurring at a position is a prefix of the longest one
+        # there, so the longest match identifies all of them
+        self._prefix_ids: Dict[str, List[int]] = {}
+        for pattern in set(self.patterns):
+            self._prefix_ids[pattern] = sorted(pattern_id for length in range(1, len(pattern) + 1)
+                                               for pattern_id in self._ids_at(pattern[:length]))
+        
+        # Matches the longest pattern at the leftmost position where any starts
+        self._start_regex = re.compile(self._node_regex(self._root)) if self.patterns else None
+        
+        # Offsets inside each pattern where another occurrence could start; the
+        # regex scan resumes after a whole match, so these are checked separately
+        self._inner_offsets: Dict[str, List[int]] = {
+            pattern: [offset for offset in range(1, len(pattern)) if self._could_start(pattern[offset:])]
+            for pattern in set(self.patterns)}
+    
+    def _ids_at(self, prefix: str) -> List[int]:
+        """Ids of the patterns equal to prefix."""
+        node = self._root
+        for char in prefix:
+            node = node[char]
+        return node.get(_END, [])
+    
+    def _could_start(self, text: str) -> bool:
+        """Whether some pattern is a prefix of text or starts with text."""
+        node = self._root
+        for char in text:
+            if _END in node:
+                return True
+            node = node.get(char)
+            if node is None:
+                return False
+        return True
+    
+    def _node_regex(self, node: Dict[str, dict]) -> str:
+        """Greedy regex for the subtrie below node, matching the longest pattern continuing from it."""
+        branches = [re.escape(char) + self._node_regex(child)
+                    for char, child in sorted(node.items()) if char != _END]
+        if not branches:
+            return ''
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if _END in node else body
+    
+    def matches_at(self, text: str, pos: int) -> List[int]:
+        """Ids of all patterns occurring at text[pos:], shortest first."""
+        matched = []
+        node = self._root
+        for index in range(pos, len(text)):
+            node = node.get(text[index])
+            if node is None:
+                break
+            matched.extend(node.get(_END, ()))
+        return matched
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start, pattern_id) for every occurrence, by start position, then pattern id."""
+        if self._start_regex is None:
+            return
+        prefix_ids = self._prefix_ids
+        inner_offsets = self._inner_offsets
+        for match in self._start_regex.finditer(text):
+            start = match.start()
+            longest = match.group()
+            for pattern_id in prefix_ids[longest]:
+                yield start, pattern_id
+            for offset in inner_offsets[longest]:
+                for pattern_id in sorted(self.matches_at(text, start + offset)):
+                    yield start + offset, pattern_id
+    
+    def replace(self, text: str, replacements: Sequence[str]) -> str:
+        """
+        Rewrite text in a single left-to-right pass.
+        
+        At each position the longest pattern occurring there is replaced by
+        replacements[pattern_id] and scanning resumes after it, so matches never
+        overlap and replacement text is never rescanned.
+        """
+        if self._start_regex is None:
+            return text
+        first_id = self._first_id
+        return self._start_regex.sub(lambda match: replacements[first_id[match.group()]], text)
+    
+    def find_all(self, text: str) -> List[Tuple[int, int]]:
+        """List of (start, pattern_id) for every occurrence, in iter_matches order."""
+        # On long texts one str.find loop per pattern and a sort beat the
+        # regex scan, which stops wherever a pattern's first character occurs
+        if len(text) < _FIND_LOOP_CHARS_PER_PATTERN * len(self.patterns):
+            return list(self.iter_matches(text))
+        found = []
+        for pattern_id, pattern in enumerate(self.patterns):
+            start = text.find(pattern)
+            while start != -1:
+                found.append((start, pattern_id))
+                start = text.find(pattern, start + 1)
+        found.sort()
+        return found
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
@@ -0,0 +1,114 @@
+"""
+Pipeline Metrics
+Opt-in instrumentation of IntegratedSanskritProcessor: per-stage wall times
+and work counters (BiLSTM forward passes, cache hits, Viterbi cells).
+
+While a Counter is being recorded into in a thread (see recording()), the
+splitter and CRF tagger add to it through increment(); with none active,
+increment() is a single thread-local lookup. The counters and stage times of
+each call are then folded into the process-wide registry, which keeps a
+latency histogram per stage and running counter totals.
+"""
+
+import time
+import bisect
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+# Stages of process_texts, in pipeline order
+STAGES = ('language_check', 'tokenize', 'sandhi', 'pos', 'morphology', 'confidence')
+
+STAGE_SECONDS_BOUNDS = [0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0]
+
+
+class Histogram:
+    """Counts of observed values per bucket (upper bounds inclusive, last bucket open)."""
+    
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Bucket counts keyed by upper bound ('+Inf' for the last), plus count and mean."""
+        with self._lock:
+            labels = [f"<={bound:g}" for bound in self.bounds] + ['+Inf']
+            return {
+                'buckets': dict(zip(labels, self.counts)),
+                'count': self.count,
+                'mean': self.total / self.count if self.count else 0.0
+            }
+
+
+_active = threading.local()
+
+
+def increment(name: str, value: int = 1):
+    """Add value to counters[name] of the Counter recorded into in this thread, if any."""
+    counters = getattr(_active, 'counters', None)
+    if counters is not None:
+        counters[name] += value
+
+
+@contextmanager
+def recording(counters: Optional[Counter]) -> Iterator[Optional[Counter]]:
+    """Make counters the target of increment() in this thread (None records nothing)."""
+    previous = getattr(_active, 'counters', None)
+    _active.counters = counters
+    try:
+        yield counters
+    finally:
+        _active.counters = previous
+
+
+class MetricsRegistry:
+    """Aggregated stage latencies and counter totals across requests."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.stage_seconds = {stage: Histogram(STAGE_SECONDS_BOUNDS) for stage in STAGES}
+            self.counters = Counter()
+            self.texts = 0
+            self.started = time.time()
+    
+    def observe_text(self, stage_seconds: Dict[str, float]):
+        """Record the stage times of one processed text."""
+        for stage, seconds in stage_seconds.items():
+            self.stage_seconds[stage].observe(seconds)
+        with self._lock:
+            self.texts += 1
+    
+    def add_counters(self, counters: Dict[str, int]):
+        with self._lock:
+            self.counters.update(counters)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Texts processed, counter totals and per-stage latency histograms since the last reset."""
+        with self._lock:
+            counters = dict(self.counters)
+            texts = self.texts
+            started = self.started
+        return {
+            'texts': texts,
+            'since': started,
+            'counters': counters,
+            'stage_seconds': {stage: histogram.snapshot() for stage, histogram in self.stage_seconds.items()}
+        }
+
+
+# Process-wide registry fed by processors created with collect_metrics=True
+registry = MetricsRegistry()
@@ -0,0 +1,52 @@
+"""
+Quantize the BiLSTM sandhi model for CPU serving.
+
+Applies dynamic int8 quantization to the LSTM and Linear layers of
+models/bilstm_sandhi.pt and writes models/bilstm_sandhi_int8.pt, then reloads
+it and reports how far its split probabilities move from the float model on
+the gold words of data/sandhi_cleaned.txt. Load it with
+HybridSandhiSplitter(use_quantized_bilstm=True) or BILSTM_RUNTIME=int8.
+
+Usage:
+    python src/quantize_bilstm.py [--checkpoint models/bilstm_sandhi.pt] [--output models/bilstm_sandhi_int8.pt]
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+
+from bilstm_sandhi import load_model, quantize_model, save_quantized_model
+from bilstm_runtime import DEFAULT_MODEL_DIR, RUNTIME_ARTIFACTS, EagerBiLSTM, QuantizedBiLSTM
+from export_bilstm import sample_sequences, max_difference, project_root
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quantize the BiLSTM sandhi model to dynamic int8')
+    parser.add_argument('--checkpoint', type=str, default=os.path.join(DEFAULT_MODEL_DIR, RUNTIME_ARTIFACTS['eager']))
+    parser.add_argument('--output', type=str, default=os.path.join(DEFAULT_MODEL_DIR, RUNTIME_ARTIFACTS['int8']))
+    parser.add_argument('--data_path', type=str, default=os.path.join(project_root, 'data', 'sandhi_cleaned.txt'))
+    parser.add_argument('--num_words', type=int, default=2000, help='Words used for the numeric check')
+    
+    args = parser.parse_args()
+    
+    model, char_to_idx = load_model(args.checkpoint, device='cpu')
+    save_quantized_model(quantize_model(model), char_to_idx, args.output)
+    print(f"Quantized {args.checkpoint} ({os.path.getsize(args.checkpoint) / 1024:.1f} KiB) "
+          f"-> {args.output} ({os.path.getsize(args.output) / 1024:.1f} KiB)")
+    
+    # Quantization is lossy: report the drift and how many thresholded cuts flip
+    sequences = sample_sequences(char_to_idx, args.data_path, args.num_words)
+    reference = EagerBiLSTM(args.checkpoint, device='cpu').predict_proba_batch(sequences)
+    quantized = QuantizedBiLSTM(args.output)
+    if quantized.char_to_idx != char_to_idx:
+        sys.exit("Quantized checkpoint vocabulary does not match the float checkpoint")
+    outputs = quantized.predict_proba_batch(sequences)
+    flipped = sum(int(np.sum((np.asarray(a) >= 0.5) != (np.asarray(b) >= 0.5))) for a, b in zip(reference, outputs))
+    print(f"max |Δp| = {max_difference(reference, outputs):.2e} over {len(sequences)} words, "
+          f"{flipped} of {sum(len(seq) for seq in sequences)} positions change side of 0.5")
+
+
+if __name__ == "__main__":
+    main()
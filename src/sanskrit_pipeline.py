@@ -0,0 +1,197 @@
+"""
+Run the full pipeline (sandhi splitting, POS tagging, morphology) over a
+UTF-8 corpus, one sentence per line, and write one JSON line per input line.
+
+Lines are read in chunks and the chunks are spread over a process pool; each
+worker loads the models once in its initializer and runs a whole chunk through
+IntegratedSanskritProcessor.process_texts. Results are written in input order,
+and at most a few chunks per worker are in flight, so memory stays bounded on
+corpora of any size. Progress and throughput go to stderr.
+
+Usage:
+    python src/sanskrit_pipeline.py corpus.txt [more.txt | corpus_dir ...] [-o out.jsonl]
+                                    [--processes 4] [--chunk_size 256] [--pattern '*.txt']
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Add paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, os.path.join(project_root, 'data'))
+sys.path.insert(0, current_dir)
+
+from integrated_sanskrit_processor import IntegratedSanskritProcessor
+
+DEFAULT_POS_MODEL_PATH = os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl')
+
+# (source, line number, text) of one input line
+Line = Tuple[str, int, str]
+
+_WORKER_PROCESSOR = None
+_WORKER_STEPS = None
+
+
+def input_files(inputs: List[str], pattern: str) -> Iterator[str]:
+    """Expand the inputs: files as given, directories to their files matching pattern (recursively, sorted)."""
+    for path in inputs:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        else:
+            yield path
+
+
+def read_lines(paths: Iterator[str]) -> Iterator[Line]:
+    """Yield the non-empty, stripped lines of each file ('-' is stdin)."""
+    for path in paths:
+        infile = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+        try:
+            for number, line in enumerate(infile, 1):
+                line = line.strip()
+                if line:
+                    yield path, number, line
+        finally:
+            if infile is not sys.stdin:
+                infile.close()
+
+
+def read_chunks(lines: Iterator[Line], chunk_size: int) -> Iterator[List[Line]]:
+    """Group lines into lists of at most chunk_size."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def create_processor(options: Dict[str, Any]) -> IntegratedSanskritProcessor:
+    """Build and warm up a processor from the command-line options."""
+    processor = IntegratedSanskritProcessor(
+        pos_model_path=options['model_path'],
+        use_bilstm=options['split_sandhi'],
+        bilstm_runtime=options['runtime']
+    )
+    processor.warmup(sandhi=options['split_sandhi'], pos=options['tag_pos'])
+    return processor
+
+
+def pipeline_steps(options: Dict[str, Any]) -> Dict[str, bool]:
+    """process_texts flags selected by the options."""
+    return {
+        'split_sandhi': options['split_sandhi'],
+        'tag_pos': options['tag_pos'],
+        'analyze_morphology': options['analyze_morphology']
+    }
+
+
+def process_chunk(processor: IntegratedSanskritProcessor, chunk: List[Line],
+                  steps: Dict[str, bool]) -> List[Dict[str, Any]]:
+    """Run one chunk through the pipeline; one record per line, tagged with its source and line number."""
+    results = processor.process_texts([text for _, _, text in chunk], **steps)
+    return [dict(source=source, line=number, **result) for (source, number, _), result in zip(chunk, results)]
+
+
+def _init_worker(options: Dict[str, Any]):
+    """Process pool initializer: load the models once per worker."""
+    global _WORKER_PROCESSOR, _WORKER_STEPS
+    logging.basicConfig(level=options['log_level'], format='%(levelname)s %(name)s: %(message)s')
+    _WORKER_PROCESSOR = create_processor(options)
+    _WORKER_STEPS = pipeline_steps(options)
+
+
+def _worker_process_chunk(chunk: List[Line]) -> List[Dict[str, Any]]:
+    """Process one chunk in a worker process."""
+    return process_chunk(_WORKER_PROCESSOR, chunk, _WORKER_STEPS)
+
+
+def run_pipeline(chunks: Iterator[List[Line]], options: Dict[str, Any],
+                 processes: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the results of each chunk, in input order.
+    
+    With more than one process, chunks are submitted to the pool as results
+    are consumed, keeping at most 2 per worker in flight.
+    """
+    if processes <= 1:
+        processor = create_processor(options)
+        steps = pipeline_steps(options)
+        for chunk in chunks:
+            yield process_chunk(processor, chunk, steps)
+        return
+    
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(options,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_worker_process_chunk, chunk))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Sanskrit pipeline over a corpus (one sentence per line)')
+    parser.add_argument('inputs', nargs='+', help="Input files or directories ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="Output JSONL file ('-' for stdout)")
+    parser.add_argument('--pattern', default='*.txt', help='File name pattern inside input directories')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (1 = in-process)')
+    parser.add_argument('--chunk_size', type=int, default=256, help='Lines per chunk sent to a worker')
+    parser.add_argument('--model_path', type=str, default=DEFAULT_POS_MODEL_PATH, help='CRF model path')
+    parser.add_argument('--runtime', default='auto', help='BiLSTM runtime')
+    parser.add_argument('--no_sandhi', action='store_true', help='Skip sandhi splitting')
+    parser.add_argument('--no_pos', action='store_true', help='Skip POS tagging')
+    parser.add_argument('--no_morphology', action='store_true', help='Skip morphology analysis')
+    parser.add_argument('--progress_every', type=float, default=10.0, help='Seconds between progress reports')
+    parser.add_argument('--log_level', default='WARNING', help='Pipeline log level')
+    
+    args = parser.parse_args()
+    
+    # Pipeline messages and progress go to stderr; stdout may carry the output
+    logging.basicConfig(level=args.log_level.upper(), format='%(levelname)s %(name)s: %(message)s')
+    options = {
+        'model_path': args.model_path,
+        'runtime': args.runtime,
+        'split_sandhi': not args.no_sandhi,
+        'tag_pos': not args.no_pos,
+        'analyze_morphology': not args.no_morphology,
+        'log_level': args.log_level.upper()
+    }
+    chunks = read_chunks(read_lines(input_files(args.inputs, args.pattern)), args.chunk_size)
+    
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = last_report = time.perf_counter()
+    count = 0
+    try:
+        for results in run_pipeline(chunks, options, args.processes):
+            for result in results:
+                outfile.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += len(results)
+            now = time.perf_counter()
+            if now - last_report >= args.progress_every:
+                print(f"Processed {count} lines ({count / (now - start):.0f} lines/s)", file=sys.stderr)
+                last_report = now
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"Processed {count} lines in {elapsed:.1f} s ({count / elapsed if elapsed else 0:.0f} lines/s, "
+          f"{args.processes} processes)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+POS-tag a text file with the CRF tagger, one sentence per line.
+
+Lines are read in batches and tagged with CRFPOSTagger.tag_sentences, so words
+shared across a batch are scored once and equal-length sentences are decoded
+together. With --processes > 1, one process pool serves the whole file, so
+each worker loads the CRF model once.
+
+Usage:
+    python src/tag_file.py input.txt [-o output.tsv] [--format tsv|jsonl]
+                           [--batch_size 1000] [--processes 1]
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import contextlib
+from typing import Iterator, List, TextIO
+
+# Add paths
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.insert(0, os.path.join(project_root, 'data'))
+sys.path.insert(0, current_dir)
+
+from integrated_sanskrit_processor import IntegratedSanskritProcessor
+
+
+def read_batches(stream: TextIO, batch_size: int) -> Iterator[List[str]]:
+    """Yield lists of non-empty, stripped lines of at most batch_size."""
+    batch = []
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_tagged(out: TextIO, text: str, tagged, output_format: str):
+    """Write one tagged sentence as TSV (word<TAB>tag, blank line after) or a JSON line."""
+    if output_format == 'jsonl':
+        out.write(json.dumps({'text': text, 'tagged_tokens': tagged}, ensure_ascii=False) + '\n')
+    else:
+        for word, tag in tagged:
+            out.write(f"{word}\t{tag}\n")
+        out.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='POS-tag a Sanskrit text file (one sentence per line)')
+    parser.add_argument('input', help="Input text file ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="Output file ('-' for stdout)")
+    parser.add_argument('--format', choices=['tsv', 'jsonl'], default='tsv', help='Output format')
+    parser.add_argument('--model_path', type=str,
+                        default=os.path.join(project_root, 'models', 'enhanced_crf_pos_model_v3.pkl'),
+                        help='CRF model path')
+    parser.add_argument('--batch_size', type=int, default=1000, help='Sentences tagged per batch')
+    parser.add_argument('--processes', type=int, default=1, help='Worker processes for the CRF decoder')
+    
+    args = parser.parse_args()
+    
+    # Pipeline warnings go to stderr; stdout may carry the output
+    logging.basicConfig(format='%(levelname)s %(name)s: %(message)s')
+    processor = IntegratedSanskritProcessor(pos_model_path=args.model_path, use_bilstm=False)
+    processor.warmup(sandhi=False)
+    
+    crf_model = processor.crf_model
+    if args.processes > 1 and crf_model is not None and crf_model.is_trained:
+        pool = crf_model.process_pool(args.processes)
+    else:
+        pool = contextlib.nullcontext()
+    
+    infile = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        count = 0
+        with pool as executor:
+            for batch in read_batches(infile, args.batch_size):
+                for text, tagged in zip(batch, processor.tag_pos_batch(batch, executor=executor)):
+                    write_tagged(outfile, text, tagged, args.format)
+                count += len(batch)
+                print(f"Tagged {count} sentences", file=sys.stderr)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,42 @@
 import re
 import unicodedata
-from typing import List, Tuple, Optional
+from typing import Iterable, Iterator, List, Tuple, Optional
+
+from pattern_matcher import PatternMatcher
+
+# Script checks work on the UTF-8 encoding, so they run in C rather than a
+# Python loop per character. Every character of the Devanagari block
+# (U+0900-U+097F, which holds the danda, avagraha, om, anusvara and visarga)
+# encodes as E0 A4 xx or E0 A5 xx, and those byte pairs start no other character.
+_DEVANAGARI_LEADS = (b'\xe0\xa4', b'\xe0\xa5')
+# Characters a script ratio does not count: str.isspace() characters (none
+# above U+3000) and ASCII punctuation. The ASCII ones are deleted from the
+# encoded text in one bytes.translate pass, the rest are found by a regex.
+_IGNORED_ASCII = bytes(c for c in range(128) if chr(c).isspace() or chr(c) in '.,;:!?\'"-()[]{}')
+_IGNORED_NON_ASCII_RE = re.compile('[' + ''.join(chr(c) for c in range(128, 0x3001) if chr(c).isspace()) + ']')
+
+
+def count_devanagari(text: str) -> Tuple[int, int]:
+    """
+    Count the Devanagari characters of text.
+    
+    Returns:
+        (Devanagari characters, characters counted), where whitespace and ASCII
+        punctuation are not counted
+    """
+    encoded = text.encode('utf-8', 'surrogatepass')
+    devanagari = sum(encoded.count(lead) for lead in _DEVANAGARI_LEADS)
+    ignored = len(encoded) - len(encoded.translate(None, _IGNORED_ASCII))
+    ignored += len(_IGNORED_NON_ASCII_RE.findall(text))
+    return devanagari, len(text) - ignored
+
+
+def has_devanagari(text: str) -> bool:
+    """Whether text contains any character of the Devanagari block."""
+    encoded = text.encode('utf-8', 'surrogatepass')
+    return any(lead in encoded for lead in _DEVANAGARI_LEADS)
+
+
 class SanskritTokenizer:
     def __init__(self):
         # Devanagari Unicode ranges
@@ -150,6 +186,39 @@ class SanskritTokenizer:
             'ष्ट': 'ः ट', 'ष्ठ': 'ः ठ',
         }
         
+        # Specific reverse transformations for common compounds
+        self.compound_reversals = {
+            # Visarga sandhi reversals
+            'स्त': 'ः त', 'स्थ': 'ः थ', 'श्च': 'ः च', 'श्छ': 'ः छ',
+            'ष्ट': 'ः ट', 'ष्ठ': 'ः ठ',
+            
+            # Common compound splits
+            'सज्जन': 'सत् जन', 'उन्नति': 'उत् नति', 'सद्गुरु': 'सत् गुरु',
+            'तद्रूप': 'तत् रूप', 'सच्चित्': 'सत् चित्', 'उद्धार': 'उत् हार',
+            'सच्छास्त्र': 'सत् शास्त्र', 'संस्कार': 'सम् स्कार',
+            
+            # Prefix reversals
+            'प्राप्त': 'प्र आप्त', 'परीप्त': 'परि आप्त', 'अध्यध्याय': 'अधि अध्याय',
+            'अभ्युदय': 'अभि उदय', 'न्यास': 'नि आस', 'व्याकरण': 'वि आकरण',
+            'अत्यन्त': 'अति अन्त',
+            
+            # Common word splits
+            'तथापि': 'तथा अपि', 'यथार्थ': 'यथा अर्थ', 'परमार्थ': 'परम अर्थ',
+            'महात्मा': 'महा आत्मा', 'स्वागत': 'सु आगत', 'देवालय': 'देव अलय',
+        }
+        
+        # Vowel sandhi reversals (applied inside longer words only)
+        self.vowel_reversals = {
+            # Guna reversals
+            'ए': 'अ इ', 'ओ': 'अ उ', 'अर्': 'अ ऋ', 'अल्': 'अ ऌ',
+            
+            # Vriddhi reversals  
+            'ऐ': 'अ ए', 'औ': 'अ ओ',
+            
+            # Ayadi reversals
+            'अय': 'ए अ', 'अव': 'ओ अ', 'आय': 'ऐ अ', 'आव': 'औ अ',
+        }
+        
         # Combine all rules for easy access
         self.all_sandhi_rules = {
             **self.vowel_sandhi,
@@ -157,6 +226,16 @@ class SanskritTokenizer:
             **self.visarga_sandhi,
             **self.special_sandhi
         }
+        
+        # Literal patterns reported by detect_sandhi_patterns, by sandhi type
+        self.detection_patterns = {
+            'visarga_sandhi': ['स्त', 'स्थ', 'श्च', 'श्छ', 'ष्ट', 'ष्ठ'],
+            'consonant_sandhi': ['ग्ग', 'द्द', 'ब्ब', 'ञ्च', 'ण्ट', 'न्त'],
+            'vowel_sandhi': ['या', 'वा', 'रा', 'ला', 'अय', 'अव'],
+        }
+        
+        self._build_reverse_matchers()
+        self._build_detection_matcher()
     
     def normalize_text(self, text: str) -> str:
         # Normalize Unicode (NFC form)
@@ -182,78 +261,62 @@ class SanskritTokenizer:
         
         return tokens
     
+    def _build_reverse_matchers(self):
+        # A pattern listed in both tables keeps its reverse_patterns replacement
+        self.reverse_rules = dict(self.reverse_patterns)
+        for compound, split in self.compound_reversals.items():
+            self.reverse_rules.setdefault(compound, split)
+        self.reverse_replacements = list(self.reverse_rules.values())
+        self.reverse_matcher = PatternMatcher(self.reverse_rules)
+        self.vowel_matcher = PatternMatcher(self.vowel_reversals)
+    
+    def _build_detection_matcher(self):
+        self.detection_types = [sandhi_type for sandhi_type, patterns in self.detection_patterns.items()
+                                for _ in patterns]
+        self.detection_matcher = PatternMatcher(
+            pattern for patterns in self.detection_patterns.values() for pattern in patterns)
+    
     def _reverse_sandhi(self, text: str) -> str:
-        # Process text character by character to identify sandhi patterns
-        result = text
-        
-        # Apply reverse patterns for common sandhi splits
-        for pattern, replacement in self.reverse_patterns.items():
-            result = result.replace(pattern, replacement)
-        
-        # Apply specific reverse transformations for common compounds
-        compound_reversals = {
-            # Visarga sandhi reversals
-            'स्त': 'ः त', 'स्थ': 'ः थ', 'श्च': 'ः च', 'श्छ': 'ः छ',
-            'ष्ट': 'ः ट', 'ष्ठ': 'ः ठ',
-            
-            # Common compound splits
-            'सज्जन': 'सत् जन', 'उन्नति': 'उत् नति', 'सद्गुरु': 'सत् गुरु',
-            'तद्रूप': 'तत् रूप', 'सच्चित्': 'सत् चित्', 'उद्धार': 'उत् हार',
-            'सच्छास्त्र': 'सत् शास्त्र', 'संस्कार': 'सम् स्कार',
-            
-            # Prefix reversals
-            'प्राप्त': 'प्र आप्त', 'परीप्त': 'परि आप्त', 'अध्यध्याय': 'अधि अध्याय',
-            'अभ्युदय': 'अभि उदय', 'न्यास': 'नि आस', 'व्याकरण': 'वि आकरण',
-            'अत्यन्त': 'अति अन्त',
-            
-            # Common word splits
-            'तथापि': 'तथा अपि', 'यथार्थ': 'यथा अर्थ', 'परमार्थ': 'परम अर्थ',
-            'महात्मा': 'महा आत्मा', 'स्वागत': 'सु आगत', 'देवालय': 'देव अलय',
-        }
-        
-        # Apply compound reversals
-        for compound, split in compound_reversals.items():
-            result = result.replace(compound, split)
-        
-        # Handle vowel sandhi reversals
-        vowel_reversals = {
-            # Guna reversals
-            'ए': 'अ इ', 'ओ': 'अ उ', 'अर्': 'अ ऋ', 'अल्': 'अ ऌ',
+        # Reverse patterns and compound reversals in one left-to-right pass: the
+        # longest rule starting at each position wins, and rewritten text is
+        # never rescanned (see reverse_matcher)
+        result = self.reverse_matcher.replace(text, self.reverse_replacements)
+        
+        # Apply selective vowel reversals (only at word boundaries). A word can
+        # only change if some vowel pattern occurs in it with at least two
+        # characters on each side, and one scan of the text finds those words.
+        result = ' '.join(result.split())
+        patterns = self.vowel_matcher.patterns
+        pieces = []
+        pos = 0
+        for start, rule in self.vowel_matcher.iter_matches(result):
+            if start < pos:
+                continue  # word already handled
+            word_start = result.rfind(' ', 0, start) + 1
+            word_end = result.find(' ', start)
+            if word_end == -1:
+                word_end = len(result)
+            if start - word_start < 2 or word_end - start - len(patterns[rule]) < 2:
+                continue
             
-            # Vriddhi reversals  
-            'ऐ': 'अ ए', 'औ': 'अ ओ',
-            
-            # Ayadi reversals
-            'अय': 'ए अ', 'अव': 'ओ अ', 'आय': 'ऐ अ', 'आव': 'औ अ',
-        }
+            pieces.append(result[pos:word_start])
+            pieces.append(self._reverse_vowel_sandhi(result[word_start:word_end]))
+            pos = word_end
+        pieces.append(result[pos:])
         
-        # Apply selective vowel reversals (only at word boundaries)
-        words = result.split()
-        processed_words = []
-        
-        for word in words:
-            # Only attempt sandhi reversal on longer words that might be compounds
-            if len(word) > 4:
-                # Look for potential sandhi patterns at morpheme boundaries
-                for sandhi, split in vowel_reversals.items():
-                    # Check if sandhi occurs at likely morpheme boundaries
-                    if sandhi in word:
-                        # Simple heuristic: split if sandhi is not at the very beginning
-                        pos = word.find(sandhi)
-                        if pos > 1 and pos < len(word) - 1:
-                            # Only split if it creates meaningful parts
-                            before = word[:pos]
-                            after = word[pos + len(sandhi):]
-                            if len(before) >= 2 and len(after) >= 2:
-                                word = word.replace(sandhi, split, 1)
-                                break
-            
-            processed_words.append(word)
-        
-        return ' '.join(processed_words)
+        return ''.join(pieces)
+    
+    def _reverse_vowel_sandhi(self, word: str) -> str:
+        # The first rule (in table order) whose first occurrence sits at a likely
+        # morpheme boundary, leaving at least two characters on each side, wins
+        for sandhi, split in self.vowel_reversals.items():
+            pos = word.find(sandhi)
+            if pos > 1 and len(word) - pos - len(sandhi) >= 2:
+                return word[:pos] + split + word[pos + len(sandhi):]
+        return word
     
     def is_devanagari(self, text: str) -> bool:
-        return bool(re.search(self.devanagari_range, text))
+        return has_devanagari(text)
     
     def get_word_properties(self, word: str) -> dict:
         properties = {
@@ -271,57 +334,44 @@ class SanskritTokenizer:
         return properties
     
     def detect_sandhi_patterns(self, text: str) -> List[dict]:
-        patterns = []
-        
-        # Check for visarga sandhi patterns
-        visarga_patterns = ['स्त', 'स्थ', 'श्च', 'श्छ', 'ष्ट', 'ष्ठ']
-        for pattern in visarga_patterns:
-            pos = 0
-            while pos < len(text):
-                found = text.find(pattern, pos)
-                if found == -1:
-                    break
-                patterns.append({
-                    'type': 'visarga_sandhi',
-                    'pattern': pattern,
-                    'position': found,
-                    'length': len(pattern)
-                })
-                pos = found + 1
-        
-        # Check for consonant sandhi patterns
-        consonant_patterns = ['ग्ग', 'द्द', 'ब्ब', 'ञ्च', 'ण्ट', 'न्त']
-        for pattern in consonant_patterns:
-            pos = 0
-            while pos < len(text):
-                found = text.find(pattern, pos)
-                if found == -1:
-                    break
-                patterns.append({
-                    'type': 'consonant_sandhi',
-                    'pattern': pattern,
-                    'position': found,
-                    'length': len(pattern)
-                })
-                pos = found + 1
-        
-        # Check for vowel sandhi patterns
-        vowel_patterns = ['या', 'वा', 'रा', 'ला', 'अय', 'अव']
-        for pattern in vowel_patterns:
-            pos = 0
-            while pos < len(text):
-                found = text.find(pattern, pos)
-                if found == -1:
-                    break
-                patterns.append({
-                    'type': 'vowel_sandhi',
-                    'pattern': pattern,
-                    'position': found,
-                    'length': len(pattern)
-                })
-                pos = found + 1
-        
-        return sorted(patterns, key=lambda x: x['position'])
+        # All patterns are matched together; matches come out in position order
+        patterns = self.detection_matcher.patterns
+        types = self.detection_types
+        return [{'type': types[pattern_id], 'pattern': patterns[pattern_id],
+                 'position': start, 'length': len(patterns[pattern_id])}
+                for start, pattern_id in self.detection_matcher.find_all(text)]
+    
+    def _sandhi_match(self, pattern_id: int, position: int) -> dict:
+        pattern = self.detection_matcher.patterns[pattern_id]
+        return {
+            'type': self.detection_types[pattern_id],
+            'pattern': pattern,
+            'position': position,
+            'length': len(pattern)
+        }
+    
+    def iter_sandhi_patterns(self, chunks: Iterable[str]) -> Iterator[dict]:
+        """
+        Yield sandhi pattern matches from a stream of text chunks (e.g. an open
+        file), in position order, without holding the whole text in memory.
+        
+        Positions are offsets into the concatenated stream. A pattern split
+        across two chunks is still found: the end of each chunk is carried over.
+        """
+        patterns = self.detection_matcher.patterns
+        carry = max(map(len, patterns)) - 1
+        tail = ''
+        offset = 0  # stream position of tail[0]
+        
+        for chunk in chunks:
+            text = tail + chunk
+            for start, pattern_id in self.detection_matcher.find_all(text):
+                # Matches lying entirely in the tail were reported with the last chunk
+                if start + len(patterns[pattern_id]) > len(tail):
+                    yield self._sandhi_match(pattern_id, offset + start)
+            
+            tail = text[max(0, len(text) - carry):] if carry else ''
+            offset += len(text) - len(tail)
     
     def apply_sandhi_rule(self, word1: str, word2: str) -> str:
         if not word1 or not word2:
@@ -397,7 +447,44 @@ class SanskritTokenizer:
             analysis['pattern_types'][pattern_type] = analysis['pattern_types'].get(pattern_type, 0) + 1
         
         return analysis
-
+    
+    def analyze_text_complexity_stream(self, chunks: Iterable[str]) -> dict:
+        """
+        Streaming analyze_text_complexity for large texts, e.g. an open file.
+        
+        Token counts assume chunks break at whitespace (lines do); sandhi
+        patterns are found across any chunk boundary.
+        """
+        total_characters = 0
+        total_tokens = 0
+        total_token_length = 0
+        devanagari_characters = 0
+        
+        def counted(chunks):
+            nonlocal total_characters, total_tokens, total_token_length, devanagari_characters
+            for chunk in chunks:
+                tokens = self.tokenize(chunk)
+                total_characters += len(chunk)
+                total_tokens += len(tokens)
+                total_token_length += sum(len(token) for token in tokens)
+                devanagari_characters += sum(1 for char in chunk if 'ऀ' <= char <= 'ॿ')
+                yield chunk
+        
+        pattern_types = {}
+        sandhi_patterns_found = 0
+        for pattern in self.iter_sandhi_patterns(counted(chunks)):
+            sandhi_patterns_found += 1
+            pattern_types[pattern['type']] = pattern_types.get(pattern['type'], 0) + 1
+        
+        return {
+            'total_characters': total_characters,
+            'total_tokens': total_tokens,
+            'avg_token_length': total_token_length / total_tokens if total_tokens else 0,
+            'sandhi_patterns_found': sandhi_patterns_found,
+            'sandhi_density': sandhi_patterns_found / total_characters if total_characters else 0,
+            'pattern_types': pattern_types,
+            'devanagari_percentage': devanagari_characters / total_characters if total_characters else 0
+        }
 
 def demo_tokenizer():
     tokenizer = SanskritTokenizer()
@@ -23,7 +23,8 @@ import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import DataLoader
 
-from bilstm_sandhi import BiLSTMSandhiSplitter, SandhiDataset, build_char_vocabulary, save_model, load_model
+from bilstm_sandhi import (BiLSTMSandhiSplitter, SandhiDataset, LengthBucketSampler, collate_sandhi_batch,
+                           build_char_vocabulary, save_model, load_model)
 
 try:
     from sandhi_dataset import SANDHI_TEST_CASES
@@ -67,6 +68,14 @@ def prepare_training_data(test_cases: List[Dict], use_cleaned_data: bool = True)
     return training_data
 
 
+def split_training_data(training_data: List[Tuple[str, List[str]]], test_split: float = 0.2,
+                        val_split: float = 0.2) -> Tuple[List, List, List]:
+    """Deterministic train/validation/test split (random_state=42) shared by training and benchmarks."""
+    train_data, temp_data = train_test_split(training_data, test_size=test_split + val_split, random_state=42)
+    val_data, test_data = train_test_split(temp_data, test_size=test_split/(test_split + val_split), random_state=42)
+    return train_data, val_data, test_data
+
+
 def evaluate_model(model: BiLSTMSandhiSplitter, dataloader: DataLoader, device: str, 
                   char_to_idx: Dict[str, int], threshold: float = 0.5) -> Dict[str, float]:
     """Evaluate model performance."""
@@ -82,9 +91,10 @@ def evaluate_model(model: BiLSTMSandhiSplitter, dataloader: DataLoader, device:
             inputs = batch['input'].to(device)
             labels = batch['labels'].to(device)
             masks = batch['mask'].to(device)
+            lengths = batch['lengths']
             
             # Forward pass
-            outputs = model(inputs, masks)
+            outputs = model(inputs, masks, lengths)
             
             # Calculate loss (only on valid positions)
             loss = criterion(outputs, labels)
@@ -149,11 +159,12 @@ def train_model(model: BiLSTMSandhiSplitter, train_loader: DataLoader, val_loade
             inputs = batch['input'].to(device)
             labels = batch['labels'].to(device)
             masks = batch['mask'].to(device)
+            lengths = batch['lengths']
             
             optimizer.zero_grad()
             
             # Forward pass
-            outputs = model(inputs, masks)
+            outputs = model(inputs, masks, lengths)
             
             # Calculate loss (only on valid positions)
             loss = criterion(outputs, labels)
@@ -293,8 +304,7 @@ def main():
     print(f"Character vocabulary size: {len(char_to_idx)}")
     
     # Split data
-    train_data, temp_data = train_test_split(training_data, test_size=args.test_split + args.val_split, random_state=42)
-    val_data, test_data = train_test_split(temp_data, test_size=args.test_split/(args.test_split + args.val_split), random_state=42)
+    train_data, val_data, test_data = split_training_data(training_data, args.test_split, args.val_split)
     
     print(f"Train examples: {len(train_data)}")
     print(f"Validation examples: {len(val_data)}")
@@ -305,9 +315,13 @@ def main():
     val_dataset = SandhiDataset(val_data, char_to_idx, max_len=args.max_len)
     test_dataset = SandhiDataset(test_data, char_to_idx, max_len=args.max_len)
     
-    train_loader = DataLoader(train_dataset, batch_size=args.batch_size, shuffle=True)
-    val_loader = DataLoader(val_dataset, batch_size=args.batch_size, shuffle=False)
-    test_loader = DataLoader(test_dataset, batch_size=args.batch_size, shuffle=False)
+    # Length-bucketed batches keep padding (and wasted LSTM steps) to a minimum
+    train_loader = DataLoader(train_dataset, collate_fn=collate_sandhi_batch,
+                              batch_sampler=LengthBucketSampler(train_dataset, args.batch_size, shuffle=True))
+    val_loader = DataLoader(val_dataset, collate_fn=collate_sandhi_batch,
+                            batch_sampler=LengthBucketSampler(val_dataset, args.batch_size, shuffle=False))
+    test_loader = DataLoader(test_dataset, collate_fn=collate_sandhi_batch,
+                             batch_sampler=LengthBucketSampler(test_dataset, args.batch_size, shuffle=False))
     
     # Create model
     model = BiLSTMSandhiSplitter(